@@ -0,0 +1,52 @@
+#!/usr/bin/env python
+'''
+    Regression benchmark for the paginator's line collector.
+
+    Feeds a single long line in fragments of different sizes,
+    and reports how long it takes to assemble it.
+    The time should grow linearly with the line size, independent of the fragment size.
+
+    Example usage: python -m benchmarks.bench_line_collector --size 50000000
+'''
+from more_or_less.paginator import _LineCollector
+import argparse
+import time
+
+
+_FRAGMENT_SIZES = [1, 64, 64 * 1024]
+
+
+def main():
+    arguments = _parse_arguments()
+    for fragment_size in arguments.fragment_sizes:
+        seconds = run(line_size=arguments.size, fragment_size=fragment_size)
+        print('{:>8} byte fragments: {:8.3f} s ({:.1f} MB/s)'.format(
+            fragment_size, seconds, arguments.size / seconds / 1e6))
+
+
+def run(line_size, fragment_size):
+    ''' Returns the number of seconds it took to collect a line of 'line_size' characters '''
+    fragment = 'x' * fragment_size
+    fragment_count = line_size // fragment_size
+    collector = _LineCollector()
+
+    start = time.perf_counter()
+    for _ in range(fragment_count):
+        collector.add(fragment)
+    collector.add('\n')
+    lines = collector.pop_complete_lines()
+    seconds = time.perf_counter() - start
+
+    assert len(lines) == 1 and len(lines[0]) == fragment_count * fragment_size + 1
+    return seconds
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=50 * 1000 * 1000, help='length of the line in bytes')
+    parser.add_argument('--fragment-sizes', type=int, nargs='+', default=_FRAGMENT_SIZES)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+'''
+    Throughput benchmark for reading paginator input from a queue.
+
+    A producer thread pushes many small fragments into a queue.Queue,
+    and we measure how fast they are consumed by the per-item QueueIterator
+    and by the BatchedQueueIterator (which drains everything that is waiting at once).
+
+    Example usage: python -m benchmarks.bench_queue_iterator --fragments 1000000
+'''
+from more_or_less import END_OF_INPUT
+from more_or_less.paginator import BatchedQueueIterator, QueueIterator, _LineCollector
+import argparse
+import queue
+import threading
+import time
+
+
+_ITERATORS = {
+    'per-item': QueueIterator,
+    'batched': BatchedQueueIterator,
+}
+
+
+def main():
+    arguments = _parse_arguments()
+    for name, iterator_class in _ITERATORS.items():
+        seconds = run(iterator_class, arguments.fragments, arguments.fragment)
+        print('{:>10}: {:8.3f} s ({:,.0f} fragments/s)'.format(name, seconds, arguments.fragments / seconds))
+
+
+def run(iterator_class, fragment_count, fragment):
+    ''' Returns the number of seconds it took to consume 'fragment_count' fragments '''
+    input_queue = queue.Queue()
+    collector = _LineCollector()
+
+    def produce():
+        for _ in range(fragment_count):
+            input_queue.put(fragment)
+        input_queue.put(END_OF_INPUT)
+
+    producer = threading.Thread(target=produce)
+    start = time.perf_counter()
+    producer.start()
+    for text in iterator_class(input_queue):
+        collector.add(text)
+        collector.pop_complete_lines()
+    seconds = time.perf_counter() - start
+    producer.join()
+    return seconds
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fragments', type=int, default=1000 * 1000, help='number of fragments to send')
+    parser.add_argument('--fragment', default='a short log fragment\n', help='the text of every fragment')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
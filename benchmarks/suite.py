@@ -0,0 +1,457 @@
+#!/usr/bin/env python
+'''
+    Benchmark suite for the pagination pipeline.
+
+    Measures the throughput (lines per second) and peak memory use of the main paths through the paginator.
+    The user is simulated with a scripted Input object, and the output is thrown away.
+
+    Example usage:
+        python -m benchmarks.suite --output bench_output.json
+        python -m benchmarks.suite --lines 100000 --only search_kth_match
+'''
+from functools import partial
+from more_or_less import BinaryOutput, END_OF_INPUT, FixedSizeScreen, History, Input, MorePageBuilder, Output, \
+    Paginator
+from more_or_less import LineIndex, more_plugins, paginate, paginate_file
+from more_or_less.mapped_file import MappedFile
+from more_or_less.page_of_height import PageOfHeight
+from more_or_less.page_builder import PageBuilder
+from more_or_less.search_plugin import SearchPage
+import argparse
+import bz2
+import gzip
+import io
+import json
+import lzma
+import os
+import platform
+import random
+import queue
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+
+_LINE = 'Oct 17 10:00:00 host service[1234]: a typical log line of about eighty characters\n'
+_SCREEN_HEIGHT = 50
+
+
+class ScriptedInput(Input):
+    '''
+        Input that answers every prompt with the next key of a script.
+        When the script is exhausted, the last key is repeated.
+    '''
+
+    def __init__(self, keys, prompt_answers=()):
+        self._keys = iter(keys)
+        self._last_key = ' '
+        self._prompt_answers = iter(prompt_answers)
+
+    def prompt(self, message):
+        return next(self._prompt_answers)
+
+    def get_character(self, message):
+        self._last_key = next(self._keys, self._last_key)
+        return self._last_key
+
+
+class NullOutput(Output):
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return True
+
+
+class NullStream(io.RawIOBase):
+    ''' A binary stream that is not a terminal, so the input is copied to it without paginating '''
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        return len(data)
+
+
+class _NullPageBuilder(PageBuilder):
+    '''
+        Page builder that returns infinitely high pages, so only the paginator itself is measured
+    '''
+
+    def build_first_page(self):
+        return PageOfHeight(height=sys.maxsize, output=NullOutput())
+
+    def build_next_page(self):
+        return self.build_first_page()
+
+
+def _more_page_builder(keys=' ', prompt_answers=(), plugins=None, screen_width=None):
+    return MorePageBuilder(
+        input=ScriptedInput(keys, prompt_answers),
+        output=NullOutput(),
+        screen_dimensions=FixedSizeScreen(height=_SCREEN_HEIGHT, **({'width': screen_width} if screen_width else {})),
+        plugins=plugins,
+    )
+
+
+def _fragments(line_count, fragment_size):
+    text = _LINE * line_count
+    return [text[i:i + fragment_size] for i in range(0, len(text), fragment_size)]
+
+
+def bench_add_text(line_count, fragment_size):
+    fragments = _fragments(line_count, fragment_size)
+
+    def run():
+        paginator = Paginator(_NullPageBuilder())
+        for fragment in fragments:
+            paginator.add_text(fragment)
+        paginator.flush_incomplete_line()
+    return run
+
+
+def bench_paginate_file(line_count, path):
+    def run():
+        with open(path) as file:
+            paginate(file, page_builder=_more_page_builder())
+    return run
+
+
+def bench_passthrough(line_count, binary):
+    ''' Copies a binary file (in blocks) to a stream that is not a terminal '''
+    data = (_LINE * line_count).encode()
+
+    def run():
+        if binary:
+            output = BinaryOutput(NullStream())
+        else:
+            output = io.TextIOWrapper(NullStream(), encoding='utf-8')
+        paginate(io.BytesIO(data), output=output)
+    return run
+
+
+def bench_decompress(line_count, compress):
+    ''' Copies a compressed binary file (in blocks) to a stream that is not a terminal, decompressing it '''
+    compressed = compress((_LINE * line_count).encode())
+
+    def run():
+        paginate(io.BytesIO(compressed), output=BinaryOutput(NullStream()))
+    return run
+
+
+def bench_paginate_queue(line_count):
+    def run():
+        input_queue = queue.Queue()
+
+        def produce():
+            for _ in range(line_count):
+                input_queue.put(_LINE)
+            input_queue.put(END_OF_INPUT)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        paginate(input_queue, page_builder=_more_page_builder())
+        producer.join()
+    return run
+
+
+def bench_search_kth_match(line_count):
+    ''' Searches for the last of 'match_count' matches, spread evenly over the input '''
+    match_count = 100
+    lines_per_match = max(1, line_count // match_count)
+    text = ''.join(
+        'the needle\n' if i % lines_per_match == lines_per_match - 1 else _LINE
+        for i in range(line_count)
+    )
+
+    def run():
+        page_builder = _more_page_builder(keys=list(str(match_count)) + ['/', 'q'], prompt_answers=['needle'])
+        paginator = Paginator(page_builder)
+        paginator.add_text(_LINE * _SCREEN_HEIGHT)
+        paginator.add_text(text)
+        paginator.flush_incomplete_line()
+    return run
+
+
+def bench_parallel_search(line_count, path, search_processes):
+    '''
+        Searches a file for the last of 'match_count' matches of a regular expression,
+        using 'search_processes' processes (1 means the paginator searches the file itself)
+    '''
+    match_count = 100
+    lines_per_match = max(1, line_count // match_count)
+    if not os.path.exists(path):
+        # The file is shared by the benchmarks for every number of processes
+        with open(path, 'w') as file:
+            file.writelines(
+                'request {} timed out after 5000ms\n'.format(i) if i % lines_per_match == lines_per_match - 1 else _LINE
+                for i in range(line_count)
+            )
+
+    def run():
+        page_builder = _more_page_builder(
+            keys=list(str(match_count)) + ['/', 'q'], prompt_answers=['timed out after [0-9]+ms'])
+        paginate_file(path, page_builder=page_builder, search_processes=search_processes)
+    return run
+
+
+def bench_search_many_literals(line_count, literal_count):
+    ''' Searches for the first of 'literal_count' trace ids, which is at the end of the input '''
+    random_generator = random.Random(0)
+    trace_ids = ['{:032x}'.format(random_generator.getrandbits(128)) for _ in range(literal_count)]
+    lines = [
+        'Oct 17 10:00:00 host service[1234]: trace={:032x} request done\n'.format(random_generator.getrandbits(128))
+        for _ in range(line_count - 1)
+    ]
+    lines.append('trace={}\n'.format(trace_ids[-1]))
+
+    def run():
+        page = SearchPage('|'.join(trace_ids), next_page=PageOfHeight(_SCREEN_HEIGHT, NullOutput()), match_count=1)
+        page.skip_lines(lines, 0)
+    return run
+
+
+def bench_search_page(line_count):
+    ''' Sends lines directly to a SearchPage that never matches '''
+    lines = [_LINE] * line_count
+
+    def run():
+        page = SearchPage('needle', next_page=PageOfHeight(_SCREEN_HEIGHT, NullOutput()), match_count=1)
+        for line in lines:
+            page.add_line(line)
+    return run
+
+
+def bench_line_numbers(line_count):
+    ''' Displays all lines page per page, with line numbers enabled '''
+    text = _LINE * line_count
+
+    def run():
+        paginate([text], page_builder=_more_page_builder(keys=['l', ' ']))
+    return run
+
+
+def bench_more_page_builder(line_count):
+    ''' Displays all lines page per page, through all the default plugins '''
+    text = _LINE * line_count
+
+    def run():
+        paginate([text], page_builder=_more_page_builder(plugins=more_plugins.get()))
+    return run
+
+
+def bench_page_of_rows(line_count, wide):
+    '''
+        Displays all lines page per page on a screen that is 120 columns wide, counting the rows of every line.
+        If 'wide' is True, the lines contain colors and wide characters, and every fifth line is unique.
+    '''
+    if wide:
+        lines = [
+            '\x1b[32mOct 17 10:00:00\x1b[0m host サービス[{}]: a log line with wide characters\n'.format(
+                i if i % 5 == 0 else 0)
+            for i in range(line_count)
+        ]
+        text = ''.join(lines)
+    else:
+        text = _LINE * line_count
+
+    def run():
+        paginate([text], page_builder=_more_page_builder(plugins=more_plugins.get(), screen_width=120))
+    return run
+
+
+def bench_chopped_lines(line_count):
+    '''
+        Displays huge single-line records (like JSON documents of almost a megabyte) with chopped lines,
+        after scrolling the first page to the right.
+        The records hold as much text as 'line_count' lines of the usual size.
+    '''
+    record_count = max(_SCREEN_HEIGHT, line_count // 10_000)
+    record = '{"values": [' + ', '.join(str(i) for i in range(10_000 * len(_LINE) // 6)) + ']}\n'
+    lines = [record] * record_count
+
+    def run():
+        page_builder = _more_page_builder(keys=['S', '>', ' '], plugins=more_plugins.get(), screen_width=120)
+        paginate(lines, page_builder=page_builder)
+    return run
+
+
+def bench_unterminated_line(line_count, max_line_size):
+    '''
+        Paginates a single line without any '\\n' (like a binary dump), sent in fragments of 64 KB.
+        The text is produced on the fly, so the peak memory is what the paginator keeps of the line.
+    '''
+    fragment = _LINE.replace('\n', ' ') * (64 * 1024 // len(_LINE))
+    fragment_count = max(1, line_count * len(_LINE) // len(fragment))
+
+    def run():
+        paginator = Paginator(_NullPageBuilder(), max_line_size=max_line_size)
+        for _ in range(fragment_count):
+            paginator.add_text(fragment)
+        paginator.flush_incomplete_line()
+    return run
+
+
+def bench_history(line_count):
+    '''
+        Records the output page per page in a History that keeps 1 MB in memory (so most of it is in the file),
+        then goes back over all of it page per page.
+    '''
+    page = _LINE * _SCREEN_HEIGHT
+    page_count = line_count // _SCREEN_HEIGHT
+
+    def run():
+        history = History(memory_budget=1024 * 1024)
+        for _ in range(page_count):
+            history.record(page)
+        for first_line in range(history.line_count - _SCREEN_HEIGHT, -1, -_SCREEN_HEIGHT):
+            history.get_lines(first_line, first_line + _SCREEN_HEIGHT)
+        history.close()
+    return run
+
+
+def bench_goto_line(line_count, path):
+    '''
+        Indexes the file like the background thread of 'paginate_file' does,
+        then jumps to 1000 random lines (each a lookup of a checkpoint plus a scan of less than 1024 lines).
+    '''
+    lines = random.Random(0).sample(range(line_count), min(1000, line_count))
+
+    def run():
+        line_index = LineIndex()
+        with MappedFile(path, search_processes=1, line_index=line_index) as mapped_file:
+            line_index.start()
+            line_index.join()
+            for line in lines:
+                mapped_file.jump_to(line=line)
+    return run
+
+
+def bench_filter(line_count):
+    ''' Displays only the lines of one of 100 services, through all the default plugins '''
+    text = ''.join(
+        'Oct 17 10:00:00 host service-{}: a typical log line\n'.format(i % 100)
+        for i in range(line_count)
+    )
+
+    def run():
+        page_builder = _more_page_builder(keys=['&', ' '], prompt_answers=['service-7:'], plugins=more_plugins.get())
+        paginate([text], page_builder=page_builder)
+    return run
+
+
+def _create_benchmarks(line_count, path):
+    '''
+        Returns the benchmarks by name.
+        Every benchmark is a function that creates its input and returns the function to measure,
+        so only the benchmarks that are run create their input.
+    '''
+    search_path = os.path.join(os.path.dirname(path), 'search.log')
+    benchmarks = {
+        'add_text_fragment_{}'.format(size): partial(bench_add_text, line_count, size)
+        for size in (1, 64, 64 * 1024)
+    }
+    benchmarks.update({
+        'paginate_file': partial(bench_paginate_file, line_count, path),
+        'paginate_queue': partial(bench_paginate_queue, line_count),
+        'passthrough_text': partial(bench_passthrough, line_count, binary=False),
+        'passthrough_bytes': partial(bench_passthrough, line_count, binary=True),
+        'decompress_gzip': partial(bench_decompress, line_count, gzip.compress),
+        'decompress_bzip2': partial(bench_decompress, line_count, bz2.compress),
+        'decompress_xz': partial(bench_decompress, line_count, lzma.compress),
+        'search_kth_match': partial(bench_search_kth_match, line_count),
+        'search_page_skipping': partial(bench_search_page, line_count),
+        'search_1_literal': partial(bench_search_many_literals, line_count, 1),
+        'search_500_literals': partial(bench_search_many_literals, line_count, 500),
+        'line_numbers': partial(bench_line_numbers, line_count),
+        'more_page_builder': partial(bench_more_page_builder, line_count),
+        'page_of_rows_ascii': partial(bench_page_of_rows, line_count, wide=False),
+        'page_of_rows_wide': partial(bench_page_of_rows, line_count, wide=True),
+        'chopped_lines': partial(bench_chopped_lines, line_count),
+        'unterminated_line': partial(bench_unterminated_line, line_count, max_line_size=1024 * 1024),
+        'unterminated_line_unbounded': partial(bench_unterminated_line, line_count, max_line_size=None),
+        'history': partial(bench_history, line_count),
+        'goto_line': partial(bench_goto_line, line_count, path),
+        'filter': partial(bench_filter, line_count),
+    })
+    benchmarks.update({
+        'search_parallel_{}'.format(processes): partial(bench_parallel_search, line_count, search_path, processes)
+        for processes in (1, 2, 4, 8)
+    })
+    return benchmarks
+
+
+def measure(run, line_count, repeat):
+    '''
+        Returns the throughput and peak memory of 'run'.
+        Memory is measured in a separate run, as tracing slows everything down.
+    '''
+    seconds = min(_time(run) for _ in range(repeat))
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds': seconds,
+        'lines_per_second': line_count / seconds,
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def _time(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main():
+    arguments = _parse_arguments()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'input.log')
+        with open(path, 'w') as file:
+            file.write(_LINE * arguments.lines)
+
+        benchmarks = _create_benchmarks(arguments.lines, path)
+        names = arguments.only or list(benchmarks)
+        results = {}
+        for name in names:
+            results[name] = measure(benchmarks[name](), arguments.lines, arguments.repeat)
+            print('{:<28} {:>14,.0f} lines/s {:>12,} bytes peak'.format(
+                name, results[name]['lines_per_second'], results[name]['peak_memory_bytes']))
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump(_report(arguments, results), file, indent=2, sort_keys=True)
+
+
+def _report(arguments, results):
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'lines': arguments.lines,
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--lines', type=int, default=200 * 1000, help='number of input lines per benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs (the fastest is reported)')
+    parser.add_argument('--output', help='file to write the results to, as JSON')
+    parser.add_argument('--only', nargs='+', help='only run the given benchmarks')
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
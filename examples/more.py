@@ -3,7 +3,9 @@
     Implements a simple 'more' output-modifier that can be used in a pipe.
 
     Example usage: ls | more.py
-    
+                   more.py /var/log/syslog.2.gz
+
+    Compressed input (gzip, bzip2, xz or zstandard) is decompressed on the fly.
     When the page is full, use 'h' to see the options.
 '''
 import more_or_less
@@ -11,7 +13,11 @@ import sys
 
 
 def main():
-    more_or_less.paginate(input=sys.stdin)
+    if len(sys.argv) > 1:
+        more_or_less.paginate_file(sys.argv[1])
+    else:
+        # Read the bytes of stdin, so compressed input can be detected
+        more_or_less.paginate(input=sys.stdin.fileno())
     # Yes that's all that is required
 
 
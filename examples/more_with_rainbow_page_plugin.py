@@ -66,6 +66,9 @@ class RainbowPage(Page, RepeatableMixin):
     def flush(self):
         return self._page.flush()
 
+    def end_batch(self):
+        return self._page.end_batch()
+
     def repeat(self):
         return RainbowPage(self._page.height, self._page.output)
 
@@ -1,6 +1,12 @@
+from .async_paginator import AsyncPaginator, apaginate
+from .binary_output import BinaryOutput
 from .fixed_size_screen import FixedSizeScreen
+from .follower import Follower
+from .history import History
 from .input import Input
 from .line_count_plugin import LineCountPlugin
+from .line_index import LineIndex
+from .look_ahead import LookAhead
 from .more_page_builder import MorePageBuilder
 from .more_plugin import MorePlugin
 from .more_plugins import add_plugin, remove_plugin
@@ -8,30 +14,45 @@ from .output import Output
 from .page import Page
 from .page_builder import PageBuilder, StopOutput
 from .page_of_height import PageOfHeight
-from .paginator import Paginator, paginate, END_OF_INPUT, OUTPUT_STOPPED
+from .pagination_context import OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_SPILL, PaginationContext
+from .pagination_statistics import PaginationStatistics
+from .paginator import Paginator, paginate, paginate_file, END_OF_INPUT, OUTPUT_STOPPED
 from .repeatable_mixin import RepeatableMixin
 from .screen_dimensions import ScreenDimensions
 from .wrapped_page import WrappedPage
 
 
 __all__ = [
+    AsyncPaginator,
+    BinaryOutput,
     END_OF_INPUT,
     FixedSizeScreen,
+    Follower,
+    History,
     Input,
     LineCountPlugin,
+    LineIndex,
+    LookAhead,
     MorePageBuilder,
     MorePlugin,
     OUTPUT_STOPPED,
+    OVERFLOW_BLOCK,
+    OVERFLOW_DROP_OLDEST,
+    OVERFLOW_SPILL,
     Output,
     Page,
     PageBuilder,
     PageOfHeight,
+    PaginationContext,
+    PaginationStatistics,
     Paginator,
     RepeatableMixin,
     ScreenDimensions,
     StopOutput,
     WrappedPage,
     add_plugin,
+    apaginate,
     paginate,
+    paginate_file,
     remove_plugin,
 ]
@@ -0,0 +1,194 @@
+from .more_page_builder import MorePageBuilder
+from .page_builder import StopOutput
+from .paginator import END_OF_INPUT, MAX_LINE_SIZE, OUTPUT_STOPPED, Paginator
+import asyncio
+import time
+
+
+async def apaginate(
+        input,
+        output=None,
+        prompt=None,
+        screen_dimensions=None,
+        plugins=None,
+        page_builder=None,
+        statistics=None,
+        max_line_size=MAX_LINE_SIZE):
+    '''
+        Paginates the input from within an asyncio event loop.
+
+        This behaves like 'paginate', but it does not need a thread of its own:
+        the input is read and the pages are written from the event loop.
+        Only waiting for the user's action at the '--More--' prompt is done in the
+        event loop's default executor, so the event loop is never blocked
+        (and many streams can be paginated concurrently).
+
+        Every stream that is waiting at the prompt holds one thread of that executor
+        (by default a ThreadPoolExecutor with min(32, os.cpu_count() + 4) threads).
+        Once all of them are taken, the prompts of the other streams wait for a free thread,
+        and so does any other code that uses the default executor (like 'loop.getaddrinfo').
+        To paginate more streams at once, give the loop a bigger executor
+        (see 'loop.set_default_executor').
+
+        Arguments:
+        ----------
+
+        input: [type async iterable, iterable or asyncio.Queue]
+            The input text that should be paginated.
+            A plain iterable is iterated on the event loop, so it must not block
+            (like a list of text). Use an async iterable for everything else.
+            If it is an asyncio.Queue, you must pass 'END_OF_INPUT' into the queue
+            when no more input is expected.
+
+        All other arguments have the same meaning as for 'paginate'.
+
+        Returns:
+        --------
+
+        OUTPUT_STOPPED if the user stopped the output (for example using ctrl+c)
+    '''
+    page_builder = page_builder or MorePageBuilder(
+        input=prompt,
+        output=output,
+        screen_dimensions=screen_dimensions,
+        plugins=plugins,
+        statistics=statistics)
+
+    paginator = AsyncPaginator(page_builder, statistics, max_line_size)
+    if isinstance(input, asyncio.Queue):
+        return await paginator.paginate_from_queue(input)
+    else:
+        return await paginator.paginate(input)
+
+
+class AsyncPaginator(Paginator):
+    '''
+        Version of the Paginator whose methods are coroutines.
+
+        There are 4 ways to send input text:
+            - pass an (async) iterable to self.paginate.
+            - pass an asyncio.Queue to self.paginate_from_queue.
+            - pass a file object to self.paginate_from_file.
+            - call 'add_text' repeatedly until all text has been sent in, then call 'flush_incomplete_line'.
+
+        Each of these methods returns 'OUTPUT_STOPPED' if the user stopped the output (for example using ctrl+c)
+    '''
+
+    async def paginate(self, iterable):
+        '''
+            Iterates over the (async) iterable, and paginates all the text it returns.
+
+            A plain (not async) iterable is iterated on the event loop,
+            so it must not block (e.g. use an async iterable to read from a socket or a pipe).
+        '''
+        # Like the Paginator, inputs like the MappedFile can skip ahead to the next match of a search or jump
+        skip_to_match = getattr(iterable, 'skip_to_match', None)
+        jump_to = getattr(iterable, 'jump_to', None)
+        iterable = _iterate(iterable)
+        if self._statistics is not None:
+            iterable = _TimedAsyncIterator(iterable, self._statistics)
+        try:
+            async for text in iterable:
+                await self._build_pages(self._paginate_text(text, skip_to_match, jump_to))
+
+            await self._build_pages(self._flush_lines())
+        except StopOutput:
+            return OUTPUT_STOPPED
+
+    async def paginate_from_queue(self, input_queue):
+        '''
+            Iterates over the asyncio.Queue, and paginates all the text it returns.
+            Stops paginating when END_OF_INPUT is encountered on the queue.
+        '''
+        return await self.paginate(AsyncQueueIterator(input_queue))
+
+    async def add_text(self, input_text):
+        try:
+            await self._build_pages(self._paginate_text(input_text))
+        except StopOutput:
+            return OUTPUT_STOPPED
+
+    async def flush_incomplete_line(self):
+        try:
+            await self._build_pages(self._flush_lines())
+        except StopOutput:
+            return OUTPUT_STOPPED
+
+    async def _build_pages(self, steps):
+        # The pagination itself is shared with the Paginator, only building the next page is done differently
+        for _ in steps:
+            await self._start_new_page()
+
+    async def _start_new_page(self):
+        self._flush_page()
+        # Building the next page waits for the user, so it must not run on the event loop.
+        # Every stream that waits at the prompt holds a thread of the executor, see 'apaginate'.
+        loop = asyncio.get_running_loop()
+        if self._statistics is not None:
+            self._page = await loop.run_in_executor(None, self._build_next_page_and_record_time)
+        else:
+            self._page = await loop.run_in_executor(None, self._page_builder.build_next_page)
+
+
+class AsyncQueueIterator(object):
+    '''
+        Iterates over an asyncio.Queue, until END_OF_INPUT is encountered.
+
+        Every iteration waits until an item is available,
+        and then returns the concatenation of all the text that is waiting in the queue.
+    '''
+
+    def __init__(self, queue):
+        self._queue = queue
+        self._end_of_input = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._end_of_input:
+            raise StopAsyncIteration
+
+        text = await self._queue.get()
+        if text is END_OF_INPUT:
+            self._end_of_input = True
+            raise StopAsyncIteration
+
+        batch = [text]
+        while not self._queue.empty():
+            text = self._queue.get_nowait()
+            if text is END_OF_INPUT:
+                self._end_of_input = True
+                break
+            batch.append(text)
+        return ''.join(batch)
+
+
+class _TimedAsyncIterator(object):
+    '''
+        Iterates over the async iterable, recording the time spent waiting for its text
+    '''
+
+    def __init__(self, iterable, statistics):
+        self._iterator = iterable.__aiter__()
+        self._statistics = statistics
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        start = time.perf_counter()
+        try:
+            return await self._iterator.__anext__()
+        finally:
+            self._statistics.read_seconds = self._statistics.read_seconds + (time.perf_counter() - start)
+
+
+async def _iterate(iterable):
+    # A plain iterable is iterated on the event loop, which is blocked while it waits for its next text
+    if hasattr(iterable, '__aiter__'):
+        async for text in iterable:
+            yield text
+    else:
+        for text in iterable:
+            yield text
@@ -0,0 +1,48 @@
+from .more_plugin import MorePlugin
+
+_NO_HISTORY_MESSAGE = '--There is no history to go back to--'
+_START_OF_HISTORY_MESSAGE = '--Start of the history--'
+
+
+class BackPlugin(MorePlugin):
+    '''
+        Displays the k-th page before the one on the screen again, on 'b'.
+        Pressing 'b' again goes further back, until new output is displayed.
+
+        The pages are taken from the History of the output (see history.py),
+        so this works for every input, including pipes and queues.
+        After going back, the next page continues with the input where it stopped.
+    '''
+
+    def __init__(self):
+        # The first line of the history that was displayed last, and the size of the history at that time
+        self._first_line = None
+        self._history_line_count = None
+
+    def get_keys(self):
+        return ['b']
+
+    def get_help(self):
+        yield ('b', 'Skip backwards k screenfuls of text [1]')
+
+    def build_page(self, page_builder, key_pressed, arguments):
+        history = page_builder.get_history()
+        if history is None or history.line_count == 0:
+            return page_builder.build_next_page(message=_NO_HISTORY_MESSAGE)
+
+        height = page_builder.get_page_height()
+        first_line = self._get_first_displayed_line(history, height)
+        if first_line == 0:
+            return page_builder.build_next_page(message=_START_OF_HISTORY_MESSAGE)
+
+        first_line = max(0, first_line - arguments.get('count', 1) * height)
+        history.replay(first_line, first_line + height, page_builder.get_output())
+        self._first_line = first_line
+        self._history_line_count = history.line_count
+        return page_builder.build_next_page()
+
+    def _get_first_displayed_line(self, history, height):
+        if self._history_line_count == history.line_count:
+            # Nothing was displayed since we went back the last time
+            return self._first_line
+        return max(0, history.line_count - height)
@@ -0,0 +1,39 @@
+from .output import Output
+import sys
+
+
+class BinaryOutput(Output):
+    '''
+        Writes straight to a binary stream (by default 'sys.stdout.buffer'),
+        bypassing the text layer of 'sys.stdout'.
+
+        Text is encoded using 'encoding' and 'errors' (by default the ones of 'sys.stdout'),
+        bytes are written as they are.
+        So when the input is copied to the output without paginating it (see 'paginate'),
+        bytes input is never decoded nor encoded.
+
+        When writing to 'sys.stdout.buffer', the text that is still pending in 'sys.stdout' is flushed first,
+        so the output stays in order with the text written through 'sys.stdout' (like the '--More--' prompt).
+    '''
+
+    def __init__(self, stream=None, encoding=None, errors=None):
+        self._text_stream = None
+        if stream is None:
+            self._text_stream = sys.stdout
+            stream = sys.stdout.buffer
+        self._stream = stream
+        self.encoding = encoding or getattr(self._text_stream, 'encoding', None) or 'utf-8'
+        self.errors = errors or getattr(self._text_stream, 'errors', None) or 'strict'
+
+    def write(self, text):
+        if self._text_stream is not None:
+            self._text_stream.flush()
+        if isinstance(text, str):
+            text = text.encode(self.encoding, self.errors)
+        self._stream.write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def isatty(self):
+        return self._stream.isatty()
@@ -20,5 +20,18 @@ class BufferedInput(Input):
             return self._buffered_characters.get()
         return self._input.get_character(message)
 
+    def poll_character(self, message):
+        if not self._buffered_characters.empty():
+            return self._buffered_characters.get()
+        poll_character = getattr(self._input, 'poll_character', None)
+        if poll_character is None:
+            return None
+        return poll_character(message)
+
+    def clear_message(self):
+        clear_message = getattr(self._input, 'clear_message', None)
+        if clear_message is not None:
+            clear_message()
+
     def put_back(self, character):
         self._buffered_characters.put(character)
@@ -0,0 +1,75 @@
+from .chopped_page import ColumnWindow
+from .more_plugin import MorePlugin
+from contextlib import nullcontext
+
+_UNKNOWN_WIDTH_MESSAGE = '--Long lines can not be chopped, the screen width is unknown--'
+_NOT_CHOPPED_MESSAGE = '--Long lines are not chopped (press S to chop them)--'
+
+
+class ChopPlugin(MorePlugin):
+    '''
+        Toggles chopping long lines to the screen width (like 'less -S') on 'S'.
+        While lines are chopped, '<' and '>' scroll the visible columns k columns to the left or right,
+        and display the current page again.
+
+        Only the visible columns of every line are written (see ChoppedPage),
+        while the other plugins (like searching and filtering) still see the complete lines.
+    '''
+
+    def __init__(self):
+        self.chopping_enabled = False
+        # None means half the screen width
+        self._scroll_columns = None
+
+    def get_keys(self):
+        return ['S', '<', '>']
+
+    def get_help(self):
+        yield ('S', 'Toggle chopping long lines to the screen width [currently {}]'.format(self._format_enabled()))
+        yield ('< or >', 'Scroll chopped lines k columns to the left or right [{}]*'.format(
+            self._format_scroll_columns()))
+
+    def build_page(self, page_builder, key_pressed, arguments):
+        if key_pressed == 'S':
+            return self._toggle(page_builder)
+        elif key_pressed in ('<', '>'):
+            self._scroll_columns = arguments.get('count', self._scroll_columns)
+            return self._scroll(page_builder, left=(key_pressed == '<'))
+        else:
+            assert False, 'Unexpected key event'
+
+    def _toggle(self, page_builder):
+        if self.chopping_enabled:
+            page_builder.set_column_window(None)
+        else:
+            width = page_builder.get_page_width()
+            if width is None:
+                return page_builder.build_next_page(message=_UNKNOWN_WIDTH_MESSAGE)
+            page_builder.set_column_window(ColumnWindow(width))
+        self.chopping_enabled = not self.chopping_enabled
+        return page_builder.build_next_page(message=f'--Chopping long lines is now {self._format_enabled()}--')
+
+    def _scroll(self, page_builder, left):
+        window = page_builder.get_column_window()
+        if window is None:
+            return page_builder.build_next_page(message=_NOT_CHOPPED_MESSAGE)
+
+        columns = self._scroll_columns or max(1, window.width // 2)
+        window.scroll(-columns if left else columns)
+        if window.page is not None:
+            history = page_builder.get_history()
+            # The page is already in the history
+            with history.pause_recording() if history is not None else nullcontext():
+                window.page.redisplay()
+        return page_builder.build_next_page(message=f'--Column {window.offset + 1}--')
+
+    def _format_enabled(self):
+        return {
+            True: 'enabled',
+            False: 'disabled',
+        }.get(self.chopping_enabled)
+
+    def _format_scroll_columns(self):
+        if self._scroll_columns is None:
+            return 'half the screen width'
+        return self._scroll_columns
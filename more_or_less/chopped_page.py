@@ -0,0 +1,63 @@
+from .display_width import chop_line
+from .page_of_height import PageOfHeight
+
+
+class ColumnWindow(object):
+    '''
+        The columns of the input lines that are visible when long lines are chopped:
+        'width' columns, starting at column 'offset'.
+
+        It is shared by all ChoppedPages, so scrolling it also changes the columns of the pages that follow.
+        'page' is the ChoppedPage that was created last, which is the one displayed on the screen.
+    '''
+
+    def __init__(self, width, offset=0):
+        self.width = width
+        self.offset = offset
+        self.page = None
+
+    def scroll(self, columns):
+        ''' Moves the window 'columns' to the right (or to the left if negative), but not before the first column '''
+        self.offset = max(0, self.offset + columns)
+
+
+class ChoppedPage(PageOfHeight):
+    '''
+        A page that only writes the columns of every line that are visible in the ColumnWindow (like 'less -S'),
+        so every line takes up exactly one row, and huge lines are never sent to the terminal as a whole.
+
+        The page keeps the lines that were added (not copies of them), so they can be displayed again
+        when the window scrolls (see 'redisplay').
+    '''
+
+    def __init__(self, height, output, window):
+        super().__init__(height, output)
+        self.window = window
+        self.lines = []
+        window.page = self
+
+    def add_line(self, line):
+        self.lines.append(line)
+        super().add_line(chop_line(line, self.window.offset, self.window.width))
+
+    def add_lines(self, lines, start):
+        if self._line_by_line or self._remaining_lines <= 0:
+            return super().add_lines(lines, start)
+
+        end = min(len(lines), start + self._remaining_lines)
+        added_lines = lines[start:end]
+        self.lines.extend(added_lines)
+        offset = self.window.offset
+        width = self.window.width
+        super().add_lines([chop_line(line, offset, width) for line in added_lines], 0)
+        return end
+
+    def redisplay(self):
+        ''' Writes all lines of the page again, chopped at the current columns of the window '''
+        offset = self.window.offset
+        width = self.window.width
+        self.output.write(''.join(chop_line(line, offset, width) for line in self.lines))
+        self.output.flush()
+
+    def repeat(self):
+        return ChoppedPage(self.height, self.output, self.window)
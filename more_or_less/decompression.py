@@ -0,0 +1,232 @@
+from itertools import chain
+import bz2
+import lzma
+import queue
+import threading
+import zlib
+
+try:
+    # Part of the standard library since Python 3.14
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+
+GZIP = 'gzip'
+BZIP2 = 'bzip2'
+XZ = 'xz'
+ZSTANDARD = 'zstandard'
+
+# The signatures at the start of each compression format.
+# They are complete enough that text is not mistaken for compressed data
+# (a bzip2 stream starts with 'BZh', its block size and the magic of its first block or of its end).
+_MAGIC_BYTES = {
+    GZIP: (b'\x1f\x8b\x08',),
+    BZIP2: tuple(
+        b'BZh' + str(level).encode() + block_magic
+        for level in range(1, 10)
+        for block_magic in (b'1AY&SY', b'\x17rE8P\x90')),
+    XZ: (b'\xfd7zXZ\x00',),
+    ZSTANDARD: (b'\x28\xb5\x2f\xfd',),
+}
+_MAGIC_SIZE = max(len(magic) for signatures in _MAGIC_BYTES.values() for magic in signatures)
+
+# Maximum number of bytes returned by a single decompression step
+BLOCK_SIZE = 1024 * 1024
+# Maximum number of decompressed blocks that wait for the paginator
+MAX_BLOCKS = 4
+
+
+def detect_compression(data):
+    '''
+        Returns the compression format (GZIP, BZIP2, XZ or ZSTANDARD) of the bytes that start with 'data',
+        or None if they are not compressed.
+    '''
+    for compression, signatures in _MAGIC_BYTES.items():
+        if data.startswith(signatures):
+            return compression
+    return None
+
+
+def detect_file_compression(path):
+    ''' Returns the compression format of the file at 'path' (see 'detect_compression') '''
+    with open(path, 'rb') as file:
+        return detect_compression(file.read(_MAGIC_SIZE))
+
+
+def decompress(iterable, block_size=BLOCK_SIZE, max_blocks=MAX_BLOCKS):
+    '''
+        Iterates over the iterable, decompressing its content if it is compressed bytes
+        (as detected by the magic bytes at the start, see 'detect_compression').
+        Text and uncompressed bytes are returned as they are.
+
+        Nothing is read before the first item is requested.
+        See DecompressingIterator for how the content is decompressed.
+    '''
+    iterator = iter(iterable)
+    head = []
+    for data in iterator:
+        head.append(data)
+        if isinstance(data, str) or not _could_be_compressed(b''.join(head)):
+            break
+
+    iterator = chain(head, iterator)
+    compression = detect_compression(b''.join(head)) if head and not isinstance(head[0], str) else None
+    if compression is None:
+        yield from iterator
+        return
+
+    decompressing_iterator = DecompressingIterator(iterator, compression, block_size, max_blocks)
+    try:
+        yield from decompressing_iterator
+    finally:
+        decompressing_iterator.close()
+
+
+def _could_be_compressed(head):
+    ''' Returns True if 'head' is too short to tell whether it is the start of compressed data '''
+    return any(
+        len(head) < len(magic) and magic.startswith(head)
+        for signatures in _MAGIC_BYTES.values()
+        for magic in signatures)
+
+
+class DecompressingIterator(object):
+    '''
+        Iterates over the decompressed content of an iterable over compressed bytes.
+
+        The compressed bytes are read and decompressed in a worker thread,
+        so the decompression overlaps with the pagination.
+        Every decompression step returns at most 'block_size' bytes,
+        and at most 'max_blocks' blocks wait for the paginator,
+        so the memory use is bounded however much the archive expands.
+
+        Concatenated streams (like 'cat first.gz second.gz') are decompressed one after the other.
+
+        Call 'close()' when the content is not needed anymore, so the worker thread stops.
+        Note a worker thread that waits for input that never comes can not be interrupted,
+        so it is a daemon thread.
+    '''
+
+    def __init__(self, iterable, compression, block_size=BLOCK_SIZE, max_blocks=MAX_BLOCKS):
+        self._blocks = queue.Queue(maxsize=max_blocks)
+        self._stopped = threading.Event()
+        self._end_of_input = False
+        self._thread = threading.Thread(
+            target=self._decompress,
+            args=(iter(iterable), compression, block_size),
+            daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stopped.set()
+        # Wakes up the worker thread if it waits for room in the queue
+        _empty_queue(self._blocks)
+
+    def join(self, timeout=None):
+        '''
+            Waits until the worker thread ended, which happens after 'close()' or at the end of the input.
+            Returns False if the thread is still running after 'timeout' seconds.
+        '''
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._end_of_input:
+            raise StopIteration
+
+        block = self._blocks.get()
+        if isinstance(block, bytes):
+            return block
+
+        self._end_of_input = True
+        if block is not None:
+            raise block
+        raise StopIteration
+
+    def _decompress(self, chunks, compression, block_size):
+        try:
+            for block in _decompress_stream(chunks, compression, block_size):
+                self._blocks.put(block)
+                if self._stopped.is_set():
+                    break
+            else:
+                self._blocks.put(None)
+        except Exception as error:
+            self._blocks.put(error)
+        finally:
+            if self._stopped.is_set():
+                # The blocks are not needed anymore, so they must not stay in memory
+                _empty_queue(self._blocks)
+
+
+def _empty_queue(blocks):
+    try:
+        while True:
+            blocks.get_nowait()
+    except queue.Empty:
+        pass
+
+
+def _decompress_stream(chunks, compression, block_size):
+    ''' Yields the decompressed content of the compressed chunks, in blocks of at most 'block_size' bytes '''
+    decompressor = _create_decompressor(compression)
+    for data in chunks:
+        while True:
+            if decompressor.eof:
+                # The next stream starts after the end of this one, possibly after some zero padding
+                data = (decompressor.unused_data + data).lstrip(b'\0')
+                if not data:
+                    break
+                decompressor = _create_decompressor(compression)
+
+            block = decompressor.decompress(data, block_size)
+            data = b''
+            if block:
+                yield block
+            if decompressor.needs_input and not decompressor.eof:
+                break
+
+    if not decompressor.eof:
+        raise EOFError('Compressed input ended before the end of the {} stream'.format(compression))
+
+
+def _create_decompressor(compression):
+    if compression == GZIP:
+        return _GzipDecompressor()
+    if compression == BZIP2:
+        return bz2.BZ2Decompressor()
+    if compression == XZ:
+        return lzma.LZMADecompressor()
+    if zstd is None:
+        raise ValueError('Decompressing zstandard input requires Python 3.14 or newer')
+    return zstd.ZstdDecompressor()
+
+
+class _GzipDecompressor(object):
+    '''
+        Decompresses a gzip stream using zlib,
+        with the same interface as the decompressors of bz2 and lzma.
+    '''
+
+    def __init__(self):
+        self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+        self.needs_input = True
+
+    @property
+    def eof(self):
+        return self._decompressor.eof
+
+    @property
+    def unused_data(self):
+        return self._decompressor.unused_data
+
+    def decompress(self, data, max_length):
+        data = self._decompressor.unconsumed_tail + data
+        block = self._decompressor.decompress(data, max_length)
+        # A full block may leave output behind in zlib itself, even if all input is consumed
+        self.needs_input = not self._decompressor.unconsumed_tail and len(block) < max_length
+        return block
@@ -0,0 +1,151 @@
+from functools import lru_cache
+import re
+import unicodedata
+
+
+# Number of columns between two tab stops
+TAB_SIZE = 8
+
+# ANSI escape sequences (like colors) take up no room on the screen:
+#   - CSI sequences, like '\x1b[31m'
+#   - OSC sequences, like '\x1b]8;;http://example.com\x1b\\', ended by BEL or ST
+#   - two character sequences, like '\x1b='
+_ANSI_ESCAPE = re.compile(r'\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[@-Z\\-_])')
+
+# Width of every character in the Basic Multilingual Plane, built on first use.
+# Character 'i' is chr(<width of chr(i)>), so 'str.translate' can look up the widths of a whole line at once.
+_BMP_WIDTHS = None
+# Width of the characters outside of the Basic Multilingual Plane we have seen so far
+_OTHER_WIDTHS = {}
+
+# Only lines of at most this many screen widths are cached by 'count_rows',
+# so the cache never keeps more than a few screens worth of text per entry alive
+_CACHED_SCREEN_WIDTHS = 2
+
+
+def count_rows(line, screen_width):
+    '''
+        Returns the number of rows 'line' takes up on a terminal that is 'screen_width' columns wide.
+        Every line takes up at least one row.
+
+        Printable ASCII text (the common case) is counted without looking at the characters one by one.
+        The widths of the characters of other lines are looked up all at once (see 'get_character_width'),
+        and only lines with wide characters that wrap are followed character per character,
+        as a wide character that does not fit at the end of a row moves to the next one.
+        The result for short lines (up to two screen widths) is cached, so repeated lines are only measured once.
+        Longer lines are measured every time, so the cache does not keep huge lines in memory.
+    '''
+    text = line.rstrip('\r\n')
+    if text.isascii() and text.isprintable():
+        return max(1, -(-len(text) // screen_width))
+    if len(text) <= _CACHED_SCREEN_WIDTHS * screen_width:
+        return _count_rows_cached(text, screen_width)
+    return _count_rows(text, screen_width)
+
+
+def _count_rows(text, screen_width):
+    if '\x1b' in text:
+        text = _ANSI_ESCAPE.sub('', text)
+        if text.isascii() and text.isprintable():
+            return max(1, -(-len(text) // screen_width))
+
+    if '\t' not in text and max(text) <= '\uffff':
+        widths = text.translate(_BMP_WIDTHS or _build_bmp_widths())
+        width = len(text) - widths.count('\0') + widths.count('\2')
+        if width <= screen_width or '\2' not in widths:
+            return max(1, -(-width // screen_width))
+
+    rows = 1
+    column = 0
+    for character in text:
+        if character == '\t':
+            width = min(TAB_SIZE - column % TAB_SIZE, screen_width - column)
+        else:
+            width = get_character_width(character)
+        if column + width > screen_width:
+            # Wide characters that do not fit on the row start on the next one
+            rows = rows + 1
+            column = 0
+        column = column + width
+    return rows
+
+
+_count_rows_cached = lru_cache(maxsize=4096)(_count_rows)
+
+
+def chop_line(line, offset, width):
+    '''
+        Returns the part of 'line' that is displayed in the columns 'offset' up to 'offset + width',
+        followed by the line ending (if any).
+
+        Only the start of the line up to the end of that window is looked at,
+        so chopping a line of several megabytes is as cheap as chopping a short line.
+        Tabs are expanded to spaces, and escape sequences in the window are kept (and take up no room).
+        A wide character or tab that straddles the left edge of the window is replaced by spaces.
+    '''
+    end = offset + width
+    ending = '\n' if line.endswith('\n') else ''
+    head = line[:end].rstrip('\r\n')
+    if head.isascii() and head.isprintable():
+        return head[offset:] + ending
+
+    pieces = []
+    column = 0
+    index = 0
+    length = len(line)
+    while index < length:
+        character = line[index]
+        if character == '\n':
+            break
+        if character == '\x1b':
+            match = _ANSI_ESCAPE.match(line, index)
+            if match:
+                if column >= offset:
+                    pieces.append(match.group())
+                index = match.end()
+                continue
+
+        if character == '\t':
+            character_width = TAB_SIZE - column % TAB_SIZE
+        else:
+            character_width = get_character_width(character)
+        if column + character_width > end:
+            break
+        if column >= offset:
+            pieces.append(' ' * character_width if character == '\t' else character)
+        elif column + character_width > offset:
+            pieces.append(' ' * (column + character_width - offset))
+        column = column + character_width
+        index = index + 1
+    return ''.join(pieces) + ending
+
+
+def get_character_width(character):
+    '''
+        Returns the number of columns the character takes up:
+            - 2 for wide characters (East Asian 'W' and 'F', like most CJK characters and emoji)
+            - 0 for combining and formatting characters, and control characters
+            - 1 for all other characters
+    '''
+    code_point = ord(character)
+    if code_point < 0x10000:
+        return ord((_BMP_WIDTHS or _build_bmp_widths())[code_point])
+
+    width = _OTHER_WIDTHS.get(character)
+    if width is None:
+        width = _OTHER_WIDTHS[character] = _compute_character_width(character)
+    return width
+
+
+def _build_bmp_widths():
+    global _BMP_WIDTHS
+    _BMP_WIDTHS = ''.join(chr(_compute_character_width(chr(code_point))) for code_point in range(0x10000))
+    return _BMP_WIDTHS
+
+
+def _compute_character_width(character):
+    if unicodedata.east_asian_width(character) in ('W', 'F'):
+        return 2
+    if unicodedata.category(character) in ('Mn', 'Me', 'Cf', 'Cc'):
+        return 0
+    return 1
@@ -0,0 +1,165 @@
+from .more_plugin import MorePlugin
+from .page import Page
+from .search_engine import compile_search
+from itertools import compress, islice
+from operator import not_
+
+_FILTER_DISABLED = '--Showing all lines--'
+_FILTER_ENABLED = '--Showing only lines {}matching {}--'
+
+# Number of lines that are filtered in one go.
+# Bigger blocks make the filtering faster, but they are filtered completely even if
+# only the first few lines fit on the page.
+_BLOCK_SIZE = 1024
+
+
+class FilterPlugin(MorePlugin):
+    '''
+        Only displays the lines that match a regular expression, until the filter is turned off.
+        Invoked when the user types '&'.
+        If the regular expression starts with '!', only the lines that do _not_ match are displayed.
+        An empty regular expression displays all lines again.
+
+        Like the SearchPlugin, the regular expression can be a set of alternatives
+        (like 'first|second|third').
+    '''
+
+    def __init__(self):
+        self._pattern = None
+        self._compiled_search = None
+        self._exclude = False
+
+    def get_keys(self):
+        return ['&']
+
+    def build_page(self, page_builder, key_pressed, arguments):
+        self._update_filter(page_builder.get_input().prompt('&'))
+        page_builder.get_output().write(self._format_status() + '\n')
+        return page_builder.create_page(page_builder.get_page_height())
+
+    def wrap_page(self, page):
+        if self._compiled_search is None:
+            return page
+        return FilterPage(page, self._compiled_search, self._exclude)
+
+    def transforms_lines(self):
+        return self._compiled_search is not None
+
+    def get_help(self):
+        yield ('&<regular expression>', 'Display only lines matching the regular expression (&! for not matching)')
+
+    def _update_filter(self, pattern):
+        self._exclude = pattern.startswith('!')
+        if self._exclude:
+            pattern = pattern[1:]
+
+        if pattern:
+            self._pattern = pattern
+            self._compiled_search = compile_search(pattern)
+        else:
+            self._pattern = None
+            self._compiled_search = None
+
+    def _format_status(self):
+        if self._compiled_search is None:
+            return _FILTER_DISABLED
+        return _FILTER_ENABLED.format('not ' if self._exclude else '', self._pattern)
+
+
+class FilterPage(Page):
+    '''
+        A page that only forwards the lines that match the CompiledSearch (see search_engine.py)
+        to the wrapped page, or only the lines that do not match if 'exclude' is True.
+
+        Blocks of lines are filtered in 'add_lines', using the block search of the CompiledSearch,
+        so the lines that are filtered out are never looked at one by one.
+        The remaining lines are forwarded to the wrapped page in runs of consecutive lines.
+
+        The lines that are filtered out are passed to 'hide_lines' of the wrapped page, in between those runs,
+        so the plugins that wrap the page below the filter (like the line numbers) still count every line.
+    '''
+
+    def __init__(self, wrapped_page, compiled_search, exclude=False):
+        self.wrapped_page = wrapped_page
+        self._compiled_search = compiled_search
+        self._matcher = compiled_search.line_matcher
+        self._exclude = exclude
+        # The number of lines that were not displayed because of the filter
+        self.filtered_line_count = 0
+
+    def is_full(self):
+        return self.wrapped_page.is_full()
+
+    def add_line(self, line):
+        if bool(self._matcher.search(line)) != self._exclude:
+            self.wrapped_page.add_line(line)
+        else:
+            self._hide_lines([line], 0, 1)
+
+    def add_lines(self, lines, start):
+        wrapped_page = self.wrapped_page
+        line_count = len(lines)
+        while start < line_count and not wrapped_page.is_full():
+            end = min(start + _BLOCK_SIZE, line_count)
+            position = start
+            for run_start, run_end in _runs(self._find_shown_lines(lines[start:end])):
+                self._hide_lines(lines, position, start + run_start)
+                run = lines[start + run_start:start + run_end]
+                position = start + run_start + wrapped_page.add_lines(run, wrapped_page.skip_lines(run, 0))
+                if wrapped_page.is_full():
+                    # The lines after the last added line are left for the next page,
+                    # which may use another filter
+                    return position
+            self._hide_lines(lines, position, end)
+            start = end
+        return start
+
+    def hide_lines(self, lines, start, end):
+        # Hidden by another filter that wraps this one
+        return self.wrapped_page.hide_lines(lines, start, end)
+
+    def _hide_lines(self, lines, start, end):
+        if end > start:
+            self.filtered_line_count = self.filtered_line_count + (end - start)
+            self.wrapped_page.hide_lines(lines, start, end)
+
+    def _find_shown_lines(self, block):
+        if self._exclude:
+            return list(compress(range(len(block)), map(not_, map(self._matcher.search, block))))
+        return list(self._compiled_search.find_matching_lines(block))
+
+    @property
+    def skipped_line_count(self):
+        # Includes the lines skipped by the wrapped page (e.g. while searching)
+        return self.filtered_line_count + getattr(self.wrapped_page, 'skipped_line_count', 0)
+
+    def flush(self):
+        return self.wrapped_page.flush()
+
+    def end_batch(self):
+        return self.wrapped_page.end_batch()
+
+    def get_pending_jump(self):
+        return self.wrapped_page.get_pending_jump()
+
+    def end_jump(self, line):
+        return self.wrapped_page.end_jump(line)
+
+    def prompts_when_full(self):
+        return self.wrapped_page.prompts_when_full()
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped_page, name)
+
+
+def _runs(indices):
+    ''' Yields a (start, end) tuple for every run of consecutive numbers in the sorted list 'indices' '''
+    if not indices:
+        return
+    run_start = previous = indices[0]
+    for index in islice(indices, 1, None):
+        if index != previous + 1:
+            yield run_start, previous + 1
+            run_start = index
+        previous = index
+    yield run_start, previous + 1
@@ -0,0 +1,87 @@
+from .fixed_size_screen import _HUGE
+from .more_plugin import MorePlugin
+from .page_of_height import PageOfHeight
+
+_FOLLOW_MESSAGE = 'Waiting for data... (press any key to stop following)'
+
+
+class FollowPlugin(MorePlugin):
+    '''
+        Follows the input, like 'tail -f': displays the new lines as they arrive, without prompting.
+        Invoked when the user types 'F'.
+        Pressing any key stops following, and prompts the user again.
+
+        While following, an input that reached its end waits for more input (see Follower).
+        Inputs that can not wait (like a list of lines) simply end.
+    '''
+
+    def get_keys(self):
+        return ['F']
+
+    def build_page(self, page_builder, key_pressed, arguments):
+        return FollowPage(
+            output=page_builder.get_output(),
+            input=page_builder.get_input(),
+            follower=page_builder.get_follower())
+
+    def get_help(self):
+        yield ('F', 'Follow the input, displaying new lines as they arrive (until a key is pressed)')
+
+
+class FollowPage(PageOfHeight):
+    '''
+        A page that is never full, and writes (and flushes) the lines of every input batch as soon as they are added.
+        While it exists, the Follower makes the input wait for more lines at its end.
+
+        At the end of every batch (which includes the empty batches the input returns while it waits)
+        the page checks whether the user pressed a key, using 'input.poll_character'.
+        If so, it stops following and becomes full, and the user is prompted right away.
+        The message is removed using 'input.clear_message', so a key typed meanwhile is not lost.
+    '''
+
+    def __init__(self, output, input, follower=None):
+        super().__init__(height=_HUGE, output=output)
+        self._input = input
+        self._follower = follower
+        self.is_stopped = False
+        if follower is not None:
+            follower.following = True
+
+    def is_full(self):
+        return self.is_stopped
+
+    def add_lines(self, lines, start):
+        if self.is_stopped:
+            return start
+        return super().add_lines(lines, start)
+
+    def end_batch(self):
+        if self._pending_lines:
+            # Removes the message, so the lines are not written after it
+            self._input.clear_message()
+            self._write_pending_lines()
+            self.output.flush()
+        if not self.is_stopped:
+            self._poll_for_key(_FOLLOW_MESSAGE)
+
+    def flush(self):
+        self._stop()
+        super().flush()
+
+    def prompts_when_full(self):
+        return True
+
+    def repeat(self):
+        return FollowPage(self.output, self._input, self._follower)
+
+    def _poll_for_key(self, message):
+        if self._input.poll_character(message) is not None:
+            self._stop()
+
+    def _stop(self):
+        if self.is_stopped:
+            return
+        self.is_stopped = True
+        if self._follower is not None:
+            self._follower.following = False
+        self._input.clear_message()
@@ -0,0 +1,87 @@
+import os
+import select
+import stat
+import time
+
+
+# Seconds between two checks for more input while following
+# (which is also how long it takes to notice the key press that stops following)
+POLL_INTERVAL = 0.25
+
+# The changes 'Follower.wait_for_file' can notice
+GROWN = 'GROWN'
+TRUNCATED = 'TRUNCATED'
+REPLACED = 'REPLACED'
+
+
+class Follower(object):
+    '''
+        Lets an input that reached its end wait for more input, like 'tail -f',
+        while the user follows the input (see FollowPlugin, which sets 'following').
+
+        The inputs that can wait (file descriptors, and the MappedFile used by 'paginate_file')
+        return an empty chunk every 'poll_interval' seconds in which no input arrived,
+        so the page can check whether the user pressed a key.
+
+        Pipes, sockets and terminals are watched using 'select',
+        regular files by checking their size once per 'poll_interval',
+        so an idle follower does not keep the CPU busy.
+        Note that on Windows 'select' only works for sockets, so pipes can not be followed there.
+    '''
+
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.following = False
+
+    def wait_for_stream(self, file_descriptor):
+        '''
+            Waits at most 'poll_interval' seconds until the pipe (or socket, ...) can be read without blocking.
+            Returns True if it can.
+        '''
+        readable, _, _ = select.select([file_descriptor], [], [], self.poll_interval)
+        return bool(readable)
+
+    def wait_for_file(self, file_descriptor, position, path=None):
+        '''
+            Waits at most 'poll_interval' seconds until the regular file is bigger than 'position'.
+
+            Returns GROWN if it is, TRUNCATED if it became smaller than 'position',
+            REPLACED if 'path' now refers to another file (e.g. after log rotation),
+            or None if nothing changed.
+            A file that grew is always reported as GROWN (even if it is replaced too),
+            so its final lines are read before moving to the new file.
+        '''
+        change = _check_file(file_descriptor, position, path)
+        if change is None:
+            time.sleep(self.poll_interval)
+            change = _check_file(file_descriptor, position, path)
+        return change
+
+    def wait(self):
+        ''' Waits 'poll_interval' seconds, for inputs that will never have more input (like a closed pipe) '''
+        time.sleep(self.poll_interval)
+
+
+def is_regular_file(file_descriptor):
+    return stat.S_ISREG(os.fstat(file_descriptor).st_mode)
+
+
+def _check_file(file_descriptor, position, path):
+    size = os.fstat(file_descriptor).st_size
+    if size > position:
+        return GROWN
+    if size < position:
+        return TRUNCATED
+    if path is not None and _is_replaced(file_descriptor, path):
+        return REPLACED
+    return None
+
+
+def _is_replaced(file_descriptor, path):
+    try:
+        current_file = os.stat(path)
+    except OSError:
+        # The file is moved away, and the new file is not created yet
+        return False
+    opened_file = os.fstat(file_descriptor)
+    return (current_file.st_dev, current_file.st_ino) != (opened_file.st_dev, opened_file.st_ino)
@@ -0,0 +1,116 @@
+from .more_plugin import MorePlugin
+from .repeatable_mixin import RepeatableMixin
+from .wrapped_page import WrappedPage
+
+_CAN_NOT_JUMP_MESSAGE = '--Can not jump to another line of this input--'
+_NOT_A_LINE_NUMBER_MESSAGE = '--Not a line number: {}--'
+
+
+class GotoPlugin(MorePlugin):
+    '''
+        Jumps to another line of the input, and displays a page from there:
+            - 'g' jumps to line k (1 by default), like 'less'.
+            - ':' prompts for the line number (unless it is given as k).
+            - '%' jumps to the line at k percent of the input (0 by default).
+
+        Only inputs that can jump (like the MappedFile used by 'paginate_file') support this.
+        They find the line using a sparse index of their lines (see LineIndex),
+        so a jump does not read the lines in between.
+    '''
+
+    def get_keys(self):
+        return ['g', ':', '%']
+
+    def get_help(self):
+        yield ('g or :<line number>', 'Go to line k [1]')
+        yield ('%', 'Go to k percent of the input [0]')
+
+    def build_page(self, page_builder, key_pressed, arguments):
+        if page_builder.get_line_index() is None:
+            return page_builder.build_next_page(message=_CAN_NOT_JUMP_MESSAGE)
+
+        if key_pressed == 'g':
+            return self._create_jump_page(page_builder, line=arguments.get('count', 1) - 1)
+        elif key_pressed == ':':
+            return self._jump_to_entered_line(page_builder, arguments)
+        elif key_pressed == '%':
+            percentage = min(arguments.get('count', 0), 100)
+            return self._create_jump_page(page_builder, percentage=percentage)
+        else:
+            assert False, 'Unexpected key event'
+
+    def _jump_to_entered_line(self, page_builder, arguments):
+        line_number = arguments.get('count')
+        if line_number is None:
+            text = page_builder.get_input().prompt(':')
+            try:
+                line_number = int(text)
+            except ValueError:
+                return page_builder.build_next_page(message=_NOT_A_LINE_NUMBER_MESSAGE.format(text))
+        return self._create_jump_page(page_builder, line=line_number - 1)
+
+    def _create_jump_page(self, page_builder, line=None, percentage=None):
+        page = page_builder.create_page(page_builder.get_page_height())
+        return JumpPage(page, line=max(0, line) if line is not None else None, percentage=percentage)
+
+
+class JumpPage(WrappedPage, RepeatableMixin):
+    '''
+        Displays the wrapped page from line 'line' of the input (counting from 0),
+        or from the line at 'percentage' percent of the input.
+
+        The input jumps at the end of the batch of lines that is being paginated (see 'get_pending_jump'),
+        so the lines of that batch that are still added to this page are dropped.
+        An input that can not jump simply continues, so the page is displayed from its next batch on.
+    '''
+
+    def __init__(self, wrapped_page, line=None, percentage=None):
+        super().__init__(wrapped_page)
+        self.line = line
+        self.percentage = percentage
+        self._is_dropping_lines = True
+        self._is_jump_pending = True
+
+    def is_full(self):
+        return not self._is_dropping_lines and self.wrapped_page.is_full()
+
+    def add_line(self, line):
+        if self._is_dropping_lines:
+            return
+        self._is_jump_pending = False
+        self.wrapped_page.add_line(line)
+
+    def add_lines(self, lines, start):
+        if self._is_dropping_lines:
+            return len(lines)
+        self._is_jump_pending = False
+        return self.wrapped_page.add_lines(lines, start)
+
+    def skip_lines(self, lines, start):
+        if self._is_dropping_lines:
+            return len(lines)
+        return self.wrapped_page.skip_lines(lines, start)
+
+    def end_batch(self):
+        self._is_dropping_lines = False
+        return self.wrapped_page.end_batch()
+
+    def get_pending_jump(self):
+        if self._is_jump_pending:
+            return (self.line, self.percentage)
+        return self.wrapped_page.get_pending_jump()
+
+    def end_jump(self, line):
+        if self._is_jump_pending:
+            self._is_jump_pending = False
+        else:
+            self.wrapped_page.end_jump(line)
+
+    def on_add_line(self, line):
+        return line
+
+    def on_skip_lines(self, lines, start, end):
+        pass
+
+    def repeat(self):
+        return JumpPage(self.wrapped_page.repeat(), self.line, self.percentage)
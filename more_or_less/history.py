@@ -0,0 +1,178 @@
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+import collections
+import sys
+import tempfile
+
+
+# Default maximum number of bytes of history that are kept in memory
+HISTORY_MEMORY_BUDGET = 16 * 1024 * 1024
+
+# The recorded text is kept in blocks of at least this many characters
+_BLOCK_SIZE = 64 * 1024
+
+
+class History(object):
+    '''
+        Keeps all text that was written to the output, so it can be displayed again (see BackPlugin).
+
+        The text is kept in blocks of about 64 KB.
+        The most recent blocks are kept in memory (as the list of texts that were written),
+        up to 'memory_budget' bytes, and older blocks are written to a temporary file
+        (which is only created when it is needed).
+        Recording the output only counts its lines, the text is not copied until it is written to the file.
+
+        Two arrays index the blocks: the number of lines before every block,
+        and the offset of every block in the temporary file.
+        So getting the lines of a page takes a binary search over the blocks,
+        and reading (and splitting) at most a few blocks, however long the history is.
+        The index takes up 16 bytes per block, or about 256 KB per GB of history.
+
+        A line is the text up to (and including) a '\n'.
+    '''
+
+    def __init__(self, memory_budget=HISTORY_MEMORY_BUDGET):
+        self.memory_budget = memory_budget
+        # The number of lines before the start of every block, including the open block at the end
+        self._lines_before_block = array('Q', [0])
+        # The offset of every block in the spill file, and the offset of the end of the file
+        self._file_offsets = array('Q', [0])
+        self._file = None
+        # The last block that was read from the file (paging back reads the same block for several pages)
+        self._file_block = (None, None)
+        # The blocks that are kept in memory (as lists of texts), which follow the blocks that are in the file
+        self._blocks = collections.deque()
+        self._memory_size = 0
+        # The block that text is added to
+        self._open_chunks = []
+        self._open_size = 0
+        self._line_count = 0
+        self._is_replaying = False
+
+    @property
+    def line_count(self):
+        ''' Returns the number of complete lines in the history '''
+        return self._line_count
+
+    def record(self, text):
+        ''' Adds the text at the end of the history (unless it is being replayed) '''
+        if self._is_replaying or not text:
+            return
+        self._open_chunks.append(text)
+        self._open_size = self._open_size + len(text)
+        self._line_count = self._line_count + text.count('\n')
+        if self._open_size >= _BLOCK_SIZE:
+            self._close_block()
+
+    def get_lines(self, start, end):
+        ''' Returns the text of the lines 'start' up to 'end' '''
+        start = max(0, start)
+        end = min(end, self._line_count)
+        if start >= end:
+            return ''
+
+        first_block, first_position = self._find_line(start)
+        last_block, last_position = self._find_line(end)
+        if first_block == last_block:
+            return self._get_block(first_block)[first_position:last_position]
+
+        pieces = [self._get_block(first_block)[first_position:]]
+        pieces.extend(self._get_block(block) for block in range(first_block + 1, last_block))
+        pieces.append(self._get_block(last_block)[:last_position])
+        return ''.join(pieces)
+
+    def replay(self, start, end, output):
+        ''' Writes the lines 'start' up to 'end' to the output, without recording them again '''
+        with self.pause_recording():
+            output.write(self.get_lines(start, end))
+            output.flush()
+
+    @contextmanager
+    def pause_recording(self):
+        ''' Does not record the text that is written meanwhile (like a page that is displayed again) '''
+        self._is_replaying = True
+        try:
+            yield
+        finally:
+            self._is_replaying = False
+
+    def close(self):
+        ''' Removes the temporary file, if any '''
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_block = (None, None)
+
+    def _find_line(self, line):
+        ''' Returns the block, and the position in that block, where 'line' starts '''
+        # The block that contains the '\n' which ends the line before
+        block = bisect_left(self._lines_before_block, line) - 1
+        if block < 0:
+            return 0, 0
+        text = self._get_block(block)
+        line_breaks = line - self._lines_before_block[block]
+        after_last_line_break = text.split('\n', line_breaks)[-1]
+        return block, len(text) - len(after_last_line_break)
+
+    def _get_block(self, block):
+        spilled_block_count = len(self._file_offsets) - 1
+        if block < spilled_block_count:
+            return self._read_block(block)
+        block = block - spilled_block_count
+        if block < len(self._blocks):
+            return ''.join(self._blocks[block])
+        return ''.join(self._open_chunks)
+
+    def _read_block(self, block):
+        cached_block, text = self._file_block
+        if cached_block != block:
+            self._file.seek(self._file_offsets[block])
+            data = self._file.read(self._file_offsets[block + 1] - self._file_offsets[block])
+            text = data.decode('utf-8', 'surrogatepass')
+            self._file_block = (block, text)
+        return text
+
+    def _close_block(self):
+        chunks = self._open_chunks
+        self._open_chunks = []
+        self._open_size = 0
+        self._lines_before_block.append(self._line_count)
+        self._blocks.append(chunks)
+        self._memory_size = self._memory_size + _memory_size(chunks)
+        while self._memory_size > self.memory_budget and self._blocks:
+            self._spill_oldest_block()
+
+    def _spill_oldest_block(self):
+        chunks = self._blocks.popleft()
+        self._memory_size = self._memory_size - _memory_size(chunks)
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        data = ''.join(chunks).encode('utf-8', 'surrogatepass')
+        self._file.seek(self._file_offsets[-1])
+        self._file.write(data)
+        self._file_offsets.append(self._file_offsets[-1] + len(data))
+
+
+def _memory_size(chunks):
+    return sum(map(sys.getsizeof, chunks))
+
+
+class RecordingOutput(object):
+    '''
+        Forwards to the output, recording everything that is written in the History
+    '''
+
+    def __init__(self, output, history):
+        self._output = output
+        self._history = history
+
+    def write(self, text):
+        self._output.write(text)
+        self._history.record(text)
+
+    def flush(self):
+        return self._output.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._output, name)
@@ -14,3 +14,21 @@ class Input(ABC):
     @abstractmethod
     def get_character(self, message):
         pass
+
+    def poll_character(self, message):
+        '''
+            Optional: used to report progress (and allow the user to cancel) during long operations.
+            Displays the message (which stays visible until the next call, an empty message removes it)
+            and returns the character the user typed, or None if no character was typed.
+            Must not wait for the user.
+            The default implementation never returns a character.
+        '''
+        return None
+
+    def clear_message(self):
+        '''
+            Optional: removes the message displayed by 'poll_character', without reading a character
+            (so a character the user typed in the meantime is returned by the next prompt).
+            The default implementation does nothing.
+        '''
+        pass
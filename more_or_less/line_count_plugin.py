@@ -1,3 +1,4 @@
+from .line_segments import count_continuations, has_segments, is_continuation
 from .more_plugin import MorePlugin
 from .wrapped_page import WrappedPage
 
@@ -31,6 +32,9 @@ class LineCountPlugin(MorePlugin):
     def wrap_page(self, page):
         return _LineCounter(self, page)
 
+    def transforms_lines(self):
+        return self.line_numbers_enabled
+
     def _format_enabled(self):
         return {
             True: 'enabled',
@@ -39,18 +43,53 @@ class LineCountPlugin(MorePlugin):
 
 
 class _LineCounter(WrappedPage):
+    '''
+        Counts (and numbers) the lines.
+        When the input jumps to another line (see GotoPlugin), the count continues from that line.
+        The continuations of a line that was split in segments are part of that line,
+        so they are not counted and get no line number.
+    '''
 
     def __init__(self, line_count_plugin, wrapped_page):
         super().__init__(wrapped_page)
         self._plugin = line_count_plugin
 
+    def add_line(self, line):
+        if self.must_add_line_number() and self.skip_lines([line], 0):
+            # The wrapped page does not display the line (like a SearchPage before its match),
+            # so it sees the line without its number, like the lines it skips in blocks
+            return
+        return super().add_line(line)
+
     def on_add_line(self, line):
+        if is_continuation(line):
+            return line
         self._bump_line_count()
         if self.must_add_line_number():
             return self.add_line_number(line)
         else:
             return line
 
+    def add_lines(self, lines, start):
+        if self.must_add_line_number():
+            return super().add_lines(lines, start)
+        # The lines are not changed, so the whole block can be forwarded
+        end = self.wrapped_page.add_lines(lines, start)
+        self._count_lines(lines, start, end)
+        return end
+
+    def on_skip_lines(self, lines, start, end):
+        self._count_lines(lines, start, end)
+
+    def on_jump(self, line):
+        self._plugin.line_count = line
+
+    def _count_lines(self, lines, start, end):
+        line_count = end - start
+        if has_segments(lines):
+            line_count = line_count - count_continuations(lines, start, end)
+        self._plugin.line_count = self._plugin.line_count + line_count
+
     def _bump_line_count(self):
         self._plugin.line_count = self._plugin.line_count + 1
 
@@ -0,0 +1,154 @@
+from array import array
+from bisect import bisect_right
+import re
+import threading
+
+
+# The index keeps the offset of every CHECKPOINT_INTERVAL-th line
+CHECKPOINT_INTERVAL = 1024
+
+
+class LineIndex(object):
+    '''
+        A sparse index of the lines of a file, which lets the user jump to any line (see GotoPlugin).
+
+        The index keeps the offset of every 'interval'-th line (a checkpoint).
+        So finding line N takes a lookup of checkpoint N // interval and a scan over less than 'interval' lines,
+        and finding the line at an offset takes a binary search over the checkpoints
+        and a scan back to the start of that line (and over the lines since the checkpoint, to number it).
+        The index takes up 8 bytes per checkpoint, or about 8 KB per million lines.
+
+        The checkpoints are found using a regular expression that matches 'interval' lines,
+        so the lines are scanned in C, straight from the memory map.
+        Once 'start' is called they are found by a background thread,
+        and the lines that are needed before it gets there are indexed on demand.
+
+        The data is set (and replaced, e.g. when a followed file grows) by the MappedFile that owns it,
+        which stops the background thread before the old data goes away.
+        A line is the text up to (and including) a b'\\n'.
+    '''
+
+    def __init__(self, interval=CHECKPOINT_INTERVAL):
+        self.interval = interval
+        self._pattern = re.compile(b'(?:[^\\n]*\\n){%d}' % interval)
+        # Entry 'i' is the offset of line 'i * interval'
+        self._checkpoints = array('Q', [0])
+        self._data = None
+        self._size = 0
+        # True if fewer than 'interval' lines follow the last checkpoint
+        self._is_complete = True
+        self._lock = threading.Lock()
+        self._thread = None
+        self._is_started = False
+        self._is_stopping = False
+
+    @property
+    def checkpoint_count(self):
+        return len(self._checkpoints)
+
+    def set_data(self, data, keep_checkpoints=False):
+        '''
+            Indexes 'data' (a memory map or bytes, or None for no data), instead of the data indexed before.
+            If 'keep_checkpoints' is True, the new data starts with the old data (like a file that grew),
+            so only the lines after the last checkpoint are indexed again.
+        '''
+        self._stop_thread()
+        with self._lock:
+            self._data = data
+            self._size = len(data) if data is not None else 0
+            self._is_complete = data is None
+            if not keep_checkpoints:
+                self._checkpoints = array('Q', [0])
+        if self._is_started:
+            self._start_thread()
+
+    def start(self):
+        ''' Starts indexing the data in a background thread (and the data that is set later on) '''
+        self._is_started = True
+        self._start_thread()
+
+    def join(self, timeout=None):
+        ''' Waits until the background thread has indexed all data '''
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def find_line(self, line):
+        '''
+            Returns the number and the offset of line 'line' (counting from 0),
+            or of the last line if the data has fewer lines.
+        '''
+        with self._lock:
+            if not self._size:
+                return 0, 0
+            checkpoint = max(0, line) // self.interval
+            while len(self._checkpoints) <= checkpoint and self._index_next_checkpoint():
+                pass
+            checkpoint = min(checkpoint, len(self._checkpoints) - 1)
+            first_line = checkpoint * self.interval
+            skipped_line_count, offset = self._skip_lines(self._checkpoints[checkpoint], line - first_line)
+            return first_line + skipped_line_count, offset
+
+    def find_offset(self, offset):
+        ''' Returns the number and the offset of the line that contains the byte at 'offset' '''
+        with self._lock:
+            if not self._size:
+                return 0, 0
+            offset = max(0, min(offset, self._size - 1))
+            while self._checkpoints[-1] <= offset and self._index_next_checkpoint():
+                pass
+            checkpoint = bisect_right(self._checkpoints, offset) - 1
+            start = self._checkpoints[checkpoint]
+            if start == offset:
+                return checkpoint * self.interval, start
+            line_start = max(start, self._data.rfind(b'\n', start, offset) + 1)
+            skipped_line_count, _ = self._skip_lines(start, self.interval, line_start)
+            return checkpoint * self.interval + skipped_line_count, line_start
+
+    def _index_next_checkpoint(self):
+        ''' Adds the next checkpoint. Returns False if there is none '''
+        if self._is_complete:
+            return False
+        match = self._pattern.match(self._data, self._checkpoints[-1])
+        if match is None or match.end() >= self._size:
+            # A checkpoint at the very end would be a line without text
+            self._is_complete = True
+            return False
+        self._checkpoints.append(match.end())
+        return True
+
+    def _skip_lines(self, offset, count, end=None):
+        '''
+            Moves over at most 'count' lines from the line at 'offset', stopping at the last line of the data
+            (or at 'end'). Returns the number of lines moved over and the offset of the line it stopped at.
+        '''
+        data = self._data
+        end = self._size if end is None else end
+        skipped_line_count = 0
+        while skipped_line_count < count:
+            line_break = data.find(b'\n', offset, end)
+            if line_break == -1 or line_break + 1 >= self._size:
+                break
+            offset = line_break + 1
+            skipped_line_count = skipped_line_count + 1
+        return skipped_line_count, offset
+
+    def _start_thread(self):
+        if self._thread is not None or self._is_complete:
+            return
+        self._is_stopping = False
+        self._thread = threading.Thread(target=self._index_in_background, daemon=True)
+        self._thread.start()
+
+    def _stop_thread(self):
+        if self._thread is not None:
+            self._is_stopping = True
+            self._thread.join()
+            self._thread = None
+
+    def _index_in_background(self):
+        # The lock is released after every checkpoint, so a jump does not wait for the whole index
+        while not self._is_stopping:
+            with self._lock:
+                if not self._index_next_checkpoint():
+                    return
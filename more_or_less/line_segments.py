@@ -0,0 +1,59 @@
+from itertools import islice
+
+
+def split_lines(text):
+    '''
+        Splits 'text' in lines that end in '\\n', keeping the '\\n' (the last line may have no line break).
+
+        Unlike 'str.splitlines', no other character (like '\\r' or '\\x0c') ends a line,
+        so the lines are the same whether they are counted in the text or in the bytes of a file
+        (see MappedFile and LineIndex).
+    '''
+    lines = text.splitlines(True)
+    if len(lines) == text.count('\n') + (not text.endswith('\n') and bool(text)):
+        # The usual case: the text has no other line breaks
+        return lines
+
+    lines = text.split('\n')
+    last_line = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if last_line:
+        lines.append(last_line)
+    return lines
+
+
+class Continuation(str):
+    '''
+        A segment of a line that was too long to keep in memory as a whole (see _LineCollector in paginator.py),
+        which continues the line before it.
+
+        The segment before it ends in a line break that was not in the input, so a continuation starts on a new row
+        (like a line that wraps), but plugins that look at whole lines (like the line numbers)
+        treat it as part of the same line.
+    '''
+    __slots__ = ()
+
+
+class SegmentedLines(list):
+    '''
+        A list of lines that contains 'segment_count' segments of lines that were too long to keep in memory.
+        Lists of lines without segments are plain lists, so pages only need to look at the single lines
+        if 'has_segments' returns True.
+    '''
+
+    def __init__(self, lines, segment_count):
+        super().__init__(lines)
+        self.segment_count = segment_count
+
+
+def has_segments(lines):
+    return getattr(lines, 'segment_count', 0) > 0
+
+
+def is_continuation(line):
+    return isinstance(line, Continuation)
+
+
+def count_continuations(lines, start, end):
+    ''' Returns the number of continuations in 'lines[start:end]' '''
+    return sum(map(is_continuation, islice(lines, start, end)))
@@ -0,0 +1,149 @@
+from .line_segments import split_lines
+from .pagination_context import BUFFER_SIZE, _byte_size
+from itertools import islice
+import collections
+import threading
+
+
+class LookAhead(object):
+    '''
+        Reads the input in a background thread, so the next text is already available
+        when the user leaves the '--More--' prompt.
+
+        Use 'start(iterable)' to start reading; it returns the iterable the paginator should read from.
+        That iterable returns exactly the same text in the same order (so live streams are still
+        read only once), but all the text that was read ahead is returned at once.
+
+        At most 'max_bytes' of text is read ahead (plus the text of the read that crosses the limit).
+        Once 'look_for' is called with the last search, reading ahead also stops
+        as soon as the buffered text contains 'match_count' matching lines,
+        so repeating the search (with 'n') can be answered from memory without reading more than needed.
+
+        Call 'stop()' when the pagination is done (e.g. when the user pressed 'q').
+        This throws away the text that was read ahead, and the reader thread ends without reading more.
+        Note a thread that waits for input that never comes can not be interrupted,
+        so the reader thread is a daemon thread. Use 'join(timeout)' to wait until it ended.
+    '''
+
+    def __init__(self, max_bytes=BUFFER_SIZE):
+        self._max_bytes = max_bytes
+        self._condition = threading.Condition()
+        # Every item is a (text, match_count) pair
+        self._chunks = collections.deque()
+        self._search = None
+        self._wanted_match_count = 0
+        self._end_of_input = False
+        self._stopped = False
+        self._error = None
+        self._thread = None
+
+        self.buffered_bytes = 0
+        self.buffered_match_count = 0
+
+    def start(self, iterable):
+        self._thread = threading.Thread(target=self._read, args=(iter(iterable),), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._chunks.clear()
+            self.buffered_bytes = 0
+            self.buffered_match_count = 0
+            self._condition.notify_all()
+
+    def join(self, timeout=None):
+        '''
+            Waits until the reader thread ended, which happens after 'stop()' or at the end of the input.
+            Returns False if the thread is still running after 'timeout' seconds.
+        '''
+        if self._thread is not None:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
+
+    def look_for(self, compiled_search, match_count=1):
+        '''
+            Keeps reading ahead until 'match_count' lines of the text that is read ahead
+            match the CompiledSearch (see search_engine.py).
+        '''
+        with self._condition:
+            self._search = compiled_search
+            self._wanted_match_count = match_count
+            self._chunks = collections.deque(
+                (text, _count_matching_lines(compiled_search, text, match_count)) for text, _ in self._chunks
+            )
+            self.buffered_match_count = sum(match_count for _, match_count in self._chunks)
+            self._condition.notify_all()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._condition:
+            while not (self._chunks or self._end_of_input or self._stopped):
+                self._condition.wait()
+
+            if self._chunks:
+                text = ''.join(text for text, _ in self._chunks)
+                self._chunks.clear()
+                self.buffered_bytes = 0
+                self.buffered_match_count = 0
+                self._condition.notify_all()
+                return text
+
+            if self._error is not None:
+                raise self._error
+            raise StopIteration
+
+    def _read(self, iterator):
+        while self._wait_until_more_is_wanted():
+            try:
+                text = next(iterator)
+            except StopIteration:
+                self._end(None)
+                return
+            except Exception as error:
+                self._end(error)
+                return
+
+            search, wanted_match_count = self._search, self._wanted_match_count
+            match_count = _count_matching_lines(search, text, wanted_match_count)
+            with self._condition:
+                if self._stopped:
+                    # The text is not needed anymore, so it must not stay in memory
+                    return
+                if search is not self._search:
+                    # 'look_for' was called while we were counting
+                    match_count = _count_matching_lines(self._search, text, self._wanted_match_count)
+                self._chunks.append((text, match_count))
+                self.buffered_bytes = self.buffered_bytes + _byte_size(text)
+                self.buffered_match_count = self.buffered_match_count + match_count
+                self._condition.notify_all()
+
+    def _wait_until_more_is_wanted(self):
+        ''' Returns False if we must stop reading '''
+        with self._condition:
+            while not (self._stopped or self._wants_more()):
+                self._condition.wait()
+            return not self._stopped
+
+    def _wants_more(self):
+        if self.buffered_bytes >= self._max_bytes:
+            return False
+        if self._search is None or not self._chunks:
+            return True
+        return self.buffered_match_count < self._wanted_match_count
+
+    def _end(self, error):
+        with self._condition:
+            self._end_of_input = True
+            self._error = error
+            self._condition.notify_all()
+
+
+def _count_matching_lines(compiled_search, text, maximum):
+    if compiled_search is None:
+        return 0
+    return sum(1 for _ in islice(compiled_search.find_matching_lines(split_lines(text)), maximum))
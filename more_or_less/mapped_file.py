@@ -0,0 +1,287 @@
+from . import parallel_search
+from .follower import GROWN, REPLACED
+from .line_segments import split_lines
+from .parallel_search import ParallelSearch
+from array import array
+from collections.abc import Sequence
+from itertools import accumulate, repeat
+from operator import add
+import codecs
+import mmap
+
+
+# Number of bytes we decode at once when iterating over the file
+BLOCK_SIZE = 1024 * 1024
+# Number of skipped lines we decode at once when iterating over them
+_SKIPPED_LINES_PER_BLOCK = 4096
+
+
+class MappedFile(object):
+    '''
+        Memory-maps a file, and iterates over its content in blocks of complete lines.
+
+        While iterating, the start offset of every line is recorded in a compact line-offset index
+        (an array of unsigned 64 bit integers), so any line that has been read can later be
+        sliced straight out of the mapping again using 'get_line'.
+
+        The file must use an ASCII compatible encoding (like utf-8 or latin-1),
+        as lines are split on the byte b'\\n'.
+        A line that is longer than a block is returned in blocks too (the paginator joins them again,
+        or splits the line in segments, see the 'max_line_size' argument of 'paginate').
+        Only the lines that end are indexed.
+
+        Files that can not be memory-mapped (like pipes, or the files in /proc that claim to be empty)
+        must be read instead. 'paginate_file' does so.
+
+        A search for the k-th match of a search pattern can skip ahead in the file (see 'skip_to_match'),
+        using 'search_processes' processes (by default one per core) that each search a part of the file.
+        Pass 'search_processes=1' to always search in the paginator itself.
+
+        If a Follower is given, the end of the file is not the end of the iteration while it is following:
+        instead we wait until the file grows (and map it again), returning '' every time it did not (see Follower).
+        When the file is truncated or replaced (e.g. by log rotation), it is read again from its start,
+        and the lines indexed so far are forgotten.
+
+        If a LineIndex is given, it indexes the file too, and 'jump_to' can move to any line of the file
+        (see GotoPlugin). After a jump the line-offset index starts at the line we jumped to.
+    '''
+
+    def __init__(
+            self, path, encoding='utf-8', errors='replace', block_size=BLOCK_SIZE, search_processes=None,
+            follower=None, line_index=None):
+        self._path = path
+        self._follower = follower
+        self.encoding = encoding
+        self.errors = errors
+        self._block_size = block_size
+        self._file = open(path, 'rb')
+        self._map = _map_file(self._file)
+        self._size = len(self._map) if self._map is not None else 0
+        # Decodes incrementally, as a block that ends inside a long line can end inside a character too
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors)
+        # Entry 'i' is the start offset of line '_first_line + i'.
+        # The final entry is the end of the last indexed line.
+        self._offsets = array('Q', [0])
+        # The offset of the first byte that has not been returned yet (which is inside a line after a long line)
+        self._position = 0
+        self._first_line = 0
+        self._line_index = line_index
+        if line_index is not None:
+            line_index.set_data(self._map)
+        self._parallel_search = None
+        if search_processes != 1:
+            self._parallel_search = ParallelSearch(path, encoding, errors, search_processes)
+
+    def __len__(self):
+        ''' Returns the size of the file in bytes '''
+        return self._size
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = self.get_position()
+        if start >= self._size:
+            if self._follower is not None and self._follower.following:
+                return self._wait_for_more_content()
+            self.close()
+            raise StopIteration
+
+        end = self._find_end_of_block(start)
+        data = self._map[start:end]
+        self._index_lines(start, data)
+        return self._decoder.decode(data, final=end == self._size)
+
+    @property
+    def line_count(self):
+        ''' Returns the number of lines indexed so far '''
+        return self._first_line + len(self._offsets) - 1
+
+    def get_position(self):
+        ''' Returns the offset of the first byte that has not been returned yet '''
+        return self._position
+
+    def get_line_offset(self, index):
+        return self._offsets[index - self._first_line]
+
+    def get_line(self, index):
+        ''' Returns line 'index' (which must already be indexed), including its line terminator '''
+        if not self._first_line <= index < self.line_count:
+            raise IndexError('line {} is not indexed'.format(index))
+        index = index - self._first_line
+        data = self._map[self._offsets[index]:self._offsets[index + 1]]
+        return data.decode(self.encoding, self.errors)
+
+    def get_lines(self, start, end):
+        ''' Returns the lines 'start' up to 'end' (which must already be indexed), decoding them at once '''
+        if not self._first_line <= start <= end <= self.line_count:
+            raise IndexError('lines {} to {} are not indexed'.format(start, end))
+        data = self._map[self._offsets[start - self._first_line]:self._offsets[end - self._first_line]]
+        # The decoded text has exactly as many '\n' as the data
+        return split_lines(data.decode(self.encoding, self.errors))
+
+    def jump_to(self, line=None, percentage=None):
+        '''
+            Moves to line 'line' (counting from 0), or to the line at 'percentage' percent of the file,
+            so the next block starts with that line.
+            A line beyond the end of the file moves to the last line.
+            The lines are found using the LineIndex, and the lines indexed so far are forgotten.
+
+            Returns the number of the line we moved to.
+        '''
+        if line is not None:
+            line, offset = self._line_index.find_line(line)
+        else:
+            line, offset = self._line_index.find_offset(self._size * percentage // 100)
+        self._first_line = line
+        self._offsets = array('Q', [offset])
+        self._position = offset
+        self._decoder.reset()
+        return line
+
+    def skip_to_match(self, compiled_search, match_count):
+        '''
+            Skips ahead to the line that contains the 'match_count'th line matching the CompiledSearch
+            (see search_engine.py), or to the end of the file if there are fewer matches,
+            so the next block starts with that line.
+            The rest of the file is searched in parallel (see ParallelSearch).
+
+            Returns the SkippedLines, or None if nothing is skipped
+            because the rest of the file is too small to make a parallel search worth it.
+        '''
+        start = self.get_position()
+        if self._parallel_search is None or self._size - start < parallel_search.MINIMUM_SIZE:
+            return None
+        if start != self._offsets[-1]:
+            # The search starts at the start of a line
+            return None
+
+        offset, skipped_match_count = self._parallel_search.find_match(self._map, start, compiled_search, match_count)
+        first_line = self.line_count
+        self._index_until(offset)
+        return SkippedLines(self, first_line, self.line_count, skipped_match_count)
+
+    def close(self):
+        if self._line_index is not None:
+            # Stops indexing the map before it is closed
+            self._line_index.set_data(None)
+        if self._parallel_search is not None:
+            self._parallel_search.close()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _wait_for_more_content(self):
+        ''' Called at the end of the file while following it. Returns '' (as no text is read) '''
+        change = self._follower.wait_for_file(self._file.fileno(), self._size, self._path)
+        if change is None:
+            return ''
+
+        if change == REPLACED:
+            self._file.close()
+            self._file = open(self._path, 'rb')
+        old_map = self._map
+        self._map = _map_file(self._file)
+        self._size = len(self._map) if self._map is not None else 0
+        if self._line_index is not None:
+            self._line_index.set_data(self._map, keep_checkpoints=change == GROWN)
+        if old_map is not None:
+            old_map.close()
+        if change != GROWN:
+            self._offsets = array('Q', [0])
+            self._first_line = 0
+            self._position = 0
+            self._decoder.reset()
+        return ''
+
+    def _find_end_of_block(self, start):
+        '''
+            Returns the end of the block starting at 'start': the end of its last line,
+            or the end of the block if it is inside a line that is longer than a block
+            (so a huge file without line breaks is never decoded at once).
+        '''
+        end = min(start + self._block_size, self._size)
+        if end == self._size:
+            return end
+
+        last_newline = self._map.rfind(b'\n', start, end)
+        return last_newline + 1 if last_newline != -1 else end
+
+    def _index_until(self, offset):
+        ''' Indexes the lines up to 'offset' (which must be the start of a line) without returning them '''
+        start = self.get_position()
+        while start < offset:
+            end = min(self._find_end_of_block(start), offset)
+            self._index_lines(start, self._map[start:end])
+            start = end
+
+    def _index_lines(self, start, data):
+        ''' Indexes the lines that end in 'data' (which can start inside a line that is longer than a block) '''
+        # Keep the per-line work inside C (split/map/accumulate) so indexing stays cheap
+        lines = data.split(b'\n')
+        if not lines[-1]:
+            lines.pop()
+        line_ends = accumulate(map(add, map(len, lines), repeat(1)), initial=start)
+        next(line_ends)
+        self._offsets.extend(line_ends)
+        end = start + len(data)
+        self._position = end
+
+        if lines and not data.endswith(b'\n'):
+            if end == self._size:
+                # The final line has no line terminator, so it ends at the end of the file
+                self._offsets[-1] = end
+            else:
+                # The rest of this line is in the next block
+                self._offsets.pop()
+
+
+class SkippedLines(Sequence):
+    '''
+        The lines of a MappedFile that were skipped by 'skip_to_match'.
+
+        The lines are only read from the file when they are accessed,
+        so pages that only count the lines never read them.
+        A slice (or an iteration) reads its lines in a single block, rather than line per line.
+        'skipped_match_count' is the number of these lines that match the search.
+    '''
+
+    def __init__(self, mapped_file, start, end, skipped_match_count):
+        self._mapped_file = mapped_file
+        self._start = start
+        self._end = end
+        self.skipped_match_count = skipped_match_count
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, end, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, end, step)]
+            return self._mapped_file.get_lines(self._start + start, self._start + max(start, end))
+        if index < 0:
+            index = index + len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('line {} is not skipped'.format(index))
+        return self._mapped_file.get_line(self._start + index)
+
+    def __iter__(self):
+        for start in range(0, len(self), _SKIPPED_LINES_PER_BLOCK):
+            yield from self[start:start + _SKIPPED_LINES_PER_BLOCK]
+
+
+def _map_file(file):
+    try:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files can not be mapped
+        return None
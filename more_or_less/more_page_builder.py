@@ -2,14 +2,19 @@ import sys
 
 from . import more_plugins
 from .buffered_input import BufferedInput
+from .chopped_page import ChoppedPage
+from .fixed_size_screen import _HUGE
+from .history import RecordingOutput
 from .page_builder import PageBuilder, StopOutput
 from .page_of_height import PageOfHeight
+from .page_of_rows import PageOfRows
 from .page_wrapper import PageWrapper
+from .pagination_statistics import TimedOutput
 from .terminal_input import TerminalInput
 from .terminal_screen import TerminalScreen
 
 
-def MorePageBuilder(*args, **kwargs):
+def MorePageBuilder(*args, statistics=None, **kwargs):
     '''
         A PageBuilder that is intended to work closely the way 'more' works.
         It supports the basic 'more' actions (one-more-page, n-more-lines, find-text).
@@ -27,22 +32,60 @@ def MorePageBuilder(*args, **kwargs):
             If not specified we use the dimensions of the terminal window
         plugins: [type list of MorePlugin]
             The plugins to load. If not specified will fetch all plugins from more_plugins.py
+        statistics: [type PaginationStatistics]
+            If specified we record the time spent in the plugins and in writing the output
+        look_ahead: [type LookAhead]
+            If specified, the plugins can tell it what to look for in the input that is read ahead
+            (e.g. the SearchPlugin makes it look for the next match of the last search)
+        follower: [type Follower]
+            If specified, the FollowPlugin uses it to make the input wait for more input at its end
+        history: [type History]
+            If specified, everything that is written to the output is recorded in it,
+            so the BackPlugin can display the previous pages again
+        line_index: [type LineIndex]
+            If specified, the GotoPlugin lets the user jump to another line of the input
+            (which must be an input that can jump, like a MappedFile)
     '''
-    return PageWrapper(_MorePageBuilder(*args, **kwargs))
+    return PageWrapper(_MorePageBuilder(*args, statistics=statistics, **kwargs), statistics)
 
 
 class _MorePageBuilder(PageBuilder):
 
-    def __init__(self, input=None, output=None, screen_dimensions=None, plugins=None):
+    def __init__(
+            self, input=None, output=None, screen_dimensions=None, plugins=None, statistics=None, look_ahead=None,
+            follower=None, history=None, line_index=None):
         self._screen_dimensions = screen_dimensions or TerminalScreen()
+        self._look_ahead = look_ahead
+        self._follower = follower
+        self._column_window = None
+        self._history = history
+        self._line_index = line_index
         self._output = output or sys.stdout
+        if history is not None:
+            self._output = RecordingOutput(self._output, history)
+        if statistics is not None:
+            self._output = TimedOutput(self._output, statistics)
         self._input = BufferedInput(input or TerminalInput())
 
         self._plugins = plugins or more_plugins.get()
         self._action_handlers = _build_plugins_dictionary(self._plugins)
 
     def build_first_page(self):
-        return PageOfHeight(height=self.get_page_height(), output=self._output)
+        return self.create_page(self.get_page_height())
+
+    def create_page(self, height):
+        '''
+            Returns a page that displays 'height' rows of the screen.
+            If the width of the screen is known, lines that wrap over several rows count for several rows
+            (see PageOfRows).
+            If long lines are chopped, only the columns in the column window are displayed (see ChoppedPage).
+        '''
+        if self._column_window is not None:
+            return ChoppedPage(height=height, output=self._output, window=self._column_window)
+        width = self.get_page_width()
+        if width is None:
+            return PageOfHeight(height=height, output=self._output)
+        return PageOfRows(height=height, output=self._output, width=width)
 
     def build_next_page(self, message=None, arguments=None):
         try:
@@ -68,6 +111,13 @@ class _MorePageBuilder(PageBuilder):
         height_reserved_for_more_prompt = 1
         return self._screen_dimensions.get_height() - height_reserved_for_more_prompt
 
+    def get_page_width(self):
+        ''' Returns the width of the screen, or None if lines never wrap (like on a FixedSizeScreen without width) '''
+        width = self._screen_dimensions.get_width()
+        if not width or width >= _HUGE:
+            return None
+        return width
+
     def get_output(self):
         return self._output
 
@@ -75,6 +125,30 @@ class _MorePageBuilder(PageBuilder):
         ''' Returns the BufferedInput object used to get the user input '''
         return self._input
 
+    def get_look_ahead(self):
+        ''' Returns the LookAhead reading the input, or None if the input is not read ahead '''
+        return self._look_ahead
+
+    def get_follower(self):
+        ''' Returns the Follower that lets the input wait for more input, or None if there is none '''
+        return self._follower
+
+    def get_history(self):
+        ''' Returns the History of the output, or None if the output is not recorded '''
+        return self._history
+
+    def get_line_index(self):
+        ''' Returns the LineIndex of the input, or None if the input can not jump to another line '''
+        return self._line_index
+
+    def get_column_window(self):
+        ''' Returns the ColumnWindow of the visible columns if long lines are chopped, or None if they wrap '''
+        return self._column_window
+
+    def set_column_window(self, column_window):
+        ''' Chops long lines to the given ColumnWindow, or lets them wrap again if None '''
+        self._column_window = column_window
+
     def get_prompt_message(self):
         return '--More--'
 
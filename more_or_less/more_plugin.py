@@ -47,6 +47,17 @@ class MorePlugin(ABC):
         '''
         return page
 
+    def transforms_lines(self):
+        '''
+            Returns True if the pages returned by 'wrap_page' currently change the output lines.
+
+            When there is no way to paginate (e.g. the output is not a terminal)
+            and no plugin transforms the lines, the input is copied straight to the output.
+
+            By default we assume plugins that implement 'wrap_page' transform the lines.
+        '''
+        return type(self).wrap_page is not MorePlugin.wrap_page
+
     @abstractmethod
     def get_help(self):
         '''
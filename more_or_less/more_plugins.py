@@ -1,4 +1,9 @@
+from .back_plugin import BackPlugin
+from .chop_plugin import ChopPlugin
 from .count_plugin import CountPlugin
+from .filter_plugin import FilterPlugin
+from .follow_plugin import FollowPlugin
+from .goto_plugin import GotoPlugin
 from .help_plugin import HelpPlugin
 from .line_count_plugin import LineCountPlugin
 from .more_plugin import MorePlugin
@@ -12,9 +17,14 @@ __plugins = [
     CountPlugin,
     OnePagePlugin,
     OneLinePlugin,
+    BackPlugin,
+    GotoPlugin,
     QuitPlugin,
     LineCountPlugin,
     SearchPlugin,
+    FilterPlugin,
+    FollowPlugin,
+    ChopPlugin,
     RepeatPlugin,
     HelpPlugin,
 ]
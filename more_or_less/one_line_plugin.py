@@ -1,5 +1,4 @@
 from .more_plugin import MorePlugin
-from .page_of_height import PageOfHeight
 
 
 class OneLinePlugin(MorePlugin):
@@ -16,7 +15,7 @@ class OneLinePlugin(MorePlugin):
 
     def build_page(self, page_builder, key_pressed, arguments):
         self._update_page_height(arguments)
-        return PageOfHeight(height=self._page_height, output=page_builder.get_output())
+        return page_builder.create_page(self._page_height)
 
     def get_help(self):
         yield ('<return>', 'Display next k lines of text [{}]*'.format(self._page_height))
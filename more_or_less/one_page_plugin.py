@@ -1,5 +1,4 @@
 from .more_plugin import MorePlugin
-from .page_of_height import PageOfHeight
 
 
 class OnePagePlugin(MorePlugin):
@@ -13,7 +12,7 @@ class OnePagePlugin(MorePlugin):
 
     def build_page(self, page_builder, key_pressed, arguments):
         page_height = arguments.get('count', page_builder.get_page_height())
-        return PageOfHeight(height=page_height, output=page_builder.get_output())
+        return page_builder.create_page(page_height)
 
     def get_help(self):
         yield ('<space>', 'Display next k lines of text [current screen size]')
@@ -8,8 +8,15 @@ class Output(ABC):
 
         Note that any 'file' object matches this API,
         so files can natively be used as output.
+
+        Pages collect their lines and write them in one go when the page is complete
+        (or when no more input is available right now).
+        If your output needs to receive every line as soon as it is paginated,
+        set 'line_by_line' to True.
     '''
 
+    line_by_line = False
+
     @abstractmethod
     def write(self, text):
         pass
@@ -25,3 +25,57 @@ class Page(ABC):
     def flush(self):
         # If any cleanup is required when a page is complete, it should be done here.
         pass
+
+    def end_batch(self):
+        # Called when all input that is currently available has been added.
+        # Pages that hold back their output should write it here,
+        # so input that arrives slowly is still displayed as soon as possible.
+        pass
+
+    def skip_lines(self, lines, start):
+        # Called before 'lines[start:]' are added.
+        # Pages that do not display all their lines (like the SearchPage) can drop the leading lines
+        # they are not interested in here, without a call to 'add_line' for every line.
+        # Returns the index of the first line that must still be added.
+        return start
+
+    def hide_lines(self, lines, start, end):
+        # Called with the lines 'lines[start:end]' that a page wrapping this one (like the FilterPage) does not display,
+        # in the order of the input, so the wrapping pages below it (like the line counter) still see every line.
+        pass
+
+    def get_pending_search(self):
+        # Pages that do not display any lines before the k-th line that matches a search pattern
+        # (like the SearchPage) return a (compiled_search, k) tuple here (see search_engine.py for the CompiledSearch),
+        # so an input that can search faster than the paginator (like a MappedFile) can skip ahead.
+        # The skipped lines are still passed to 'skip_lines'.
+        return None
+
+    def get_pending_jump(self):
+        # Pages that display the input from another line (like the JumpPage) return a (line, percentage) tuple here,
+        # with either the line to jump to (counting from 0), or the percentage of the input to jump to.
+        # An input that can jump (like a MappedFile) then moves there, and calls 'end_jump'.
+        return None
+
+    def end_jump(self, line):
+        # Called when the input jumped to 'line' (see 'get_pending_jump'),
+        # so the next line that is added is line 'line' of the input (counting from 0).
+        pass
+
+    def prompts_when_full(self):
+        # Returns True if the user must be prompted as soon as the page is full at the end of a batch,
+        # rather than when the next line arrives.
+        # Used by pages that can become full without receiving a line (like the FollowPage,
+        # when the user stops following an input that may not have a next line for a long time).
+        return False
+
+    def add_lines(self, lines, start):
+        # Adds 'lines[start:]' until the page is full.
+        # Returns the index of the first line that was not added.
+        # Pages that can handle a block of lines faster than line per line (like the FilterPage)
+        # can override this.
+        line_count = len(lines)
+        while start < line_count and not self.is_full():
+            self.add_line(lines[start])
+            start = start + 1
+        return start
@@ -7,22 +7,54 @@ class PageOfHeight(Page, RepeatableMixin):
         A page that accepts a given number of lines.
         Every line will be forwarded to the given 'output' object
         (of type output.Output).
+
+        The lines are collected and written with a single 'write' call
+        when the page is full, flushed, or at the end of an input batch.
+        Outputs that set 'line_by_line' to True receive every line as soon as it is added.
     '''
 
     def __init__(self, height, output):
         self.output = output
         self._remaining_lines = height
         self.height = height
+        self._pending_lines = []
+        self._line_by_line = getattr(output, 'line_by_line', False)
 
     def is_full(self):
         return self._remaining_lines == 0
 
     def add_line(self, line):
         self._remaining_lines = self._remaining_lines - 1
-        self.output.write(line)
+        if self._line_by_line:
+            self.output.write(line)
+            return
+
+        self._pending_lines.append(line)
+        if self.is_full():
+            self._write_pending_lines()
+
+    def add_lines(self, lines, start):
+        if self._line_by_line or self._remaining_lines <= 0:
+            return super().add_lines(lines, start)
+
+        end = min(len(lines), start + self._remaining_lines)
+        self._pending_lines.extend(lines[start:end])
+        self._remaining_lines = self._remaining_lines - (end - start)
+        if self.is_full():
+            self._write_pending_lines()
+        return end
 
     def flush(self):
+        self._write_pending_lines()
         self.output.flush()
 
+    def end_batch(self):
+        self._write_pending_lines()
+
     def repeat(self):
         return PageOfHeight(self.height, self.output)
+
+    def _write_pending_lines(self):
+        if self._pending_lines:
+            self.output.write(''.join(self._pending_lines))
+            self._pending_lines = []
@@ -0,0 +1,67 @@
+from .display_width import count_rows
+from .page_of_height import PageOfHeight
+
+
+class PageOfRows(PageOfHeight):
+    '''
+        A page that accepts the lines that fit in 'height' rows of a terminal that is 'width' columns wide.
+        Lines that are wider than the terminal wrap, so they take up several rows (see display_width.py).
+
+        A line that does not fit in the rows that are left is kept for the next page,
+        unless nothing was added yet (so lines that are higher than the page are still displayed).
+        Lines that are added one by one (through 'add_line') are always added.
+
+        Most pages only contain short ASCII lines, which are recognized for the whole page at once,
+        so they are added as fast as by a PageOfHeight.
+    '''
+
+    def __init__(self, height, output, width):
+        super().__init__(height, output)
+        self.width = width
+
+    def is_full(self):
+        return self._remaining_lines <= 0
+
+    def add_line(self, line):
+        # 'PageOfHeight.add_line' counts the first row
+        self._remaining_lines = self._remaining_lines - (count_rows(line, self.width) - 1)
+        super().add_line(line)
+
+    def add_lines(self, lines, start):
+        if self._fit_on_one_row(lines[start:start + self._remaining_lines]):
+            return super().add_lines(lines, start)
+
+        width = self.width
+        remaining_rows = self._remaining_lines
+        end = start
+        line_count = len(lines)
+        while end < line_count and remaining_rows > 0:
+            rows = count_rows(lines[end], width)
+            if rows > remaining_rows and remaining_rows < self.height:
+                remaining_rows = 0
+                break
+            remaining_rows = remaining_rows - rows
+            end = end + 1
+
+        if self._line_by_line:
+            for line in lines[start:end]:
+                self.output.write(line)
+        else:
+            self._pending_lines.extend(lines[start:end])
+        self._remaining_lines = remaining_rows
+        if self.is_full():
+            self._write_pending_lines()
+        return end
+
+    def _fit_on_one_row(self, lines):
+        '''
+            Returns True if all lines surely take up one row, checked for all lines at once:
+            ASCII characters never take up more than one column, except tabs.
+        '''
+        if not lines or max(map(len, lines)) > self.width:
+            return False
+        text = ''.join(lines)
+        return text.isascii() and '\t' not in text
+
+    def repeat(self):
+        return PageOfRows(self.height, self.output, self.width)
@@ -1,14 +1,19 @@
 from .page_builder import PageBuilder
+from .pagination_statistics import TimedPage, WRAP_PAGE
+import time
 
 
 class PageWrapper(PageBuilder):
     '''
         Wrapper around the 'build_[first|next]_page' methods that calls all the plugins.wrap_page
         methods.
+
+        If a PaginationStatistics object is passed in, the time spent in every plugin is recorded.
     '''
 
-    def __init__(self, actual_page_builder):
+    def __init__(self, actual_page_builder, statistics=None):
         self._actual_page_builder = actual_page_builder
+        self._statistics = statistics
 
     def build_first_page(self):
         return self._wrap_page(self._actual_page_builder.build_first_page())
@@ -20,6 +25,21 @@ class PageWrapper(PageBuilder):
         return getattr(self._actual_page_builder, name)
 
     def _wrap_page(self, page):
+        if self._statistics is not None:
+            return self._wrap_page_and_record_time(page)
+
         for plugin in self.get_plugins():
             page = plugin.wrap_page(page)
         return page
+
+    def _wrap_page_and_record_time(self, page):
+        statistics = self._statistics
+        page = TimedPage(page, statistics)
+        for plugin in self.get_plugins():
+            plugin_name = type(plugin).__name__
+            start = time.perf_counter()
+            wrapped_page = plugin.wrap_page(page)
+            statistics.add_plugin_seconds(plugin_name, WRAP_PAGE, time.perf_counter() - start)
+            if wrapped_page is not page:
+                page = TimedPage(wrapped_page, statistics, plugin_name)
+        return page
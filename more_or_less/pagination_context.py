@@ -0,0 +1,334 @@
+from .page_builder import StopOutput
+import codecs
+import collections
+import tempfile
+import threading
+import time
+
+
+# Overflow policies, used when text is written into a full context buffer:
+#   - wait until the paginator has taken text out of the buffer.
+OVERFLOW_BLOCK = 'block'
+#   - throw away the oldest text in the buffer.
+OVERFLOW_DROP_OLDEST = 'drop-oldest'
+#   - write the text to a temporary file (so memory use is bounded, but no text is lost).
+OVERFLOW_SPILL = 'spill'
+
+# Default maximum number of bytes kept in memory by the context buffer
+BUFFER_SIZE = 1024 * 1024
+
+_SPILL_READ_SIZE = 1024 * 1024
+
+_END = object()
+
+
+class PaginationContext(object):
+    '''
+        Returned by 'paginate(..., asynchronous=True)'.
+
+        Runs the paginator in a separate thread, and allows you to
+            - wait for it to finish using 'join([timeout])'.
+            - abort it using 'stop()'.
+            - send it input using 'write(text)' (followed by 'close()' when all input is written),
+              if you did not pass any input to 'paginate'.
+
+        Text sent through 'write' is kept in a bounded buffer.
+        Bytes can be written too (they are decoded by the paginator, like bytes input of 'paginate'),
+        but text and bytes can not be written to the same context.
+        What happens when the buffer is full (for example because the user is reading the current page)
+        is decided by the overflow policy, see OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST and OVERFLOW_SPILL.
+
+        The counters 'queued_bytes', 'queued_lines', 'blocked_seconds' and 'dropped_bytes'
+        tell the producer whether the paginator is keeping up.
+    '''
+
+    def __init__(self, buffer_size=BUFFER_SIZE, overflow=OVERFLOW_BLOCK):
+        self._buffer = _BoundedBuffer(buffer_size, overflow)
+        self._stopped = False
+        self._has_input = False
+        self._thread = None
+        self.result = None
+
+    def start(self, paginate_function, input):
+        '''
+            Starts calling 'paginate_function(iterable)' in a new thread.
+            If 'input' is None, the iterable returns the text sent in through 'write'.
+        '''
+        self._has_input = input is not None
+        iterable = input if self._has_input else self._buffer
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(paginate_function, _StoppableIterator(self, iterable)),
+        )
+        self._thread.start()
+
+    def write(self, text):
+        '''
+            Sends text (or bytes) to the paginator.
+            Returns OUTPUT_STOPPED if the paginator has stopped (so there is no point in writing more).
+        '''
+        # Imported here as the paginator module imports us
+        from .paginator import OUTPUT_STOPPED
+
+        if self._has_input:
+            raise ValueError('This context paginates the input that was passed to paginate()')
+        if not self._buffer.put(text):
+            return OUTPUT_STOPPED
+
+    def close(self):
+        ''' Signals that no more text will be written '''
+        self._buffer.close()
+
+    def stop(self):
+        '''
+            Aborts the pagination.
+            Note this takes effect the next time the paginator reads input,
+            so it does not interrupt a paginator that is waiting at the '--More--' prompt.
+        '''
+        self._stopped = True
+        self._buffer.stop()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    @property
+    def is_stopped(self):
+        return self._stopped
+
+    @property
+    def queued_bytes(self):
+        ''' The number of bytes that have been written but not yet read by the paginator '''
+        return self._buffer.queued_bytes
+
+    @property
+    def queued_lines(self):
+        ''' The number of newlines that have been written but not yet read by the paginator '''
+        return self._buffer.queued_lines
+
+    @property
+    def blocked_seconds(self):
+        ''' The total time 'write' waited for room in the buffer (only for OVERFLOW_BLOCK) '''
+        return self._buffer.blocked_seconds
+
+    @property
+    def dropped_bytes(self):
+        ''' The number of bytes thrown away (only for OVERFLOW_DROP_OLDEST) '''
+        return self._buffer.dropped_bytes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        self.join()
+
+    def _run(self, paginate_function, iterable):
+        try:
+            self.result = paginate_function(iterable)
+        finally:
+            # Ensure writers waiting for room in the buffer do not block forever
+            self._buffer.stop()
+
+
+class _StoppableIterator(object):
+
+    def __init__(self, context, iterable):
+        self._context = context
+        self._iterator = iter(iterable)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._context.is_stopped:
+            raise StopOutput
+        text = next(self._iterator, _END)
+        if self._context.is_stopped:
+            raise StopOutput
+        if text is _END:
+            raise StopIteration
+        return text
+
+
+class _BoundedBuffer(object):
+    '''
+        Thread-safe buffer between one or more writers and the paginator.
+
+        Iterating over it returns all the text that is waiting at once,
+        and stops when the buffer is closed (or stopped).
+    '''
+
+    def __init__(self, max_bytes, overflow):
+        assert overflow in (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_SPILL), overflow
+        self._max_bytes = max_bytes
+        self._overflow = overflow
+        self._condition = threading.Condition()
+        self._chunks = collections.deque()
+        self._memory_bytes = 0
+        self._spill = None
+        # str or bytes, decided by the first write
+        self._text_type = None
+        self._closed = False
+        self._stopped = False
+
+        self.queued_bytes = 0
+        self.queued_lines = 0
+        self.blocked_seconds = 0.0
+        self.dropped_bytes = 0
+
+    def put(self, text):
+        ''' Returns False if the text was not accepted because the buffer is stopped '''
+        size = _byte_size(text)
+        with self._condition:
+            if self._closed:
+                raise ValueError('Can not write to a closed context')
+            if self._stopped:
+                return False
+            if self._text_type is None:
+                self._text_type = type(text)
+            elif not isinstance(text, self._text_type):
+                raise TypeError('Can not write both text and bytes to a context')
+
+            if self._spill is not None and self._spill.has_data():
+                # Keep the order: once we spill, everything goes to the spill file until it is read.
+                self._spill.write(text)
+            elif not self._has_room_for(size):
+                self._handle_overflow(text, size)
+                if self._stopped:
+                    return False
+            else:
+                self._append(text, size)
+
+            self.queued_bytes = self.queued_bytes + size
+            self.queued_lines = self.queued_lines + _line_count(text)
+            self._condition.notify_all()
+            return True
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._condition:
+            while not (self._chunks or self._has_spilled_data() or self._closed or self._stopped):
+                self._condition.wait()
+
+            if self._stopped:
+                raise StopIteration
+            if self._chunks:
+                text = self._pop_memory()
+            elif self._has_spilled_data():
+                text = self._spill.read()
+            else:
+                raise StopIteration
+
+            self.queued_bytes = max(0, self.queued_bytes - _byte_size(text))
+            self.queued_lines = max(0, self.queued_lines - _line_count(text))
+            self._condition.notify_all()
+            return text
+
+    def _has_room_for(self, size):
+        # A single chunk that is bigger than the buffer is accepted if the buffer is empty
+        return self._memory_bytes == 0 or self._memory_bytes + size <= self._max_bytes
+
+    def _handle_overflow(self, text, size):
+        if self._overflow == OVERFLOW_BLOCK:
+            self._wait_for_room(size)
+            if not self._stopped:
+                self._append(text, size)
+        elif self._overflow == OVERFLOW_DROP_OLDEST:
+            self._drop_oldest(size)
+            self._append(text, size)
+        else:
+            self._spill_text(text)
+
+    def _wait_for_room(self, size):
+        start = time.perf_counter()
+        while not self._has_room_for(size) and not self._stopped:
+            self._condition.wait()
+        self.blocked_seconds = self.blocked_seconds + (time.perf_counter() - start)
+
+    def _drop_oldest(self, size):
+        while not self._has_room_for(size):
+            dropped = self._chunks.popleft()
+            dropped_size = _byte_size(dropped)
+            self._memory_bytes = self._memory_bytes - dropped_size
+            self.dropped_bytes = self.dropped_bytes + dropped_size
+            self.queued_bytes = self.queued_bytes - dropped_size
+            self.queued_lines = self.queued_lines - _line_count(dropped)
+
+    def _spill_text(self, text):
+        if self._spill is None:
+            self._spill = _SpillFile(binary=isinstance(text, bytes))
+        self._spill.write(text)
+
+    def _has_spilled_data(self):
+        return self._spill is not None and self._spill.has_data()
+
+    def _append(self, text, size):
+        self._chunks.append(text)
+        self._memory_bytes = self._memory_bytes + size
+
+    def _pop_memory(self):
+        # Joined with an empty str or bytes, like the chunks
+        text = self._chunks[0][:0].join(self._chunks)
+        self._chunks.clear()
+        self._memory_bytes = 0
+        return text
+
+
+class _SpillFile(object):
+    '''
+        Temporary file that is written at the end and read from the start.
+        If 'binary' is True it is written and read as bytes, otherwise as text.
+    '''
+
+    def __init__(self, binary=False):
+        self._file = tempfile.TemporaryFile()
+        self._decoder = None if binary else codecs.getincrementaldecoder('utf-8')('surrogatepass')
+        self._write_offset = 0
+        self._read_offset = 0
+
+    def has_data(self):
+        return self._read_offset < self._write_offset
+
+    def write(self, text):
+        data = text if self._decoder is None else text.encode('utf-8', 'surrogatepass')
+        self._file.seek(self._write_offset)
+        self._file.write(data)
+        self._write_offset = self._write_offset + len(data)
+
+    def read(self):
+        self._file.seek(self._read_offset)
+        data = self._file.read(_SPILL_READ_SIZE)
+        self._read_offset = self._read_offset + len(data)
+        if not self.has_data():
+            # Everything is read, so we can start reusing the file from the start
+            self._file.seek(0)
+            self._file.truncate()
+            self._read_offset = self._write_offset = 0
+        if self._decoder is None:
+            return data
+        return self._decoder.decode(data)
+
+
+def _line_count(text):
+    return text.count('\n' if isinstance(text, str) else b'\n')
+
+
+def _byte_size(text):
+    if isinstance(text, bytes) or text.isascii():
+        return len(text)
+    return len(text.encode('utf-8', 'surrogatepass'))
@@ -0,0 +1,187 @@
+from .page import Page
+import time
+
+
+# The phases of the per-plugin timings
+WRAP_PAGE = 'wrap_page'
+ON_ADD_LINE = 'on_add_line'
+
+
+class PaginationStatistics(object):
+    '''
+        Collects statistics about a pagination,
+        so you can see where the time goes when the pager is embedded in a tool.
+
+        Pass an instance to 'paginate(..., statistics=...)' (or to the Paginator and MorePageBuilder)
+        and inspect it while or after paginating.
+        Nothing is measured if no statistics object is passed in.
+
+        Counters:
+            bytes_read: the number of (utf-8) bytes of input text consumed.
+            lines_read: the number of input lines consumed.
+            lines_displayed: the number of lines sent to the output.
+            lines_skipped: the number of lines that were paginated but not displayed (e.g. while searching).
+            pages_built: the number of pages, including the first page.
+
+        Timings (in seconds):
+            read_seconds: waiting for input.
+            prompt_seconds: building the next page, which is mostly waiting for the user at the prompt.
+            output_seconds: writing to the output.
+            plugin_seconds: per plugin class name, the time spent in 'wrap_page' and in adding lines
+                to the pages the plugin wrapped (excluding the time of the pages and output it forwards to).
+    '''
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.lines_paginated = 0
+        self.lines_skipped = 0
+        self.pages_built = 0
+
+        self.read_seconds = 0.0
+        self.prompt_seconds = 0.0
+        self.output_seconds = 0.0
+        self.plugin_seconds = {}
+
+        # Time spent in timed calls made from within the timed call that is currently running,
+        # so every timed call only records the time it spent itself.
+        self._nested_seconds = 0.0
+
+    @property
+    def lines_displayed(self):
+        return self.lines_paginated - self.lines_skipped
+
+    def add_plugin_seconds(self, plugin_name, phase, seconds):
+        phases = self.plugin_seconds.setdefault(plugin_name, {WRAP_PAGE: 0.0, ON_ADD_LINE: 0.0})
+        phases[phase] = phases[phase] + seconds
+
+    def as_dict(self):
+        ''' Returns all statistics as a (json serializable) dictionary '''
+        return {
+            'bytes_read': self.bytes_read,
+            'lines_read': self.lines_read,
+            'lines_displayed': self.lines_displayed,
+            'lines_skipped': self.lines_skipped,
+            'pages_built': self.pages_built,
+            'read_seconds': self.read_seconds,
+            'prompt_seconds': self.prompt_seconds,
+            'output_seconds': self.output_seconds,
+            'plugin_seconds': {name: dict(phases) for name, phases in self.plugin_seconds.items()},
+        }
+
+    def __repr__(self):
+        return 'PaginationStatistics({})'.format(self.as_dict())
+
+
+class TimedIterator(object):
+    '''
+        Iterates over the iterable, recording the time spent waiting for its text
+    '''
+
+    def __init__(self, iterable, statistics):
+        self._iterator = iter(iterable)
+        self._statistics = statistics
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            return next(self._iterator)
+        finally:
+            self._statistics.read_seconds = self._statistics.read_seconds + (time.perf_counter() - start)
+
+
+class TimedOutput(object):
+    '''
+        Forwards to the output, recording the time spent writing
+    '''
+
+    def __init__(self, output, statistics):
+        self._output = output
+        self._statistics = statistics
+
+    def write(self, text):
+        return self._timed(self._output.write, text)
+
+    def flush(self):
+        return self._timed(self._output.flush)
+
+    def _timed(self, function, *args):
+        statistics = self._statistics
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            seconds = time.perf_counter() - start
+            statistics.output_seconds = statistics.output_seconds + seconds
+            statistics._nested_seconds = statistics._nested_seconds + seconds
+
+    def __getattr__(self, name):
+        return getattr(self._output, name)
+
+
+class TimedPage(Page):
+    '''
+        Forwards to the wrapped page, recording the time spent adding (or skipping) lines under 'plugin_name'.
+        If 'plugin_name' is None the time is not recorded,
+        but it is still subtracted from the time of the page that forwards to us.
+
+        Blocks of lines are forwarded as blocks, so the wrapped page keeps its fast paths
+        (like the SearchPage, which skips a block of lines at once).
+    '''
+
+    def __init__(self, wrapped_page, statistics, plugin_name=None):
+        self.wrapped_page = wrapped_page
+        self._statistics = statistics
+        self._plugin_name = plugin_name
+
+    def is_full(self):
+        return self.wrapped_page.is_full()
+
+    def add_line(self, line):
+        return self._timed(self.wrapped_page.add_line, line)
+
+    def add_lines(self, lines, start):
+        return self._timed(self.wrapped_page.add_lines, lines, start)
+
+    def skip_lines(self, lines, start):
+        return self._timed(self.wrapped_page.skip_lines, lines, start)
+
+    def flush(self):
+        return self.wrapped_page.flush()
+
+    def end_batch(self):
+        return self.wrapped_page.end_batch()
+
+    def hide_lines(self, lines, start, end):
+        return self.wrapped_page.hide_lines(lines, start, end)
+
+    def get_pending_search(self):
+        return self.wrapped_page.get_pending_search()
+
+    def get_pending_jump(self):
+        return self.wrapped_page.get_pending_jump()
+
+    def end_jump(self, line):
+        return self.wrapped_page.end_jump(line)
+
+    def prompts_when_full(self):
+        return self.wrapped_page.prompts_when_full()
+
+    def _timed(self, function, *args):
+        statistics = self._statistics
+        outer_nested_seconds = statistics._nested_seconds
+        statistics._nested_seconds = 0.0
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            seconds = time.perf_counter() - start
+            if self._plugin_name is not None:
+                statistics.add_plugin_seconds(self._plugin_name, ON_ADD_LINE, seconds - statistics._nested_seconds)
+            statistics._nested_seconds = outer_nested_seconds + seconds
+
+    def __getattr__(self, name):
+        return getattr(self.wrapped_page, name)
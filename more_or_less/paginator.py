@@ -1,24 +1,57 @@
 #!python
+from . import more_plugins
+from .binary_output import BinaryOutput
+from .decompression import decompress, detect_file_compression
+from .fixed_size_screen import FixedSizeScreen, _HUGE
+from .follower import Follower, TRUNCATED, is_regular_file
+from .history import History
+from .line_index import LineIndex
+from .line_segments import Continuation, SegmentedLines, split_lines
+from .look_ahead import LookAhead
+from .mapped_file import MappedFile
 from .more_page_builder import MorePageBuilder
 from .page_builder import StopOutput
+from .pagination_context import BUFFER_SIZE, OVERFLOW_BLOCK, PaginationContext, _byte_size
+from .pagination_statistics import TimedIterator, TimedOutput
+import codecs
+import os
 import queue
-import threading
+import stat
+import sys
+import time
 
 
 # Signal to send to the input queue when there is no more input
 END_OF_INPUT = None
 # Return code if output was interrupted by the user (e.g. the user pressed ctrl+c)
 OUTPUT_STOPPED = 'OUTPUT_STOPPED'
+# Number of characters we read at once from file inputs
+BLOCK_SIZE = 1024 * 1024
+# Default maximum number of characters of a line that are kept in memory while waiting for its end
+MAX_LINE_SIZE = 16 * BLOCK_SIZE
 
 
 def paginate(
-        input,
+        input=None,
         output=None,
         prompt=None,
         screen_dimensions=None,
         plugins=None,
         page_builder=None,
-        asynchronous=False):
+        asynchronous=False,
+        read_in_blocks=None,
+        buffer_size=BUFFER_SIZE,
+        overflow=OVERFLOW_BLOCK,
+        statistics=None,
+        look_ahead=False,
+        look_ahead_size=BUFFER_SIZE,
+        encoding='utf-8',
+        errors='replace',
+        decompress=True,
+        follower=None,
+        max_line_size=MAX_LINE_SIZE,
+        history=None,
+        line_index=None):
     '''
         Paginates the input, similar to how 'more' works in bash.
 
@@ -35,12 +68,21 @@ def paginate(
                 page = page_builder.build_next_page()
             page.add_line(line)
 
+        If no pagination is possible, because the output is not a terminal (e.g. a pipe or a file)
+        or the screen is infinitely high (a FixedSizeScreen with the default height),
+        the input is copied straight to the output instead.
+        Only when a plugin changes the output lines (e.g. line numbers are enabled)
+        the lines are still sent through the pages.
+
         Arguments:
         ----------
 
-        input: [type iterable or Queue]
+        input: [type iterable, Queue or int]
             The input text that should be paginated.
-            This must either be an iterable over text (e.g. a list or a file), or an instance of queue.Queue.
+            This must either be an iterable over text or bytes (e.g. a list or a file), an instance of queue.Queue,
+            or a file descriptor (which is read using 'os.read').
+            Files are read in large blocks rather than line per line, see 'read_in_blocks'.
+            Bytes are decoded using 'encoding' and 'errors'.
 
             It is not required that each returned string is a complete line. 
             The paginator will combine incomplete lines until a '\n' is encountered.
@@ -51,6 +93,10 @@ def paginate(
             (as that just raises issues if the user decides to abort the output halfway through).
             Instead, if you use 'asynchronous=True' you can join the returned context.
 
+            If 'asynchronous' is True, input can be None.
+            In that case, send the text using 'context.write(text)' and call 'context.close()' when done.
+            You can write bytes instead of text, they are decoded using 'encoding' and 'errors'.
+
         output: [type Output]
             If not specified we print output to stdout
 
@@ -69,46 +115,365 @@ def paginate(
 
         asynchronous: [type bool] 
             If true the 'paginate' call will return instantly and run asynchronously.
-            In this case a context is returned on which you can call 'context.join([timeout])' 
+            In this case a PaginationContext is returned on which you can call 'context.join([timeout])' 
             to block until all lines are sent to the output.
+            See PaginationContext for the other things you can do with it.
+
+        buffer_size: [type int]
+            Only used if 'asynchronous' is True and input is None.
+            The maximum number of bytes written through 'context.write' that are kept in memory.
+
+        overflow: [type str]
+            Only used if 'asynchronous' is True and input is None.
+            What 'context.write' does when the buffer is full.
+            One of OVERFLOW_BLOCK (the default), OVERFLOW_DROP_OLDEST or OVERFLOW_SPILL.
 
         page_builder: [type PageBuilder]
             The object that will create the output pages whenever a page is full.
             Must be an instance of 'PageBuilder'.
             If specified we ignore the values of output, prompt, screen_dimensions and plugins.
 
+        read_in_blocks: [type bool]
+            If true, the input is read using 'input.read(BLOCK_SIZE)' instead of being iterated line per line.
+            This is a lot faster for big files, but it means we wait until a full block is available
+            (or the input is finished).
+            Defaults to true for seekable file objects (like regular files),
+            and to false for everything else (like pipes or sockets),
+            so slow producers still see their output appear as soon as it is written.
+
+        statistics: [type PaginationStatistics]
+            If specified, it is filled in with statistics about the pagination
+            (the amount of input, the number of pages, and where the time was spent).
+            Collecting the statistics adds a little overhead, so it is off by default.
+
+        look_ahead: [type bool]
+            If true, the input is read in a background thread while the user is reading the current page,
+            so the next page (or the next match when repeating a search using 'n') is available instantly.
+            The text is still read only once and in order.
+            When the user stops the output (e.g. by pressing 'q'), the text that was read ahead is thrown away
+            and no more input is read.
+
+        look_ahead_size: [type int]
+            Only used if 'look_ahead' is True.
+            The maximum number of bytes that are read ahead.
+
+
+        encoding: [type str]
+            The encoding of bytes input.
+            Characters that are split over two chunks of bytes are decoded correctly.
+
+        errors: [type str]
+            How decoding errors in bytes input are handled (see 'bytes.decode').
+            Defaults to 'replace' so binary garbage does not stop the pagination.
+
+        decompress: [type bool]
+            If true, bytes input that is compressed with gzip, bzip2, xz or zstandard
+            (as detected by the magic bytes at its start) is decompressed while it is paginated.
+            The decompression runs in a worker thread, and only a few blocks of decompressed bytes
+            are kept in memory, however big the archive is (see DecompressingIterator).
+            Zstandard requires Python 3.14 or newer.
+
+        follower: [type Follower]
+            Lets the input wait for more input at its end while the user follows it (see FollowPlugin).
+            Only file descriptors and MappedFiles can wait; other inputs simply end.
+            Created by default. Pass your own if you pass it to the input too (like a MappedFile).
+
+        max_line_size: [type int]
+            The maximum number of characters of an incomplete line that are kept in memory
+            while waiting for the rest of the line (e.g. when the input is a binary dump without any '\n').
+            Beyond that, the line is displayed in segments of 'max_line_size' characters,
+            each of which starts on a new row.
+            Searching and line numbers still treat the segments as a single line.
+            If None, lines are kept in memory until they end, however long they are.
+
+        history: [type History]
+            Records the output, so the user can go back to the previous pages (see BackPlugin).
+            Only the most recent output is kept in memory (16 MB by default), older output is written
+            to a temporary file.
+            Created by default when the user is prompted (not when the output is copied to a file),
+            and closed when the pagination ends.
+            Pass your own to change its memory budget (e.g. 'History(memory_budget=...)'), and close it yourself.
+
+        line_index: [type LineIndex]
+            The sparse index of the lines of the input, which lets the user jump to a line or to a percentage
+            of the input (see GotoPlugin). It is built in a background thread while paginating.
+            Only a MappedFile can jump, so 'paginate_file' passes the LineIndex of its MappedFile.
+            Jumping is not possible when the input is read ahead or asynchronously.
+
+        If the input is copied to the output without paginating it and 'output' is not given,
+        the output is written to 'sys.stdout.buffer' (see BinaryOutput),
+        and bytes input is copied as is, without decoding it.
+
 
         Returns:
         --------
 
-        A joinable 'context' if asynchronous is True
+        A PaginationContext if asynchronous is True
         OUTPUT_STOPPED if the user stopped the output (for example using ctrl+c)
 
     '''
 
+    is_interactive = True
+    if page_builder is None and prompt is None and _is_pagination_impossible(output, screen_dimensions):
+        plugins = plugins or more_plugins.get()
+        if not _transforms_lines(plugins):
+            output = output or _get_binary_stdout()
+            if isinstance(output, BinaryOutput):
+                # Bytes are written as they are
+                encoding = None
+            return _run(
+                lambda iterable: passthrough(iterable, output, statistics),
+                input, read_in_blocks, asynchronous, buffer_size, overflow, encoding, errors, decompress)
+        # Send the lines through (a single infinitely high) page, so the plugins can change them
+        screen_dimensions = FixedSizeScreen()
+        is_interactive = False
+
+    follower = follower or Follower()
+    # Only an interactive screen can go back to the previous pages
+    created_history = History() if history is None and page_builder is None and is_interactive else None
+    history = history or created_history
+    if look_ahead or asynchronous:
+        # The input is read in another thread, so the paginator can not make it jump
+        line_index = None
+    elif line_index is not None:
+        line_index.start()
+    if isinstance(input, int):
+        input = DescriptorIterator(input, follower=follower)
+
+    look_ahead = LookAhead(max_bytes=look_ahead_size) if look_ahead else None
     page_builder = page_builder or MorePageBuilder(
         input=prompt,
         output=output,
         screen_dimensions=screen_dimensions,
-        plugins=plugins)
+        plugins=plugins,
+        statistics=statistics,
+        look_ahead=look_ahead,
+        follower=follower,
+        history=history,
+        line_index=line_index)
+
+    paginate_function = lambda iterable: Paginator(page_builder, statistics, max_line_size).paginate(iterable)
+    if look_ahead is not None:
+        paginate_function = _read_ahead(paginate_function, look_ahead)
+    if created_history is not None:
+        paginate_function = _close_when_done(paginate_function, created_history)
 
+    return _run(
+        paginate_function, input, read_in_blocks, asynchronous, buffer_size, overflow, encoding, errors, decompress)
+
+
+def _run(paginate_function, input, read_in_blocks, asynchronous, buffer_size, overflow, encoding, errors, decompress):
     if asynchronous:
-        thread = threading.Thread(
-            target=paginate,
-            kwargs={
-                'input': input,
-                'page_builder': page_builder,
-                'asynchronous': False,
-            },
-        )
-        thread.start()
-        return thread
-
-    paginator = Paginator(page_builder)
+        if isinstance(input, MappedFile):
+            # The mapped file closes itself at its end, but the user can stop the pagination before that
+            paginate_function = _close_when_done(paginate_function, input)
+        context = PaginationContext(buffer_size=buffer_size, overflow=overflow)
+        if input is None:
+            # Bytes sent through 'context.write' are decoded (and decompressed) like bytes input
+            context.start(
+                lambda iterable: paginate_function(_iterate_input(iterable, False, encoding, errors, decompress)),
+                None,
+            )
+        else:
+            context.start(paginate_function, _iterate_input(input, read_in_blocks, encoding, errors, decompress))
+        return context
+
+    if input is None:
+        raise ValueError('input can only be None if asynchronous is True')
+
+    return paginate_function(_iterate_input(input, read_in_blocks, encoding, errors, decompress))
+
+
+def _read_ahead(paginate_function, look_ahead):
+    def paginate_with_look_ahead(iterable):
+        try:
+            return paginate_function(look_ahead.start(iterable))
+        finally:
+            look_ahead.stop()
+    return paginate_with_look_ahead
+
+
+def _close_when_done(paginate_function, resource):
+    def paginate_and_close(iterable):
+        try:
+            return paginate_function(iterable)
+        finally:
+            resource.close()
+    return paginate_and_close
+
+
+def passthrough(iterable, output, statistics=None):
+    '''
+        Copies all text in the iterable to the output, without splitting it into lines.
+        Used instead of a Paginator when no pagination is possible.
+
+        Returns OUTPUT_STOPPED if the copying was aborted.
+    '''
+    if statistics is not None:
+        return _passthrough_and_record_statistics(iterable, output, statistics)
+
+    try:
+        for text in iterable:
+            output.write(text)
+        output.flush()
+    except StopOutput:
+        return OUTPUT_STOPPED
+
+
+def _passthrough_and_record_statistics(iterable, output, statistics):
+    output = TimedOutput(output, statistics)
+    try:
+        for text in TimedIterator(iterable, statistics):
+            line_count = text.count('\n' if isinstance(text, str) else b'\n')
+            statistics.bytes_read = statistics.bytes_read + _byte_size(text)
+            statistics.lines_read = statistics.lines_read + line_count
+            output.write(text)
+            statistics.lines_paginated = statistics.lines_paginated + line_count
+        output.flush()
+    except StopOutput:
+        return OUTPUT_STOPPED
+
+
+def _is_pagination_impossible(output, screen_dimensions):
+    if screen_dimensions is not None:
+        return isinstance(screen_dimensions, FixedSizeScreen) and screen_dimensions.get_height() == _HUGE
+    return not _is_terminal(output or sys.stdout)
+
+
+def _is_terminal(output):
+    try:
+        return output.isatty()
+    except (AttributeError, ValueError):
+        # Custom outputs without 'isatty' are treated as terminals, so they are paginated as before
+        return True
+
+
+def _transforms_lines(plugins):
+    return any(plugin.transforms_lines() for plugin in plugins)
+
+
+def _get_binary_stdout():
+    if hasattr(sys.stdout, 'buffer'):
+        return BinaryOutput()
+    return sys.stdout
+
+
+def _iterate_input(input, read_in_blocks, encoding, errors, decompress_input):
+    '''
+        Returns an iterable over the text in the input.
+        If 'encoding' is None, bytes are returned as they are (but decompressed if 'decompress_input' is True).
+    '''
+    if isinstance(input, MappedFile):
+        # Decodes its own content (and must stay visible to the paginator, see 'skip_to_match')
+        return input
+
+    iterable = _iterate_raw_input(input, read_in_blocks)
+    if decompress_input:
+        iterable = decompress(iterable)
+    if encoding is None:
+        return iterable
+    return DecodingIterator(iterable, encoding, errors)
+
+
+def _iterate_raw_input(input, read_in_blocks):
     if isinstance(input, queue.Queue):
-        return paginator.paginate_from_queue(input)
+        return BatchedQueueIterator(input)
+    elif isinstance(input, int):
+        return DescriptorIterator(input)
+    elif _must_read_in_blocks(input, read_in_blocks):
+        return FileIterator(input)
     else:
-        return paginator.paginate(input)
+        return input
+
+
+def paginate_file(path, encoding='utf-8', errors='replace', search_processes=None, **kwargs):
+    '''
+        Paginates the content of the file at 'path'.
+
+        The file is memory-mapped rather than read, so opening even a huge file is instant:
+        only the part that is actually paginated is ever decoded.
+        While paginating, an index of the line offsets is built (see MappedFile).
+
+        Arguments:
+        ----------
+
+        path: [type str]
+            The file to paginate.
+
+        encoding: [type str]
+            The encoding of the file. Must be ASCII compatible (like utf-8 or latin-1).
+
+        errors: [type str]
+            How decoding errors are handled (see 'bytes.decode').
+            Defaults to 'replace' so binary garbage does not stop the pagination.
+
+        search_processes: [type int]
+            The number of processes used to search big files for the k-th match of a search
+            (e.g. when the user enters '5000/timeout'), see MappedFile.skip_to_match.
+            Defaults to one per core. Pass 1 to search in the paginator itself.
+            The processes are not forked, so the main module must be guarded by "if __name__ == '__main__':"
+            (see ParallelSearch).
+            Files are not searched in parallel when the input is read ahead or asynchronously.
+
+        Files that are compressed with gzip, bzip2, xz or zstandard are decompressed while they are paginated
+        (see the 'decompress' argument of 'paginate'), so they are read rather than memory-mapped.
+        So are the files that can not be memory-mapped, like pipes, devices and the files in /proc.
+
+        The user can jump to any line of the file, or to a percentage of it (see GotoPlugin),
+        using a sparse index of its lines that is built in the background (see LineIndex).
+
+        The file can be followed while it grows (see FollowPlugin).
+        When it is truncated or replaced (e.g. by log rotation) while following, it is read again from its start.
+        Only 'paginate_file' detects that the file is replaced: a file descriptor passed to 'paginate'
+        keeps following the old file.
+
+        All other arguments are passed to 'paginate'.
+    '''
+    if not _can_map_file(path) or (kwargs.get('decompress', True) and detect_file_compression(path) is not None):
+        return paginate(input=_read_file(path), encoding=encoding, errors=errors, **kwargs)
+
+    kwargs['follower'] = kwargs.get('follower') or Follower()
+    kwargs['line_index'] = kwargs.get('line_index') or LineIndex()
+    mapped_file = MappedFile(
+        path, encoding=encoding, errors=errors, search_processes=search_processes, follower=kwargs['follower'],
+        line_index=kwargs['line_index'])
+    if kwargs.get('asynchronous'):
+        # The mapped file is closed when the pagination ends
+        return paginate(input=mapped_file, **kwargs)
+
+    with mapped_file:
+        return paginate(input=mapped_file, **kwargs)
+
+
+def _can_map_file(path):
+    ''' Returns False for files that must be read rather than memory-mapped, like pipes and devices '''
+    status = os.stat(path)
+    if not stat.S_ISREG(status.st_mode):
+        return False
+    if status.st_size:
+        return True
+    # Files in /proc claim to be empty, but they are not (while a file that is really empty can grow later)
+    with open(path, 'rb') as file:
+        return not file.read(1)
+
+
+def _read_file(path, block_size=BLOCK_SIZE):
+    ''' Yields the bytes of the file in blocks. The file is closed when all blocks are read '''
+    with open(path, 'rb') as file:
+        yield from FileIterator(file, block_size)
+
+
+def _must_read_in_blocks(input, read_in_blocks):
+    if read_in_blocks is None:
+        return hasattr(input, 'read') and _is_seekable(input)
+    return read_in_blocks
+
+
+def _is_seekable(file):
+    try:
+        return file.seekable()
+    except (AttributeError, ValueError, OSError):
+        return False
 
 
 class Paginator(object):
@@ -117,29 +482,41 @@ class Paginator(object):
 
         See help of 'paginate' for a more detailed description of the behavior.
 
-        There are 3 ways to send input text:
+        There are 4 ways to send input text:
             - pass an iterable to self.paginate.
             - pass a queue to self.paginate_from_queue.
+            - pass a file object to self.paginate_from_file.
             - call 'add_text' repeatedly until all text has been sent in, then call 'flush_incomplete_line'.
 
         Each of these methods returns 'OUTPUT_STOPPED' if the user stopped the output (for example using ctrl+c)
+
+        If a PaginationStatistics object is passed in, it is filled in while paginating.
+        Lines longer than 'max_line_size' characters are paginated in segments (see _LineCollector).
     '''
 
-    def __init__(self, page_builder):
+    def __init__(self, page_builder, statistics=None, max_line_size=MAX_LINE_SIZE):
         self._page_builder = page_builder
-        self._lines = _LineCollector()
+        self._statistics = statistics
+        self._lines = _LineCollector(max_line_size)
 
         self._page = self._page_builder.build_first_page()
+        if statistics is not None:
+            statistics.pages_built = statistics.pages_built + 1
 
     def paginate(self, iterable):
         '''
             Iterates over the iterable, and paginates all the text it returns
         '''
+        # Inputs like the MappedFile can skip ahead to the next match of a search, and jump to other lines
+        skip_to_match = getattr(iterable, 'skip_to_match', None)
+        jump_to = getattr(iterable, 'jump_to', None)
+        if self._statistics is not None:
+            iterable = TimedIterator(iterable, self._statistics)
         try:
             for text in iterable:
-                self._try_to_add_text(text)
+                self._build_pages(self._paginate_text(text, skip_to_match, jump_to))
 
-            self.flush_incomplete_line()
+            self._try_to_flush_incomplete_line()
         except StopOutput:
             return OUTPUT_STOPPED
 
@@ -147,8 +524,18 @@ class Paginator(object):
         '''
             Iterates over the queue, and paginates all the text it returns.
             Stops paginating when END_OF_INPUT is encountered on the queue.
+
+            All text that is waiting in the queue is taken out (and paginated) in one go,
+            so the queue's lock is not taken for every single item.
+        '''
+        return self.paginate(BatchedQueueIterator(input_queue))
+
+    def paginate_from_file(self, file, block_size=BLOCK_SIZE):
+        '''
+            Reads the file in blocks of 'block_size' characters, and paginates all the text it returns.
+            Lines are only split out of a block when they are sent to the output.
         '''
-        return self.paginate(QueueIterator(input_queue))
+        return self.paginate(FileIterator(file, block_size))
 
     def add_text(self, input_text):
         '''
@@ -164,10 +551,49 @@ class Paginator(object):
             return OUTPUT_STOPPED
 
     def _try_to_add_text(self, input_text):
-        self._lines.add(input_text)
+        self._build_pages(self._paginate_text(input_text))
+
+    def _paginate_text(self, input_text, skip_to_match=None, jump_to=None):
+        '''
+            Paginates the input text, and then lets the input skip ahead to a match or jump, if the page asks for it.
 
-        for line in self._lines.pop_complete_lines():
-            self._paginate_and_print_text(line)
+            This is a generator, which yields whenever the current page is full and the next page must be built.
+            The caller builds it (see '_build_pages'), so the AsyncPaginator can wait for the user
+            without blocking its event loop, while sharing all the rest of the pagination with the Paginator.
+        '''
+        self._lines.add(input_text)
+        lines = self._lines.pop_complete_lines()
+        if self._statistics is not None:
+            self._record_input(input_text, lines)
+        yield from self._paginate_lines(lines)
+        self._page.end_batch()
+        if self._page.is_full() and self._page.prompts_when_full():
+            yield
+
+        if skip_to_match is not None:
+            yield from self._skip_to_match(skip_to_match)
+        if jump_to is not None:
+            self._jump(jump_to)
+
+    def _skip_to_match(self, skip_to_match):
+        pending_search = self._page.get_pending_search()
+        if pending_search is None or self._lines.has_incomplete_line():
+            return
+
+        skipped_lines = skip_to_match(*pending_search)
+        if skipped_lines:
+            if self._statistics is not None:
+                self._record_input('', skipped_lines)
+            yield from self._paginate_lines(skipped_lines)
+
+    def _jump(self, jump_to):
+        pending_jump = self._page.get_pending_jump()
+        if pending_jump is None:
+            return
+
+        # The rest of the line that was read before the jump is not displayed
+        self._lines.discard_incomplete_line()
+        self._page.end_jump(jump_to(*pending_jump))
 
     def flush_incomplete_line(self):
         try:
@@ -176,26 +602,86 @@ class Paginator(object):
             return OUTPUT_STOPPED
 
     def _try_to_flush_incomplete_line(self):
-        if len(self._lines.incomplete_line):
-            self._paginate_and_print_text(self._lines.pop_incomplete_line())
-        self._page.flush()
-
-    def _paginate_and_print_text(self, text):
-        if self._page.is_full():
+        self._build_pages(self._flush_lines())
+
+    def _flush_lines(self):
+        ''' Paginates the incomplete line and flushes the page. Yields like '_paginate_text' '''
+        if self._lines.has_incomplete_line():
+            self._lines.end_incomplete_line()
+            lines = self._lines.pop_complete_lines()
+            if self._statistics is not None:
+                self._record_input('', lines)
+            yield from self._paginate_lines(lines)
+        self._flush_page()
+
+    def _paginate_lines(self, lines):
+        ''' Yields whenever the next page must be built, see '_paginate_text' '''
+        index = self._fill_page(lines, 0)
+        while index < len(lines):
+            yield
+            index = self._fill_new_page(lines, index)
+
+    def _build_pages(self, steps):
+        ''' Runs the steps of the pagination, building the next page whenever they ask for it '''
+        for _ in steps:
             self._start_new_page()
-        self._output_text(text)
+
+    def _fill_page(self, lines, index):
+        '''
+            Adds lines to the current page until it is full.
+            Returns the index of the first line that was not added.
+        '''
+        page = self._page
+        start = index
+        index = page.add_lines(lines, page.skip_lines(lines, index))
+        if self._statistics is not None:
+            self._statistics.lines_paginated = self._statistics.lines_paginated + (index - start)
+        return index
+
+    def _fill_new_page(self, lines, index):
+        # A new page always receives at least one line
+        self._page.add_line(lines[index])
+        if self._statistics is not None:
+            self._statistics.lines_paginated = self._statistics.lines_paginated + 1
+        return self._fill_page(lines, index + 1)
 
     def _start_new_page(self):
+        self._flush_page()
+        if self._statistics is not None:
+            self._page = self._build_next_page_and_record_time()
+        else:
+            self._page = self._page_builder.build_next_page()
+
+    def _flush_page(self):
         self._page.flush()
-        self._page = self._page_builder.build_next_page()
+        if self._statistics is not None:
+            self._record_skipped_lines(self._page)
 
-    def _output_text(self, text):
-        self._page.add_line(text)
+    def _build_next_page_and_record_time(self):
+        statistics = self._statistics
+        start = time.perf_counter()
+        try:
+            page = self._page_builder.build_next_page()
+        finally:
+            statistics.prompt_seconds = statistics.prompt_seconds + (time.perf_counter() - start)
+        statistics.pages_built = statistics.pages_built + 1
+        return page
+
+    def _record_input(self, input_text, lines):
+        statistics = self._statistics
+        statistics.bytes_read = statistics.bytes_read + _byte_size(input_text)
+        statistics.lines_read = statistics.lines_read + len(lines)
+
+    def _record_skipped_lines(self, page):
+        # Pages that hide some of their lines (like the SearchPage) tell us how many they skipped
+        statistics = self._statistics
+        statistics.lines_skipped = statistics.lines_skipped + getattr(page, 'skipped_line_count', 0)
 
 
 class _LineCollector(object):
     '''
         Collects the input text and allows us to walk over the complete lines only.
+        Only '\n' ends a line (see 'split_lines'), like in the MappedFile and the LineIndex.
         example:
              self.add('first ')
              self.add('line \nsecond line\n')
@@ -204,47 +690,118 @@ class _LineCollector(object):
              self.pop_complete_lines() <-- returns ['first line', 'second line']
              self.pop_incomplete_line() <-- returns 'incomplete final line'
 
+        The incomplete line is kept as a list of fragments,
+        and only the newly added text is scanned for line breaks.
+        This keeps the total work linear in the size of the input,
+        even if a long line is sent in many small pieces.
+
+        If 'max_line_size' is given, an incomplete line that grows beyond 'max_line_size' characters
+        is split into segments of 'max_line_size' characters, which are returned as complete lines
+        (ending in a '\n' that was not in the input), so a line that never ends does not fill up the memory.
+        The segments after the first one are Continuations, and lists of lines that contain segments
+        are SegmentedLines (see line_segments.py).
     '''
 
-    def __init__(self):
+    def __init__(self, max_line_size=None):
         self._complete_lines = []
-        self.incomplete_line = ''
+        self._incomplete_chunks = []
+        self._incomplete_size = 0
+        self._max_line_size = max_line_size if max_line_size is not None else sys.maxsize
+        # True if the start of the incomplete line was split off in segments
+        self._continues_line = False
+        # The number of segments in the complete lines
+        self._segment_count = 0
+
+    @property
+    def incomplete_line(self):
+        return ''.join(self._incomplete_chunks)
+
+    def has_incomplete_line(self):
+        return bool(self._incomplete_chunks)
 
     def add(self, text):
         assert isinstance(text, str), 'expected str got {}'.format(text.__class__)
 
-        unprocessed_text = self.incomplete_line + text
-        complete_lines, incomplete_line = self._split_lines(unprocessed_text)
+        lines = split_lines(text)
+        if not lines:
+            return
 
-        self._complete_lines += complete_lines
-        self.incomplete_line = incomplete_line
+        if self._incomplete_chunks:
+            self._merge_incomplete_line(lines)
+
+        last_line = lines[-1]
+        if _is_complete(last_line):
+            self._complete_lines += lines
+        else:
+            del lines[-1]
+            self._complete_lines += lines
+            self._incomplete_chunks.append(last_line)
+            self._incomplete_size = self._incomplete_size + len(last_line)
+            if self._incomplete_size > self._max_line_size:
+                self._split_incomplete_line()
 
     def pop_complete_lines(self):
-        try:
-            return self._complete_lines
-        finally:
-            self._complete_lines = []
+        lines = self._complete_lines
+        self._complete_lines = []
+        if self._segment_count:
+            lines = SegmentedLines(lines, self._segment_count)
+            self._segment_count = 0
+        return lines
 
     def pop_incomplete_line(self):
-        try:
-            return self.incomplete_line
-        finally:
-            self.incomplete_line = ''
+        return self._mark_continuation(self._pop_incomplete_text())
 
-    def _split_lines(self, text):
-        lines = text.splitlines(True)
-
-        if self._has_incomplete_line(lines):
-            complete_lines = lines[:-1]
-            incomplete_line = lines[-1]
-        else:
-            complete_lines = lines
-            incomplete_line = ''
+    def end_incomplete_line(self):
+        ''' Adds the incomplete line to the complete lines (when there is no more input) '''
+        self._complete_lines.append(self.pop_incomplete_line())
 
-        return (complete_lines, incomplete_line)
+    def discard_incomplete_line(self):
+        ''' Forgets the incomplete line (e.g. when the input moves to another line) '''
+        self._incomplete_chunks = []
+        self._incomplete_size = 0
+        self._continues_line = False
 
-    def _has_incomplete_line(self, lines):
-        return len(lines) and not lines[-1].endswith('\n')
+    def _pop_incomplete_text(self):
+        try:
+            return self.incomplete_line
+        finally:
+            self._incomplete_chunks = []
+            self._incomplete_size = 0
+
+    def _split_incomplete_line(self):
+        text = self._pop_incomplete_text()
+        size = self._max_line_size
+        # At least one character is kept, as it could be a '\r' that is followed by a '\n'
+        end = (len(text) - 1) // size * size
+        for start in range(0, end, size):
+            segment = text[start:start + size] + '\n'
+            self._complete_lines.append(Continuation(segment) if self._continues_line else segment)
+            self._continues_line = True
+            self._segment_count = self._segment_count + 1
+        self._incomplete_chunks = [text[end:]]
+        self._incomplete_size = len(text) - end
+
+    def _mark_continuation(self, line):
+        ''' Returns the line as a Continuation if the start of the line was split off in segments '''
+        if not self._continues_line:
+            return line
+        self._continues_line = False
+        self._segment_count = self._segment_count + 1
+        return Continuation(line)
+
+    def _merge_incomplete_line(self, lines):
+        ''' Prepends the pending fragments to the first of the new lines, if that line is complete '''
+        if len(lines) > 1 or _is_complete(lines[0]):
+            lines[0] = ''.join(self._incomplete_chunks) + lines[0]
+            self._incomplete_chunks = []
+            self._incomplete_size = 0
+            if self._continues_line:
+                lines[0] = self._mark_continuation(lines[0])
+        # else: the new text is just another fragment of the incomplete line
+
+
+def _is_complete(line):
+    return line.endswith('\n')
 
 
 def _make_callable(value):
@@ -254,6 +811,114 @@ def _make_callable(value):
         return value
 
 
+class FileIterator(object):
+    '''
+        Iterates over a file in blocks of 'block_size' characters, until the file is exhausted
+    '''
+
+    def __init__(self, file, block_size=BLOCK_SIZE):
+        self._file = file
+        self._block_size = block_size
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        text = self._file.read(self._block_size)
+        if not text:
+            raise StopIteration
+        return text
+
+
+class DescriptorIterator(object):
+    '''
+        Iterates over the bytes read from a file descriptor, until the end of the file.
+        Every read returns what is available (up to 'block_size' bytes),
+        so the text of slow producers (like pipes) is returned as soon as it is written.
+
+        If a Follower is given, the end of the file is not the end of the iteration while it is following:
+        instead we wait for more bytes, and return an empty chunk every time none arrived (see Follower).
+        A regular file that is truncated while following is read again from its start.
+        A file that is replaced (e.g. renamed by log rotation) is not detected, as there is no path to check,
+        so we keep following the old file (use 'paginate_file' to follow the file at a path).
+    '''
+
+    def __init__(self, file_descriptor, block_size=BLOCK_SIZE, follower=None):
+        self._file_descriptor = file_descriptor
+        self._block_size = block_size
+        self._follower = follower
+        self._is_regular_file = follower is not None and is_regular_file(file_descriptor)
+        # True if the writer closed the pipe (or socket, ...)
+        self._end_of_stream = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._follower is not None and self._follower.following:
+            return self._follow()
+
+        data = os.read(self._file_descriptor, self._block_size)
+        if not data:
+            raise StopIteration
+        return data
+
+    def _follow(self):
+        if self._is_regular_file:
+            data = os.read(self._file_descriptor, self._block_size)
+            if not data:
+                position = os.lseek(self._file_descriptor, 0, os.SEEK_CUR)
+                if self._follower.wait_for_file(self._file_descriptor, position) == TRUNCATED:
+                    os.lseek(self._file_descriptor, 0, os.SEEK_SET)
+            return data
+
+        if self._end_of_stream:
+            self._follower.wait()
+            return b''
+        if not self._follower.wait_for_stream(self._file_descriptor):
+            return b''
+        data = os.read(self._file_descriptor, self._block_size)
+        self._end_of_stream = not data
+        return data
+
+
+class DecodingIterator(object):
+    '''
+        Iterates over the iterable, decoding the bytes it returns. Text is returned as it is.
+
+        The bytes are decoded incrementally, so a character that is split over two chunks
+        is returned as a whole with the second chunk.
+    '''
+
+    def __init__(self, iterable, encoding='utf-8', errors='replace'):
+        self._iterator = iter(iterable)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors)
+        self._end_of_input = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._end_of_input:
+            try:
+                data = next(self._iterator)
+            except StopIteration:
+                self._end_of_input = True
+                text = self._decoder.decode(b'', final=True)
+            else:
+                if isinstance(data, str):
+                    return data
+                if not data:
+                    # Returned as well, as inputs that wait for more input return them (see Follower)
+                    return ''
+                text = self._decoder.decode(data)
+
+            # Chunks that only contain part of a character do not return any text
+            if text:
+                return text
+        raise StopIteration
+
+
 class QueueIterator(object):
     ''' 
         Iterates over a queue, until END_OF_INPUT is encountered 
@@ -270,3 +935,72 @@ class QueueIterator(object):
         if text is END_OF_INPUT:
             raise StopIteration
         return text
+
+
+class BatchedQueueIterator(object):
+    '''
+        Iterates over a queue, until END_OF_INPUT is encountered.
+
+        Every iteration blocks until an item is available,
+        and then returns the concatenation of all the text that is waiting in the queue.
+        The waiting items are taken out while holding the queue's lock only once.
+    '''
+
+    def __init__(self, queue):
+        self._queue = queue
+        self._end_of_input = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._end_of_input:
+            raise StopIteration
+
+        text = self._queue.get()
+        if text is END_OF_INPUT:
+            self._end_of_input = True
+            raise StopIteration
+
+        batch = [text]
+        self._end_of_input = _drain_queue(self._queue, batch)
+        # The items are either all text or all bytes
+        return text[:0].join(batch)
+
+
+def _drain_queue(input_queue, batch):
+    '''
+        Moves all items that are waiting in the queue to 'batch', without blocking.
+        Stops at END_OF_INPUT (leaving anything after it in the queue).
+        Returns True if END_OF_INPUT was encountered.
+    '''
+    if not hasattr(input_queue, 'mutex'):
+        return _drain_queue_item_per_item(input_queue, batch)
+
+    # '_qsize' and '_get' are the hooks queue.Queue subclasses override,
+    # so this works for LifoQueue and PriorityQueue too.
+    with input_queue.mutex:
+        end_of_input = False
+        items_taken = 0
+        while input_queue._qsize():
+            item = input_queue._get()
+            items_taken = items_taken + 1
+            if item is END_OF_INPUT:
+                end_of_input = True
+                break
+            batch.append(item)
+
+        if items_taken:
+            input_queue.not_full.notify_all()
+        return end_of_input
+
+
+def _drain_queue_item_per_item(input_queue, batch):
+    while True:
+        try:
+            item = input_queue.get_nowait()
+        except queue.Empty:
+            return False
+        if item is END_OF_INPUT:
+            return True
+        batch.append(item)
@@ -0,0 +1,118 @@
+from .line_segments import split_lines
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import multiprocessing
+import os
+
+
+# Files (or what is left of them) that are smaller than this are searched by the paginator itself,
+# as starting the processes would take longer than the search
+MINIMUM_SIZE = 8 * 1024 * 1024
+# The smallest part of a file that is searched by a single process
+MINIMUM_SHARD_SIZE = 1024 * 1024
+# Number of shards per process, so a process that is slowed down does not hold up the others
+_SHARDS_PER_PROCESS = 4
+
+
+class ParallelSearch(object):
+    '''
+        Searches a memory-mapped file for the k-th line that matches a search (see search_engine.py),
+        using a pool of processes that each count the matches in a part (a shard) of the file.
+
+        Shards start and end at a '\\n', and are decoded and split into lines
+        exactly like the paginator does, so the result is the same as a search line per line.
+
+        The processes are only started by the first search. Call 'close()' to stop them.
+        They are started using 'forkserver' (or 'spawn' where that is not available) rather than 'fork',
+        as the paginator runs other threads (like the LineIndex and the LookAhead) while it searches.
+        So, like for any program that uses these start methods, the main module must be importable
+        without side effects (guard it with "if __name__ == '__main__':").
+    '''
+
+    def __init__(self, path, encoding='utf-8', errors='replace', processes=None):
+        self._path = path
+        self._encoding = encoding
+        self._errors = errors
+        self._processes = processes or os.cpu_count() or 1
+        self._executor = None
+
+    def find_match(self, data, start, compiled_search, match_count):
+        '''
+            Looks for the 'match_count'th line in 'data[start:]' that matches the CompiledSearch.
+            'data' is the content of the file (e.g. an mmap), and 'start' must be the start of a line.
+
+            Returns a (offset, skipped_match_count) tuple,
+            where 'offset' is the start of the line (as split on '\\n') that contains the match,
+            and 'skipped_match_count' is the number of matching lines before it.
+            If there are not enough matching lines, 'offset' is the end of the data.
+        '''
+        shards = list(_split_in_shards(data, start, self._get_shard_size(len(data) - start)))
+        futures = [
+            self._get_executor().submit(
+                _count_matching_lines, self._path, shard_start, shard_end,
+                compiled_search, match_count, self._encoding, self._errors)
+            for shard_start, shard_end in shards
+        ]
+        try:
+            skipped_match_count = 0
+            for (shard_start, shard_end), future in zip(shards, futures):
+                match_count_in_shard = future.result()
+                if skipped_match_count + match_count_in_shard >= match_count:
+                    offset, match_count_before_offset = self._find_match_in_shard(
+                        data[shard_start:shard_end], compiled_search, match_count - skipped_match_count)
+                    return shard_start + offset, skipped_match_count + match_count_before_offset
+                skipped_match_count = skipped_match_count + match_count_in_shard
+            return len(data), skipped_match_count
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._processes, mp_context=_get_process_context())
+        return self._executor
+
+    def _get_shard_size(self, size):
+        return max(MINIMUM_SHARD_SIZE, size // (self._processes * _SHARDS_PER_PROCESS))
+
+    def _find_match_in_shard(self, data, compiled_search, match_count):
+        '''
+            Returns the (offset, skipped_match_count) tuple (see 'find_match')
+            for the shard that contains the 'match_count'th matching line
+        '''
+        lines = split_lines(data.decode(self._encoding, self._errors))
+        matches = list(islice(compiled_search.find_matching_lines(lines), match_count))
+
+        # The decoded text has exactly as many '\n' as the data, and only '\n' ends a line
+        line = matches[-1]
+        offset = len(data) - len(data.split(b'\n', line)[-1])
+        return offset, len(matches) - 1
+
+
+def _get_process_context():
+    # A forked process only gets the thread that forked it, so the locks held by the other threads stay locked
+    start_methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in start_methods else 'spawn')
+
+
+def _split_in_shards(data, start, shard_size):
+    ''' Yields the (start, end) of the parts of 'data[start:]', which all end at a '\\n' '''
+    size = len(data)
+    while start < size:
+        end = data.find(b'\n', min(start + shard_size, size) - 1)
+        end = size if end == -1 else end + 1
+        yield start, end
+        start = end
+
+
+def _count_matching_lines(path, start, end, compiled_search, maximum, encoding, errors):
+    ''' Runs in the search processes. Returns the number of matching lines in the shard (up to 'maximum') '''
+    with open(path, 'rb') as file:
+        file.seek(start)
+        lines = split_lines(file.read(end - start).decode(encoding, errors))
+    return sum(1 for _ in islice(compiled_search.find_matching_lines(lines), maximum))
@@ -26,6 +26,9 @@ class RepeatPlugin(MorePlugin):
         self._last_page = page
         return page
 
+    def transforms_lines(self):
+        return False
+
     def get_help(self):
         yield ('.', 'Repeat previous command')
 
@@ -0,0 +1,269 @@
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, compress, islice
+import re
+
+
+# Characters that have a special meaning in a regular expression
+_REGEX_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+
+# Constructs that can match differently on a line on its own than on that line inside a block of lines
+# (because they look at the start/end of the text or at the surrounding characters).
+# Patterns that contain any of these are matched line per line.
+_NOT_BLOCK_SAFE = ('$', '\\A', '\\Z', '\\b', '\\B', '(?=', '(?!', '(?<')
+
+# Number of characters a LiteralSetMatcher looks at in one go (rounded up to the end of a line)
+_WINDOW_SIZE = 64 * 1024
+
+
+class CompiledSearch(object):
+    '''
+        The objects used to search for a pattern:
+
+        line_matcher:
+            'line_matcher.search(line)' returns a true value if the line contains a match.
+
+        block_matcher:
+            'block_matcher.search(text, position)' returns the first match (an object with a 'start()' method)
+            at or after 'position' in a block of lines, or None if there is no match.
+            Every match must still be verified using the line_matcher, as it could span multiple lines.
+            Is None if the pattern can only be searched line per line.
+    '''
+
+    def __init__(self, line_matcher, block_matcher):
+        self.line_matcher = line_matcher
+        self.block_matcher = block_matcher
+
+    def find_matching_lines(self, lines, start=0):
+        '''
+            Returns an iterator over the index of every line in 'lines[start:]' that matches.
+
+            If possible the block_matcher runs over all the lines joined together,
+            so the lines without a match are never looked at one by one.
+        '''
+        if self.block_matcher is not None:
+            text = ''.join(islice(lines, start, None))
+            if _can_search_block(self.block_matcher, text, len(lines) - start):
+                return self._find_matching_lines_in_block(lines, start, text)
+
+        # Still a lot faster than a python loop over the lines, as the loop runs in C
+        return compress(range(start, len(lines)), map(self.line_matcher.search, islice(lines, start, None)))
+
+    def _find_matching_lines_in_block(self, lines, start, text):
+        line_ends = array('Q', accumulate(map(len, islice(lines, start, None))))
+        position = 0
+        while True:
+            match = self.block_matcher.search(text, position)
+            if match is None:
+                return
+            line = bisect_right(line_ends, match.start())
+            if line == len(line_ends):
+                # An empty match at the very end of the text
+                return
+            # The match could span multiple lines, so the line must match on its own too
+            if self.line_matcher.search(lines[start + line]):
+                yield start + line
+            position = line_ends[line]
+
+
+def compile_search(pattern):
+    '''
+        Returns the CompiledSearch for the regular expression 'pattern'.
+
+        Patterns without any special characters (like request ids or host names) are searched
+        as plain substrings, and alternatives of those (like 'first|second|third')
+        are combined into a single prefix tree (see compile_literals).
+    '''
+    if _is_literal(pattern):
+        return compile_literal(pattern)
+
+    alternatives = pattern.split('|')
+    if all(alternative and _is_literal(alternative) for alternative in alternatives):
+        return compile_literals(alternatives)
+
+    return _compile_regex(pattern)
+
+
+def compile_literal(literal):
+    ''' Returns the CompiledSearch for a plain substring '''
+    matcher = LiteralMatcher(literal)
+    return CompiledSearch(line_matcher=matcher, block_matcher=matcher)
+
+
+def compile_literals(literals):
+    '''
+        Returns the CompiledSearch that matches if any of the plain substrings is found.
+
+        The literals are merged into a prefix tree, which is compiled into one regular expression,
+        so at every position of the text the regular expression engine walks down a single branch of the tree,
+        instead of trying every literal in turn.
+        Blocks of lines are searched using a LiteralSetMatcher, which rules out most of the text
+        using set lookups, and only runs the prefix tree where a literal could be.
+
+        The literals are not searched by an Aho-Corasick automaton, as without a compiled extension
+        that would have to walk over the text one character at a time in python.
+        So many literals are a lot cheaper than a plain alternation of them, but not as cheap as one literal
+        (which is searched using 'str.find'): on the benchmark suite, 500 trace ids cost 6 to 8 times one.
+    '''
+    literals = set(literals)
+    if len(literals) == 1:
+        return compile_literal(literals.pop())
+
+    tree_matcher = re.compile(_prefix_tree_to_regex(_build_prefix_tree(literals)))
+    if any(character.isspace() for literal in literals for character in literal):
+        return CompiledSearch(line_matcher=tree_matcher, block_matcher=tree_matcher)
+    return CompiledSearch(line_matcher=tree_matcher, block_matcher=LiteralSetMatcher(literals, tree_matcher))
+
+
+def _compile_regex(pattern):
+    line_matcher = re.compile(pattern)
+    if any(construct in pattern for construct in _NOT_BLOCK_SAFE):
+        return CompiledSearch(line_matcher=line_matcher, block_matcher=None)
+    return CompiledSearch(line_matcher=line_matcher, block_matcher=re.compile(pattern, re.MULTILINE))
+
+
+def _can_search_block(block_matcher, text, line_count):
+    # In a block, '^' only matches after a '\n', so all lines (except the last) must end in '\n'
+    if '^' not in block_matcher.pattern:
+        return True
+    final_line_break_count = 1 if text.endswith('\n') else 0
+    return text.count('\n') - final_line_break_count == line_count - 1
+
+
+def _is_literal(pattern):
+    return _REGEX_SPECIAL_CHARACTERS.isdisjoint(pattern)
+
+
+class LiteralMatcher(object):
+    '''
+        Searches a plain substring, using the (much faster) string methods instead of a regular expression
+    '''
+
+    def __init__(self, literal):
+        self.pattern = literal
+
+    def search(self, text, position=0):
+        start = text.find(self.pattern, position)
+        if start == -1:
+            return None
+        return _LiteralMatch(start, start + len(self.pattern))
+
+
+class LiteralSetMatcher(object):
+    '''
+        Searches for any of a set of plain substrings (which may not contain white space).
+
+        The text is cut into tokens: the runs of characters that appear in the literals.
+        Every occurrence of a literal lies inside a token, so a block of text can only contain a literal
+        if one of its tokens is a literal (which is a set lookup),
+        or if one of its tokens is longer than the shortest literal (and may contain a literal).
+        Only then the prefix tree searches the block, to confirm the match and find its position.
+
+        The tokens are made by 'str.translate' and 'str.split',
+        so no python code (and no regular expression) looks at the single characters.
+        For literals like request ids or host names, the tokens of the lines without a match
+        are too short, or are a different id, so most of the text never reaches the prefix tree.
+    '''
+
+    def __init__(self, literals, tree_matcher):
+        self.pattern = tree_matcher.pattern
+        self._literals = frozenset(literals)
+        self._tree_matcher = tree_matcher
+        alphabet = frozenset(''.join(self._literals))
+        # Keeps the tokens and replaces everything in between by spaces
+        self._tokens = _TokenTable(alphabet)
+        # Replaces the characters of the tokens by 'x', and everything in between by spaces
+        self._token_marks = _TokenTable(alphabet, 'x')
+        self._long_token_mark = 'x' * (min(map(len, self._literals)) + 1)
+
+    def search(self, text, position=0):
+        text_length = len(text)
+        while position < text_length:
+            # Windows end at a line break, so no token is split over two windows
+            end = text.find('\n', position + _WINDOW_SIZE)
+            end = text_length if end == -1 else end + 1
+            match = self._search_window(text, position, end)
+            if match is not None:
+                return match
+            position = end
+        return None
+
+    def _search_window(self, text, start, end):
+        window = text[start:end]
+        if self._literals.isdisjoint(window.translate(self._tokens).split()):
+            if self._long_token_mark not in window.translate(self._token_marks):
+                return None
+
+        # There could be a match in this window, so now we look for it
+        return self._tree_matcher.search(text, start, end)
+
+
+class _TokenTable(dict):
+    '''
+        The table for 'str.translate' that replaces every character that is not in 'alphabet' by a space,
+        and every character of 'alphabet' by 'replacement' (or keeps it if 'replacement' is None).
+        A character is only added to the table when it is first translated,
+        so the table does not need an entry for every unicode character.
+    '''
+
+    def __init__(self, alphabet, replacement=None):
+        super().__init__()
+        self._alphabet = alphabet
+        self._replacement = replacement
+
+    def __missing__(self, character_code):
+        character = chr(character_code)
+        if character not in self._alphabet:
+            translation = ' '
+        elif self._replacement is not None:
+            translation = self._replacement
+        else:
+            translation = character
+        self[character_code] = translation
+        return translation
+
+
+class _LiteralMatch(object):
+
+    def __init__(self, start, end):
+        self._start = start
+        self._end = end
+
+    def start(self):
+        return self._start
+
+    def end(self):
+        return self._end
+
+
+# Marks the end of a literal in the prefix tree
+_END = ''
+
+
+def _build_prefix_tree(literals):
+    tree = {}
+    for literal in literals:
+        node = tree
+        for character in literal:
+            node = node.setdefault(character, {})
+        node[_END] = None
+    return tree
+
+
+def _prefix_tree_to_regex(node):
+    # Characters shared by all remaining literals are added without recursing,
+    # so long literals do not hit the recursion limit
+    prefix = []
+    while len(node) == 1 and _END not in node:
+        character, node = next(iter(node.items()))
+        prefix.append(re.escape(character))
+
+    if _END in node:
+        # We only need to know if any literal matches, so there is no need to look for longer ones
+        return ''.join(prefix)
+
+    alternatives = [
+        re.escape(character) + _prefix_tree_to_regex(child)
+        for character, child in sorted(node.items())
+    ]
+    return '{}(?:{})'.format(''.join(prefix), '|'.join(alternatives))
@@ -1,26 +1,40 @@
+from .line_segments import has_segments, is_continuation
 from .more_plugin import MorePlugin
 from .page import Page
-from .page_of_height import PageOfHeight
 from .repeatable_mixin import RepeatableMixin
+from .search_engine import compile_literals, compile_search
+from itertools import islice
 import re
+import time
 
 _NO_PREVIOUS_REGULAR_EXPRESSION = '--No previous regular expression--'
 _SKIPPING_MESSAGE = '...skipping\n'
+_CAN_NOT_READ_PATTERN_FILE = '--Can not read search patterns from {}--'
+# The lines are already decoded, so the progress is counted in (millions of) characters rather than bytes
+_PROGRESS_MESSAGE = (
+    '--Searching: {:.1f}M characters scanned, {} matches, {:.1f}M characters/s (press any key to cancel)--')
+
+# Searches that take less time than this (in seconds) do not report progress
+_PROGRESS_DELAY = 1.0
+# Minimum time (in seconds) between two progress reports
+_PROGRESS_INTERVAL = 0.25
 
 
 class SearchPlugin(MorePlugin):
     ''' 
         Skips all output until a certain search pattern is found.
         Invoked when the user types '/'.
+        Invoked when the user types '@', to search for any of the lines in a file (as plain text).
         The search can be repeated by pressing 'n'
     '''
 
     def __init__(self):
         self._pattern = None
+        self._compiled_search = None
         self._match_count = None
 
     def get_keys(self):
-        return ['/', 'n']
+        return ['/', 'n', '@']
 
     def build_page(self, page_builder, key_pressed, arguments):
         self._match_count = arguments.get('count', 1)
@@ -29,17 +43,33 @@ class SearchPlugin(MorePlugin):
             return self._do_new_search(page_builder)
         elif key_pressed == 'n':
             return self._repeat_last_search(page_builder)
+        elif key_pressed == '@':
+            return self._do_new_search_from_file(page_builder)
         else:
             assert False, 'Unexpected input key'
 
     def get_help(self):
         yield ('/<regular expression>', 'Search for kth occurrence of the regular expression [1]')
+        yield ('@<file>', 'Search for kth occurrence of any of the lines in file [1]')
         yield ('n', 'Search for kth occurrence of the last regular expression [1]')
 
     def _do_new_search(self, page_builder):
         self._update_pattern(page_builder.get_input())
         return self._create_search_page(page_builder)
 
+    def _do_new_search_from_file(self, page_builder):
+        path = page_builder.get_input().prompt('@')
+        try:
+            literals = _read_search_patterns(path)
+        except OSError:
+            literals = []
+        if not literals:
+            return page_builder.build_next_page(message=_CAN_NOT_READ_PATTERN_FILE.format(path))
+
+        self._pattern = '|'.join(map(re.escape, literals))
+        self._compiled_search = compile_literals(literals)
+        return self._create_search_page(page_builder)
+
     def _repeat_last_search(self, page_builder):
         if self._pattern is None:
             return page_builder.build_next_page(message=_NO_PREVIOUS_REGULAR_EXPRESSION)
@@ -48,56 +78,227 @@ class SearchPlugin(MorePlugin):
 
     def _create_search_page(self, page_builder):
         page_builder.get_output().write(_SKIPPING_MESSAGE)
+        look_ahead = page_builder.get_look_ahead()
+        if look_ahead is not None:
+            # Make sure the next match is already read when the user repeats the search with 'n'
+            look_ahead.look_for(self._compiled_search)
         return SearchPage(
             pattern=self._pattern,
             next_page=self._create_full_page(page_builder),
             match_count=self._match_count,
+            compiled_search=self._compiled_search,
+            input=page_builder.get_input(),
         )
 
     def _create_full_page(self, page_builder):
-        return PageOfHeight(
-            height=page_builder.get_page_height(),
-            output=page_builder.get_output())
+        return page_builder.create_page(page_builder.get_page_height())
 
     def _update_pattern(self, input):
         self._pattern = input.prompt('/')
+        self._compiled_search = compile_search(self._pattern)
 
 
 class SearchPage(Page, RepeatableMixin):
     '''
         A page that suppresses all output until a given search pattern is found.
         After that it displays the passed in page
+
+        The lines before the match are skipped in 'skip_lines',
+        which runs the regular expression over the whole block of lines at once,
+        so the lines that are skipped never reach 'add_line'.
+        Pages that wrap this one and change the lines (like the line numbers) skip every line here
+        before they change it, so the search always sees the lines as they are in the input.
+
+        If the 'compiled_search' (see search_engine.py) is not given, it is compiled from the pattern.
+
+        If an 'input' is given, a search that takes a while reports its progress through
+        'input.poll_character', and pressing any key cancels the search.
+        A cancelled search page is full, so the user is prompted again
+        (and the input continues after the text that was already searched).
+
+        Lines that were split in segments (see line_segments.py) are searched segment per segment,
+        together with the segment before, so matches that cross the split are found too.
+        A line counts as one match, however many of its segments match.
     '''
 
-    def __init__(self, pattern, next_page, match_count):
+    def __init__(self, pattern, next_page, match_count, compiled_search=None, input=None):
         self.pattern = pattern
         self.next_page = next_page
-        self._matcher = re.compile(pattern)
+        self._compiled_search = compiled_search or compile_search(pattern)
+        self._matcher = self._compiled_search.line_matcher
+        self._input = input
+        self._progress = _SearchProgress(input) if input is not None else None
+        self.is_cancelled = False
         self._actual_match_count = 0
         self.required_match_count = match_count
+        # The number of lines that were not displayed because they came before the match
+        self.skipped_line_count = 0
+        # The last line that was matched, and whether it matched
+        self._previous_line = None
+        self._previous_line_matches = False
 
     def is_full(self):
         if self.has_match:
             return self.next_page.is_full()
-        return False
+        return self.is_cancelled
 
     def add_line(self, line):
-        self._match(line)
+        if self._actual_match_count < self.required_match_count:
+            # The line that completes the search is already counted if 'skip_lines' found it
+            self._match(line)
 
         if self.has_match:
             self.next_page.add_line(line)
+        else:
+            self.skipped_line_count = self.skipped_line_count + 1
+
+    def add_lines(self, lines, start):
+        line_count = len(lines)
+        while not self.has_match and start < line_count and not self.is_cancelled:
+            self.add_line(lines[start])
+            start = start + 1
+        if self.has_match:
+            return self.next_page.add_lines(lines, start)
+        return start
 
     def _match(self, line):
-        if self._matcher.search(line):
+        previous_line = self._previous_line
+        self._previous_line = line
+        if is_continuation(line) and previous_line is not None:
+            if self._previous_line_matches:
+                # The line was already counted
+                return
+            # Drops the '\n' that was added at the end of the previous segment
+            line = previous_line[:-1] + line
+
+        self._previous_line_matches = bool(self._matcher.search(line))
+        if self._previous_line_matches:
             self._actual_match_count = self._actual_match_count + 1
 
+    def skip_lines(self, lines, start):
+        if self.has_match:
+            return self.next_page.skip_lines(lines, start)
+        if self.is_cancelled or start == len(lines):
+            return start
+
+        skipped_match_count = getattr(lines, 'skipped_match_count', None)
+        if skipped_match_count is not None:
+            # The input already skipped these lines for us (see 'get_pending_search')
+            self._actual_match_count = self._actual_match_count + skipped_match_count
+            self.skipped_line_count = self.skipped_line_count + (len(lines) - start)
+            self._previous_line = None
+            return len(lines)
+
+        if has_segments(lines) or is_continuation(lines[start]):
+            end = self._match_lines(lines, start)
+        else:
+            end = self._find_match(lines, start)
+
+        self.skipped_line_count = self.skipped_line_count + (end - start)
+        if self._progress is not None:
+            self._report_progress(lines, start, end)
+        return end
+
+    def _find_match(self, lines, start):
+        '''
+            Searches the lines as a block.
+            Returns the index of the line that completes the search (which is counted, but not skipped),
+            or the number of lines if the search did not complete.
+        '''
+        remaining_match_count = self.required_match_count - self._actual_match_count
+        matches = list(islice(self._compiled_search.find_matching_lines(lines, start), remaining_match_count))
+        self._actual_match_count = self._actual_match_count + len(matches)
+        if self.has_match:
+            return matches[-1]
+
+        # The next line could be a segment that continues the last line
+        self._previous_line = lines[-1]
+        self._previous_line_matches = bool(matches) and matches[-1] == len(lines) - 1
+        return len(lines)
+
+    def _match_lines(self, lines, start):
+        ''' Like '_find_match', but matches the lines one by one, keeping track of the segments '''
+        line_count = len(lines)
+        while start < line_count:
+            self._match(lines[start])
+            if self.has_match:
+                return start
+            start = start + 1
+        return start
+
+    def get_pending_search(self):
+        if self.has_match:
+            return self.next_page.get_pending_search()
+        if self.is_cancelled:
+            return None
+        return (self._compiled_search, self.required_match_count - self._actual_match_count)
+
+    def prompts_when_full(self):
+        if self.has_match:
+            return self.next_page.prompts_when_full()
+        # A cancelled search returns to the prompt
+        return self.is_cancelled
+
+    def _report_progress(self, lines, start, end):
+        if end < len(lines):
+            # The match is found
+            self._progress.finish()
+        elif self._progress.add_scanned_lines(lines, start, end, self._actual_match_count):
+            self.is_cancelled = True
+            self._progress.finish()
+
     def flush(self):
+        if self._progress is not None:
+            self._progress.finish()
         if self.has_match:
             self.next_page.flush()
 
+    def end_batch(self):
+        if self.has_match:
+            self.next_page.end_batch()
+
     def repeat(self):
-        return SearchPage(self.pattern, self.next_page.repeat(), self.required_match_count)
+        return SearchPage(
+            self.pattern, self.next_page.repeat(), self.required_match_count, self._compiled_search, self._input)
 
     @property
     def has_match(self):
         return self._actual_match_count >= self.required_match_count
+
+
+class _SearchProgress(object):
+    '''
+        Reports the progress of a search, at most every _PROGRESS_INTERVAL seconds.
+        The time is only checked once per block of lines, so this adds no work per line.
+    '''
+
+    def __init__(self, input):
+        self._input = input
+        self._start_time = time.monotonic()
+        self._next_report_time = self._start_time + _PROGRESS_DELAY
+        self._is_shown = False
+        self.scanned_characters = 0
+
+    def add_scanned_lines(self, lines, start, end, match_count):
+        ''' Returns True if the user cancelled the search '''
+        self.scanned_characters = self.scanned_characters + sum(map(len, islice(lines, start, end)))
+        now = time.monotonic()
+        if now < self._next_report_time:
+            return False
+
+        self._next_report_time = now + _PROGRESS_INTERVAL
+        self._is_shown = True
+        million_characters = self.scanned_characters / 1000000
+        rate = million_characters / max(now - self._start_time, 1e-9)
+        return self._input.poll_character(_PROGRESS_MESSAGE.format(million_characters, match_count, rate)) is not None
+
+    def finish(self):
+        if self._is_shown:
+            self._input.clear_message()
+            self._is_shown = False
+
+
+def _read_search_patterns(path):
+    ''' Returns the non-empty lines of the file '''
+    with open(path) as file:
+        return [line for line in file.read().splitlines() if line]
@@ -16,9 +16,17 @@ class TerminalInput(Input):
     '''
 
     def __init__(self):
-        self._terminal = self._create_terminal()
+        self._terminal_instance = None
         self._output = sys.stdout
 
+    @property
+    def _terminal(self):
+        # Only open the terminal when we actually prompt the user,
+        # as there might not be a terminal if we never have to prompt.
+        if self._terminal_instance is None:
+            self._terminal_instance = self._create_terminal()
+        return self._terminal_instance
+
     def prompt(self, message):
         self._print_prompt(message)
         return self._terminal.read_line().rstrip('\r\n')
@@ -30,6 +38,14 @@ class TerminalInput(Input):
         finally:
             self._erase_input_prompt()
 
+    def poll_character(self, message):
+        self._erase_input_prompt()
+        self._print_prompt(message)
+        return self._terminal.poll_character()
+
+    def clear_message(self):
+        self._erase_input_prompt()
+
     def _print_prompt(self, message):
         print(message, end='', file=self._output, flush=True)
 
@@ -64,6 +80,22 @@ class _LinuxTerminal(object):
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
 
+    def poll_character(self):
+        ''' Returns the character the user typed, or None if nothing was typed '''
+        import select
+        import termios
+        import tty
+        fd = self._input.fileno()
+        old_settings = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            readable, _, _ = select.select([fd], [], [], 0)
+            if not readable:
+                return None
+            return os.read(fd, 1).decode('utf-8')
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
     def clear_line(self, output):
         output.write(ERASE_LINE)
 
@@ -112,6 +144,12 @@ class _WindowsTerminal(object):
             raise KeyboardInterrupt
         return result
 
+    def poll_character(self):
+        import msvcrt
+        if not msvcrt.kbhit():
+            return None
+        return self.read_character()
+
     def clear_line(self, output):
         # There is no clean way to clear the last output line,
         # So we simply
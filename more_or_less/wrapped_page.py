@@ -2,6 +2,10 @@ from .page import Page
 from abc import ABC, abstractmethod
 
 
+# Number of skipped lines passed to 'on_add_line' per slice of the lines
+_SKIPPED_LINES_PER_SLICE = 4096
+
+
 class WrappedPage(Page, ABC):
     '''
         Basic class that can be derived from if you need to
@@ -24,10 +28,58 @@ class WrappedPage(Page, ABC):
     def flush(self):
         return self.wrapped_page.flush()
 
+    def end_batch(self):
+        return self.wrapped_page.end_batch()
+
+    def skip_lines(self, lines, start):
+        end = self.wrapped_page.skip_lines(lines, start)
+        if end > start:
+            self.on_skip_lines(lines, start, end)
+        return end
+
+    def hide_lines(self, lines, start, end):
+        self.wrapped_page.hide_lines(lines, start, end)
+        self.on_skip_lines(lines, start, end)
+
+    def get_pending_search(self):
+        return self.wrapped_page.get_pending_search()
+
+    def get_pending_jump(self):
+        return self.wrapped_page.get_pending_jump()
+
+    def end_jump(self, line):
+        self.wrapped_page.end_jump(line)
+        self.on_jump(line)
+
+    def prompts_when_full(self):
+        return self.wrapped_page.prompts_when_full()
+
     @abstractmethod
     def on_add_line(self, line):
         ''' Called with every line. Returns the modified version of the line '''
         pass
 
+    def on_skip_lines(self, lines, start, end):
+        '''
+            Called with the lines 'lines[start:end]' that the wrapped page skipped,
+            or that a page wrapping us hides (see 'hide_lines'), which means they are not displayed.
+            By default they are passed to 'on_add_line', so you only need to override this
+            if you can handle them faster.
+            Do override it if you do not need their text (like the line numbers, which only count them):
+            the lines skipped by a search in a MappedFile are only read from the file when they are accessed
+            (see SkippedLines), and a search can skip millions of them.
+        '''
+        # Taken in slices, so lines that are read on demand are read in blocks
+        for block_start in range(start, end, _SKIPPED_LINES_PER_SLICE):
+            for line in lines[block_start:min(block_start + _SKIPPED_LINES_PER_SLICE, end)]:
+                self.on_add_line(line)
+
+    def on_jump(self, line):
+        '''
+            Called when the input jumped to 'line' (counting from 0),
+            so the next line that is added is line 'line' of the input.
+        '''
+        pass
+
     def __getattr__(self, name):
         return getattr(self.wrapped_page, name)
@@ -0,0 +1,173 @@
+from more_or_less import (
+    OUTPUT_STOPPED, END_OF_INPUT, AsyncPaginator, FixedSizeScreen, Input, LineIndex, MorePageBuilder)
+from more_or_less.count_plugin import CountPlugin
+from more_or_less.goto_plugin import GotoPlugin
+from more_or_less.mapped_file import MappedFile
+from more_or_less.quit_plugin import QuitPlugin
+from more_or_less.search_plugin import SearchPlugin
+from tests.test_paginator import FirstPage, NextPage, PageBuilderMock, StopOutputPageBuilder
+from unittest.mock import Mock, patch
+import asyncio
+import io
+import more_or_less
+import os
+import tempfile
+import threading
+import unittest
+
+
+_big_page = 1000
+
+
+class TestAsyncPaginate(unittest.TestCase):
+
+    def setUp(self):
+        self._page_builder = None
+
+    def paginate(self, input, page_builder=None, page_height=_big_page):
+        self._page_builder = page_builder or PageBuilderMock(page_height)
+
+        return asyncio.run(more_or_less.apaginate(input, page_builder=self._page_builder))
+
+    @property
+    def output(self):
+        return self._page_builder.pages
+
+    def test_can_read_input_from_an_iterable(self):
+        self.paginate(['first \n', 'second \n'])
+
+        self.assertEqual([FirstPage(['first \n', 'second \n'])], self.output)
+
+    def test_can_read_input_from_an_async_iterable(self):
+        async def lines():
+            yield 'first \n'
+            yield 'second \n'
+
+        self.paginate(lines())
+
+        self.assertEqual([FirstPage(['first \n', 'second \n'])], self.output)
+
+    def test_can_read_input_from_an_asyncio_queue(self):
+        async def paginate_queue():
+            queue = asyncio.Queue()
+            for text in ['first \n', 'second ', 'line \n', END_OF_INPUT]:
+                queue.put_nowait(text)
+            return await more_or_less.apaginate(queue, page_builder=self._page_builder)
+
+        self._page_builder = PageBuilderMock(_big_page)
+        asyncio.run(paginate_queue())
+
+        self.assertEqual([FirstPage(['first \n', 'second line \n'])], self.output)
+
+    def test_starts_new_page_if_first_is_full(self):
+        self.paginate(['first \n', 'second \n', 'third \n'], page_height=2)
+
+        self.assertEqual(
+            [
+                FirstPage(['first \n', 'second \n']),
+                NextPage(['third \n']),
+            ],
+            self.output
+        )
+
+    def test_flushes_final_incomplete_line(self):
+        self.paginate(['this line is incomplete '])
+
+        self.assertEqual([FirstPage(['this line is incomplete '])], self.output)
+
+    def test_returns_OUTPUT_STOPPED_when_page_builder_raises_StopOutput(self):
+        result = self.paginate(
+            ['first \n', 'second \n', 'after the abort \n'],
+            page_builder=StopOutputPageBuilder(page_height=2),
+        )
+
+        self.assertEqual(OUTPUT_STOPPED, result)
+
+    def test_does_not_block_the_event_loop_while_waiting_for_the_user(self):
+        page_builder = BlockingPageBuilder(page_height=1)
+
+        async def paginate_and_answer_prompt():
+            pagination = asyncio.ensure_future(
+                more_or_less.apaginate(['first \n', 'second \n'], page_builder=page_builder))
+            # The event loop keeps running while the paginator waits at the prompt
+            while not page_builder.is_prompting.is_set():
+                await asyncio.sleep(0.01)
+            page_builder.user_pressed_key.set()
+            await pagination
+
+        asyncio.run(asyncio.wait_for(paginate_and_answer_prompt(), timeout=5))
+
+        self.assertEqual(
+            [
+                FirstPage(['first \n']),
+                NextPage(['second \n']),
+            ],
+            page_builder.pages
+        )
+
+
+class TestAsyncPaginator(unittest.TestCase):
+
+    def test_add_text_paginates_complete_lines(self):
+        page_builder = PageBuilderMock(page_height=_big_page)
+
+        async def add_text():
+            paginator = AsyncPaginator(page_builder)
+            await paginator.add_text('first \nincomplete')
+            await paginator.flush_incomplete_line()
+
+        asyncio.run(add_text())
+
+        self.assertEqual([FirstPage(['first \n', 'incomplete'])], page_builder.pages)
+
+
+class TestAsyncPaginatorWithPlugins(unittest.TestCase):
+
+    def setUp(self):
+        self.input = Mock(Input)
+        self.output = io.StringIO()
+
+    def paginate(self, input, keys, line_index=None, plugins=()):
+        self.input.get_character.side_effect = list(keys) + ['q']
+        page_builder = MorePageBuilder(
+            input=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=4),
+            plugins=list(plugins) + [CountPlugin(), QuitPlugin()],
+            line_index=line_index)
+        return asyncio.run(more_or_less.apaginate(input, page_builder=page_builder))
+
+    def test_jumps_in_inputs_that_can_jump(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'input.txt')
+        with open(path, 'w') as file:
+            file.write(''.join(f'line {i}\n' for i in range(100)))
+        line_index = LineIndex()
+
+        with MappedFile(path, line_index=line_index) as mapped_file:
+            self.paginate(mapped_file, '50g', line_index=line_index, plugins=[GotoPlugin()])
+
+        self.assertEqual('line 0\nline 1\nline 2\nline 49\nline 50\nline 51\n', self.output.getvalue())
+
+    @patch('more_or_less.search_plugin._PROGRESS_DELAY', 0)
+    def test_prompts_when_a_search_is_cancelled(self):
+        self.input.prompt.return_value = 'needle'
+        self.input.poll_character.return_value = 'x'
+
+        self.paginate(['first\n' * 3, 'hay\n' * 5], '/', plugins=[SearchPlugin()])
+
+        self.assertEqual(2, self.input.get_character.call_count)
+
+
+class BlockingPageBuilder(PageBuilderMock):
+
+    def __init__(self, page_height):
+        super().__init__(page_height)
+        self.is_prompting = threading.Event()
+        self.user_pressed_key = threading.Event()
+
+    def build_next_page(self):
+        self.is_prompting.set()
+        self.user_pressed_key.wait(timeout=5)
+        return super().build_next_page()
@@ -0,0 +1,163 @@
+from more_or_less import FixedSizeScreen, History, Input, MorePageBuilder
+from more_or_less.back_plugin import BackPlugin
+from more_or_less.count_plugin import CountPlugin
+from more_or_less.history import RecordingOutput
+from more_or_less.one_page_plugin import OnePagePlugin
+from unittest.mock import Mock, patch
+import io
+import unittest
+
+
+def _lines(start, end):
+    return ''.join(f'line {i}\n' for i in range(start, end))
+
+
+@patch('more_or_less.history._BLOCK_SIZE', 64)
+class TestHistory(unittest.TestCase):
+
+    def test_returns_the_recorded_lines(self):
+        history = History()
+        history.record('first\nsec')
+        history.record('ond\nincomplete')
+
+        self.assertEqual(2, history.line_count)
+        self.assertEqual('first\nsecond\n', history.get_lines(0, 2))
+        self.assertEqual('second\n', history.get_lines(1, 2))
+
+    def test_returns_lines_spread_over_many_blocks(self):
+        history = History()
+        for i in range(100):
+            history.record(_lines(i, i + 1))
+
+        self.assertEqual(_lines(0, 100), history.get_lines(0, 100))
+        self.assertEqual(_lines(37, 81), history.get_lines(37, 81))
+
+    def test_writes_old_blocks_to_a_file_beyond_the_memory_budget(self):
+        history = History(memory_budget=200)
+        for i in range(1000):
+            history.record(_lines(i, i + 1))
+
+        self.assertLessEqual(history._memory_size, 200)
+        self.assertEqual(_lines(0, 10), history.get_lines(0, 10))
+        self.assertEqual(_lines(495, 505), history.get_lines(495, 505))
+        self.assertEqual(_lines(990, 1000), history.get_lines(990, 1000))
+        history.close()
+
+    def test_keeps_non_ascii_text_that_is_written_to_the_file(self):
+        history = History(memory_budget=0)
+        text = ''.join(f'日本語 {i} \udcff\n' for i in range(100))
+        history.record(text)
+        history.record('last\n')
+
+        self.assertEqual(text, history.get_lines(0, 100))
+        history.close()
+
+    def test_clips_the_lines_to_the_history(self):
+        history = History()
+        history.record(_lines(0, 3))
+
+        self.assertEqual(_lines(0, 3), history.get_lines(-5, 10))
+        self.assertEqual('', history.get_lines(3, 10))
+
+    def test_does_not_record_replayed_lines(self):
+        history = History()
+        output = io.StringIO()
+        recording_output = RecordingOutput(output, history)
+        recording_output.write(_lines(0, 3))
+
+        history.replay(1, 3, recording_output)
+
+        self.assertEqual(_lines(0, 3) + _lines(1, 3), output.getvalue())
+        self.assertEqual(3, history.line_count)
+
+
+class TestBackPlugin(unittest.TestCase):
+
+    def setUp(self):
+        self.input = Mock(Input)
+        self.output = io.StringIO()
+        self.history = History()
+        self.builder = MorePageBuilder(
+            input=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=4),
+            plugins=[BackPlugin(), CountPlugin(), OnePagePlugin()],
+            history=self.history)
+
+    def display_pages(self, page_count):
+        page = self.builder.build_first_page()
+        for page_number in range(page_count):
+            if page_number > 0:
+                self.input.get_character.side_effect = [' ']
+                page = self.builder.build_next_page()
+            page.add_lines([f'line {i}\n' for i in range(page_number * 3, page_number * 3 + 3)], 0)
+            page.flush()
+
+    def press(self, keys):
+        self.input.get_character.side_effect = list(keys)
+        self.output.seek(0)
+        self.output.truncate()
+        return self.builder.build_next_page()
+
+    def test_records_the_output(self):
+        self.display_pages(2)
+
+        self.assertEqual(6, self.history.line_count)
+
+    def test_displays_the_previous_page(self):
+        self.display_pages(3)
+
+        self.press('b ')
+
+        self.assertEqual(_lines(3, 6), self.output.getvalue())
+
+    def test_pressing_b_again_goes_further_back(self):
+        self.display_pages(3)
+        self.press('b ')
+
+        self.press('b ')
+
+        self.assertEqual(_lines(0, 3), self.output.getvalue())
+
+    def test_goes_back_k_pages(self):
+        self.display_pages(4)
+
+        self.press('2b ')
+
+        self.assertEqual(_lines(3, 6), self.output.getvalue())
+
+    def test_stops_at_the_start_of_the_history(self):
+        self.display_pages(2)
+        self.press('b ')
+
+        self.press('b ')
+
+        self.assertEqual('', self.output.getvalue())
+        self.input.get_character.assert_called_with('--Start of the history--')
+
+    def test_starts_from_the_end_again_after_new_output(self):
+        self.display_pages(3)
+        self.press('b ')
+        page = self.press('b ')
+        page.add_lines([f'line {i}\n' for i in range(9, 12)], 0)
+        page.flush()
+
+        self.press('b ')
+
+        self.assertEqual(_lines(6, 9), self.output.getvalue())
+
+    def test_shows_a_message_without_history(self):
+        builder = MorePageBuilder(
+            input=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=4),
+            plugins=[BackPlugin(), OnePagePlugin()])
+        self.input.get_character.side_effect = ['b', ' ']
+
+        builder.build_next_page()
+
+        self.input.get_character.assert_called_with('--There is no history to go back to--')
+
+
+if __name__ == '__main__':
+    unittest.main()
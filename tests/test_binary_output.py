@@ -0,0 +1,44 @@
+from more_or_less import BinaryOutput
+from unittest.mock import patch
+import io
+import unittest
+
+
+class TestBinaryOutput(unittest.TestCase):
+
+    def test_encodes_text(self):
+        stream = io.BytesIO()
+
+        BinaryOutput(stream, encoding='latin-1').write('café\n')
+
+        self.assertEqual('café\n'.encode('latin-1'), stream.getvalue())
+
+    def test_writes_bytes_as_they_are(self):
+        stream = io.BytesIO()
+
+        BinaryOutput(stream).write(b'\xff\n')
+
+        self.assertEqual(b'\xff\n', stream.getvalue())
+
+    def test_writes_to_stdout_after_its_pending_text(self):
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+
+        with patch('sys.stdout', stdout):
+            output = BinaryOutput()
+            stdout.write('--More--')
+            output.write('next page\n')
+
+        self.assertEqual(b'--More--next page\n', stdout.buffer.getvalue())
+
+    def test_uses_the_encoding_of_stdout(self):
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='latin-1', errors='strict')
+
+        with patch('sys.stdout', stdout):
+            output = BinaryOutput()
+
+        self.assertEqual('latin-1', output.encoding)
+        self.assertEqual('strict', output.errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+from more_or_less import FixedSizeScreen, History, Input, MorePageBuilder
+from more_or_less.chop_plugin import ChopPlugin
+from more_or_less.chopped_page import ChoppedPage, ColumnWindow
+from more_or_less.count_plugin import CountPlugin
+from more_or_less.display_width import chop_line
+from more_or_less.one_page_plugin import OnePagePlugin
+from more_or_less.search_plugin import SearchPlugin
+from tests.test_more_page_builder import _skip_page_wrappers
+from unittest.mock import Mock
+import io
+import unittest
+
+
+class TestChopLine(unittest.TestCase):
+
+    def test_returns_the_visible_columns(self):
+        self.assertEqual('cdef\n', chop_line('abcdefghij\n', 2, 4))
+
+    def test_returns_an_empty_line_if_the_line_ends_before_the_window(self):
+        self.assertEqual('\n', chop_line('abc\n', 5, 4))
+
+    def test_keeps_lines_without_line_ending_unterminated(self):
+        self.assertEqual('xxx', chop_line('x' * 10, 0, 3))
+
+    def test_replaces_wide_characters_on_the_left_edge_by_spaces(self):
+        self.assertEqual(' 本\n', chop_line('日本語x\n', 1, 4))
+
+    def test_expands_tabs(self):
+        self.assertEqual('a       b\n', chop_line('a\tb\n', 0, 10))
+        self.assertEqual('  b\n', chop_line('a\tb\n', 6, 10))
+
+    def test_escape_sequences_take_no_room(self):
+        self.assertEqual('bcd\n', chop_line('\x1b[31mabcdef\x1b[0m\n', 1, 3))
+        self.assertEqual('\x1b[31mab\n', chop_line('\x1b[31mabcdef\x1b[0m\n', 0, 2))
+
+    def test_only_looks_at_the_start_of_huge_lines(self):
+        self.assertEqual('日本\n', chop_line('日本' + 'x' * 10_000_000 + '\x00\n', 0, 4))
+
+
+class TestChoppedPage(unittest.TestCase):
+
+    def setUp(self):
+        self.output = io.StringIO()
+        self.window = ColumnWindow(width=4)
+
+    def test_writes_the_visible_columns_of_every_line(self):
+        page = ChoppedPage(height=3, output=self.output, window=self.window)
+
+        page.add_line('first line\n')
+        index = page.add_lines(['second line\n', 'third line\n', 'fourth line\n'], 0)
+
+        self.assertEqual(2, index)
+        self.assertTrue(page.is_full())
+        self.assertEqual('firs\nseco\nthir\n', self.output.getvalue())
+
+    def test_redisplays_its_lines_at_the_new_columns(self):
+        page = ChoppedPage(height=2, output=self.output, window=self.window)
+        page.add_lines(['first line\n', 'second line\n'], 0)
+
+        self.window.scroll(3)
+        page.redisplay()
+
+        self.assertEqual('firs\nseco\nst l\nond \n', self.output.getvalue())
+
+    def test_the_window_does_not_scroll_before_the_first_column(self):
+        self.window.scroll(-3)
+
+        self.assertEqual(0, self.window.offset)
+
+
+class TestChopPlugin(unittest.TestCase):
+
+    def setUp(self):
+        self.input = Mock(Input)
+        self.output = io.StringIO()
+        self.plugin = ChopPlugin()
+
+    def get_more_page_builder(self, screen_dimensions=None):
+        return MorePageBuilder(
+            input=self.input,
+            output=self.output,
+            screen_dimensions=screen_dimensions or FixedSizeScreen(height=3, width=4),
+            plugins=[self.plugin, CountPlugin(), OnePagePlugin(), SearchPlugin()])
+
+    def build_next_page(self, builder, keys):
+        self.input.get_character.side_effect = list(keys)
+        self.input.prompt.return_value = 'second'
+        return _skip_page_wrappers(builder.build_next_page())
+
+    def test_chops_lines_after_pressing_S(self):
+        builder = self.get_more_page_builder()
+
+        page = self.build_next_page(builder, 'S ')
+        page.add_line('first line\n')
+        page.flush()
+
+        self.assertIsInstance(page, ChoppedPage)
+        self.assertEqual('firs\n', self.output.getvalue())
+        self.input.get_character.assert_called_with('--Chopping long lines is now enabled--')
+
+    def test_wraps_lines_again_after_pressing_S_again(self):
+        builder = self.get_more_page_builder()
+        self.build_next_page(builder, 'S ')
+
+        page = self.build_next_page(builder, 'S ')
+
+        self.assertNotIsInstance(page, ChoppedPage)
+        self.assertFalse(self.plugin.chopping_enabled)
+
+    def test_can_not_chop_lines_if_the_screen_width_is_unknown(self):
+        builder = self.get_more_page_builder(FixedSizeScreen(height=3))
+
+        page = self.build_next_page(builder, 'S ')
+
+        self.assertNotIsInstance(page, ChoppedPage)
+        self.assertFalse(self.plugin.chopping_enabled)
+
+    def test_scrolling_redisplays_the_current_page(self):
+        builder = self.get_more_page_builder()
+        page = self.build_next_page(builder, 'S ')
+        page.add_lines(['first line\n', 'second line\n'], 0)
+
+        page = self.build_next_page(builder, '> ')
+        page.add_line('third line\n')
+        page.flush()
+
+        self.assertEqual('firs\nseco\nrst \ncond\nird \n', self.output.getvalue())
+        self.input.get_character.assert_called_with('--Column 3--')
+
+    def test_does_not_record_the_redisplayed_page_in_the_history(self):
+        history = History()
+        builder = MorePageBuilder(
+            input=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=3, width=4),
+            plugins=[self.plugin, CountPlugin(), OnePagePlugin()],
+            history=history)
+        page = self.build_next_page(builder, 'S ')
+        page.add_lines(['first line\n', 'second line\n'], 0)
+
+        self.build_next_page(builder, '>>> ')
+
+        self.assertEqual(2, history.line_count)
+        self.assertEqual('firs\nseco\n', history.get_lines(0, 2))
+
+    def test_scrolls_k_columns(self):
+        builder = self.get_more_page_builder()
+        self.build_next_page(builder, 'S ')
+
+        self.build_next_page(builder, '5> ')
+
+        self.assertEqual(5, builder.get_column_window().offset)
+
+    def test_scrolling_without_chopping_only_shows_a_message(self):
+        builder = self.get_more_page_builder()
+
+        self.build_next_page(builder, '> ')
+
+        self.assertEqual('', self.output.getvalue())
+
+    def test_searches_the_complete_lines(self):
+        builder = self.get_more_page_builder()
+        self.build_next_page(builder, 'S ')
+
+        self.input.get_character.side_effect = ['/']
+        page = builder.build_next_page()
+        page.add_lines(['first line\n', 'the second line\n'], 0)
+        page.flush()
+
+        self.assertEqual('...skipping\nthe \n', self.output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+from more_or_less import paginate, paginate_file
+from more_or_less.binary_output import BinaryOutput
+from more_or_less.decompression import BZIP2, GZIP, XZ, DecompressingIterator, decompress, detect_compression
+import bz2
+import gzip
+import io
+import lzma
+import os
+import tempfile
+import threading
+import unittest
+
+
+_TEXT = ''.join('line {}\n'.format(i) for i in range(5000)).encode()
+
+
+def _split(data, size):
+    return [data[index:index + size] for index in range(0, len(data), size)]
+
+
+class TestDetectCompression(unittest.TestCase):
+
+    def test_detects_the_magic_bytes(self):
+        self.assertEqual(GZIP, detect_compression(gzip.compress(b'text')))
+        self.assertEqual(BZIP2, detect_compression(bz2.compress(b'text')))
+        self.assertEqual(XZ, detect_compression(lzma.compress(b'text')))
+
+    def test_returns_none_for_uncompressed_data(self):
+        self.assertIsNone(detect_compression(b'plain text\n'))
+        self.assertIsNone(detect_compression(b''))
+
+    def test_returns_none_for_text_that_starts_like_a_signature(self):
+        self.assertIsNone(detect_compression(b'BZh is not bzip2\n'))
+        self.assertIsNone(detect_compression(b'BZh91 is not bzip2 either\n'))
+        self.assertIsNone(detect_compression(b'\x1f\x8b is not gzip\n'))
+
+    def test_detects_empty_bzip2_streams(self):
+        self.assertEqual(BZIP2, detect_compression(bz2.compress(b'')))
+
+
+class TestDecompress(unittest.TestCase):
+
+    def test_decompresses_all_formats(self):
+        for compress in (gzip.compress, bz2.compress, lzma.compress):
+            with self.subTest(compress=compress.__module__):
+                self.assertEqual(_TEXT, b''.join(decompress(_split(compress(_TEXT), 100))))
+
+    def test_detects_magic_bytes_that_are_split_over_chunks(self):
+        compressed = lzma.compress(_TEXT)
+
+        self.assertEqual(_TEXT, b''.join(decompress([compressed[:1], compressed[1:3], compressed[3:]])))
+
+    def test_returns_uncompressed_input_as_it_is(self):
+        chunks = [b'\x1f', b'not compressed\n', b'at all\n']
+
+        self.assertEqual(chunks, list(decompress(chunks)))
+
+    def test_returns_bytes_that_start_like_a_signature_as_they_are(self):
+        chunks = [b'BZh is not bzip2\n', b'second line\n']
+
+        self.assertEqual(chunks, list(decompress(chunks)))
+
+    def test_returns_text_as_it_is(self):
+        self.assertEqual(['\x1f\x8b', 'text\n'], list(decompress(['\x1f\x8b', 'text\n'])))
+
+    def test_decompresses_concatenated_streams(self):
+        compressed = gzip.compress(b'first\n') + gzip.compress(b'second\n') + b'\0' * 8
+
+        self.assertEqual(b'first\nsecond\n', b''.join(decompress([compressed])))
+
+    def test_returns_blocks_of_at_most_the_block_size(self):
+        blocks = list(decompress([gzip.compress(_TEXT)], block_size=1000))
+
+        self.assertEqual(_TEXT, b''.join(blocks))
+        self.assertEqual(1000, max(len(block) for block in blocks))
+
+    def test_raises_an_error_for_truncated_input(self):
+        compressed = bz2.compress(_TEXT)
+
+        with self.assertRaises(EOFError):
+            b''.join(decompress([compressed[:len(compressed) // 2]]))
+
+
+class TestDecompressingIterator(unittest.TestCase):
+
+    def test_stops_decompressing_when_the_queue_is_full(self):
+        read_count = 0
+
+        def source():
+            nonlocal read_count
+            for chunk in _split(gzip.compress(os.urandom(100 * 1000)), 1000):
+                read_count = read_count + 1
+                yield chunk
+
+        iterator = DecompressingIterator(source(), GZIP, block_size=1000, max_blocks=2)
+        self.addCleanup(iterator.close)
+        next(iterator)
+
+        self.assertFalse(iterator.join(timeout=0.1))
+        self.assertLess(read_count, 10)
+
+    def test_close_stops_the_worker_thread(self):
+        iterator = DecompressingIterator([gzip.compress(_TEXT)], GZIP, block_size=100, max_blocks=1)
+
+        iterator.close()
+
+        self.assertTrue(iterator.join(timeout=5))
+
+    def test_raises_errors_of_the_input_after_the_decompressed_content(self):
+        def source():
+            yield gzip.compress(b'first\n')[:-8]
+            raise OSError('read failed')
+
+        iterator = DecompressingIterator(source(), GZIP)
+
+        self.assertEqual(b'first\n', next(iterator))
+        with self.assertRaises(OSError):
+            next(iterator)
+
+    def test_decompresses_in_a_worker_thread(self):
+        threads = []
+
+        def source():
+            threads.append(threading.current_thread())
+            yield gzip.compress(b'text\n')
+
+        self.assertEqual([b'text\n'], list(DecompressingIterator(source(), GZIP)))
+        self.assertNotEqual(threading.current_thread(), threads[0])
+
+
+class TestPaginateCompressedInput(unittest.TestCase):
+
+    def paginate(self, input, **kwargs):
+        stream = io.BytesIO()
+        paginate(input, output=BinaryOutput(stream), **kwargs)
+        return stream.getvalue()
+
+    def test_decompresses_compressed_files(self):
+        self.assertEqual(_TEXT, self.paginate(io.BytesIO(gzip.compress(_TEXT))))
+
+    def test_does_not_decompress_if_disabled(self):
+        compressed = gzip.compress(_TEXT)
+
+        self.assertEqual(compressed, self.paginate(io.BytesIO(compressed), decompress=False))
+
+    def test_paginates_text_that_starts_like_a_signature(self):
+        self.assertEqual(b'BZh is not bzip2\nsecond line\n', self.paginate([b'BZh is not bzip2\n', b'second line\n']))
+
+    def test_paginate_file_decompresses_compressed_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.log.xz')
+            with open(path, 'wb') as file:
+                file.write(lzma.compress(_TEXT))
+
+            stream = io.BytesIO()
+            paginate_file(path, output=BinaryOutput(stream))
+
+        self.assertEqual(_TEXT, stream.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+from more_or_less import FixedSizeScreen, Input, LineCountPlugin, PaginationStatistics, paginate
+from more_or_less.count_plugin import CountPlugin
+from more_or_less.filter_plugin import FilterPage, FilterPlugin
+from more_or_less.one_page_plugin import OnePagePlugin
+from more_or_less.page_of_height import PageOfHeight
+from more_or_less.quit_plugin import QuitPlugin
+from more_or_less.search_engine import compile_search
+from more_or_less.search_plugin import SearchPlugin
+from unittest.mock import Mock, call
+import io
+import unittest
+
+
+class TerminalOutput(io.StringIO):
+
+    def isatty(self):
+        return True
+
+
+class TestFilterPlugin(unittest.TestCase):
+
+    def setUp(self):
+        self.input = Mock(Input)
+        self.output = TerminalOutput()
+
+    def paginate(self, text, keys, prompt_answers, plugins=None, screen_height=3, **kwargs):
+        self.input.get_character.side_effect = list(keys)
+        self.input.prompt.side_effect = list(prompt_answers)
+        return paginate(
+            [text],
+            prompt=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=screen_height),
+            plugins=plugins or [FilterPlugin(), OnePagePlugin(), QuitPlugin()],
+            **kwargs
+        )
+
+    def test_only_displays_matching_lines(self):
+        text = 'first\nsecond\nerror 1\nok\nok\nerror 2\nok\nerror 3\n'
+
+        self.paginate(text, keys='& ', prompt_answers=['error'])
+
+        self.assertEqual(
+            'first\nsecond\n--Showing only lines matching error--\nerror 1\nerror 2\nerror 3\n',
+            self.output.getvalue())
+
+    def test_exclamation_mark_only_displays_lines_that_do_not_match(self):
+        text = 'first\nsecond\ndebug\nkept 1\ndebug\nkept 2\n'
+
+        self.paginate(text, keys='&', prompt_answers=['!debug'])
+
+        self.assertEqual(
+            'first\nsecond\n--Showing only lines not matching debug--\nkept 1\nkept 2\n',
+            self.output.getvalue())
+
+    def test_empty_pattern_displays_all_lines_again(self):
+        text = 'first\nsecond\nerror 1\nok 1\nerror 2\nok 2\nok 3\n'
+
+        self.paginate(text, keys='&&', prompt_answers=['error', ''])
+
+        self.assertEqual(
+            'first\nsecond\n--Showing only lines matching error--\nerror 1\nerror 2\n'
+            '--Showing all lines--\nok 2\nok 3\n',
+            self.output.getvalue())
+
+    def test_fills_pages_with_matching_lines_only(self):
+        text = 'first\nsecond\n' + ''.join('line {}\n'.format(i) for i in range(3000))
+
+        self.paginate(text, keys='&q', prompt_answers=['line [0-9]*00$'])
+
+        self.assertEqual(
+            'first\nsecond\n--Showing only lines matching line [0-9]*00$--\nline 100\nline 200\n',
+            self.output.getvalue())
+
+    def test_continues_after_the_last_displayed_line(self):
+        text = 'first\nsecond\n' + ''.join('line {}\n'.format(i) for i in range(3000))
+
+        self.paginate(text, keys='& q', prompt_answers=['00'])
+
+        self.assertEqual(
+            'first\nsecond\n--Showing only lines matching 00--\n'
+            'line 100\nline 200\nline 300\nline 400\n',
+            self.output.getvalue())
+
+    def test_search_only_counts_displayed_lines(self):
+        text = 'first\nsecond\nerror a\nerror z\nwarning b\nerror b\nerror c\nerror b2\n'
+        plugins = [CountPlugin(), FilterPlugin(), SearchPlugin(), OnePagePlugin(), QuitPlugin()]
+
+        self.paginate(text, keys='&2/', prompt_answers=['error', 'b'], plugins=plugins)
+
+        self.assertEqual(
+            'first\nsecond\n--Showing only lines matching error--\nerror a\nerror z\n...skipping\nerror b2\n',
+            self.output.getvalue())
+
+    def test_counts_filtered_lines_as_skipped(self):
+        statistics = PaginationStatistics()
+        text = 'first\nsecond\nerror 1\nok\nok\nerror 2\n'
+
+        self.paginate(text, keys='&', prompt_answers=['error'], statistics=statistics)
+
+        self.assertEqual(6, statistics.lines_read)
+        self.assertEqual(2, statistics.lines_skipped)
+        self.assertEqual(4, statistics.lines_displayed)
+
+    def test_line_numbers_count_the_filtered_lines_too(self):
+        line_count_plugin = LineCountPlugin()
+        line_count_plugin.line_numbers_enabled = True
+        plugins = [line_count_plugin, FilterPlugin(), OnePagePlugin(), QuitPlugin()]
+        text = 'first\nsecond\nerror 1\nok\nerror 2\n'
+
+        self.paginate(text, keys='&', prompt_answers=['^error'], plugins=plugins)
+
+        self.assertEqual(
+            '1: first\n2: second\n--Showing only lines matching ^error--\n3: error 1\n5: error 2\n',
+            self.output.getvalue())
+
+    def test_the_line_count_includes_the_filtered_lines(self):
+        line_count_plugin = LineCountPlugin()
+        plugins = [CountPlugin(), line_count_plugin, FilterPlugin(), OnePagePlugin(), QuitPlugin()]
+        text = ''.join('line {} {}\n'.format(i, 'err' if i % 3 == 0 else 'ok') for i in range(1, 40))
+
+        self.paginate(text, keys='l& =q', prompt_answers=['err'], plugins=plugins, screen_height=5)
+
+        self.assertEqual(
+            'line 1 ok\nline 2 ok\nline 3 err\nline 4 ok\n--Showing only lines matching err--\n'
+            '6: line 6 err\n9: line 9 err\n12: line 12 err\n15: line 15 err\n'
+            '18: line 18 err\n21: line 21 err\n24: line 24 err\n27: line 27 err\n',
+            self.output.getvalue())
+        self.input.get_character.assert_called_with('--27--')
+
+    def test_only_transforms_lines_when_filtering(self):
+        plugin = FilterPlugin()
+        self.assertFalse(plugin.transforms_lines())
+
+        plugin._update_filter('error')
+        self.assertTrue(plugin.transforms_lines())
+
+        plugin._update_filter('')
+        self.assertFalse(plugin.transforms_lines())
+
+
+class TestFilterPage(unittest.TestCase):
+
+    def setUp(self):
+        self.output = io.StringIO()
+
+    def test_add_line_only_forwards_matching_lines(self):
+        page = FilterPage(PageOfHeight(height=5, output=self.output), compile_search('error'))
+
+        page.add_line('error 1\n')
+        page.add_line('ok\n')
+        page.flush()
+
+        self.assertEqual('error 1\n', self.output.getvalue())
+        self.assertEqual(1, page.filtered_line_count)
+
+    def test_passes_the_filtered_lines_to_the_wrapped_page_in_order(self):
+        wrapped_page = Mock(wraps=PageOfHeight(height=5, output=self.output))
+        page = FilterPage(wrapped_page, compile_search('error'))
+        lines = ['ok 1\n', 'error 1\n', 'ok 2\n', 'ok 3\n', 'error 2\n', 'ok 4\n']
+
+        page.add_lines(lines, 0)
+
+        self.assertEqual(
+            [
+                call.hide_lines(lines, 0, 1),
+                call.add_lines(['error 1\n'], 0),
+                call.hide_lines(lines, 2, 4),
+                call.add_lines(['error 2\n'], 0),
+                call.hide_lines(lines, 5, 6),
+            ],
+            [c for c in wrapped_page.method_calls if c[0] in ('hide_lines', 'add_lines')])
+
+    def test_add_lines_stops_when_the_wrapped_page_is_full(self):
+        page = FilterPage(PageOfHeight(height=2, output=self.output), compile_search('error'))
+        lines = ['ok\n', 'error 1\n', 'ok\n', 'error 2\n', 'ok\n', 'error 3\n']
+
+        index = page.add_lines(lines, 0)
+
+        self.assertEqual(4, index)
+        self.assertTrue(page.is_full())
+        self.assertEqual('error 1\nerror 2\n', self.output.getvalue())
+        self.assertEqual(2, page.filtered_line_count)
+
+    def test_add_lines_filters_more_lines_than_fit_in_a_block(self):
+        page = FilterPage(PageOfHeight(height=10000, output=self.output), compile_search('line 9'), exclude=True)
+        lines = ['line {}\n'.format(i % 10) for i in range(5000)]
+
+        index = page.add_lines(lines, 0)
+
+        self.assertEqual(5000, index)
+        self.assertEqual(500, page.filtered_line_count)
+        self.assertFalse(page.is_full())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+from more_or_less import FixedSizeScreen, Follower, Input, paginate, paginate_file
+from more_or_less.follow_plugin import FollowPlugin
+from more_or_less.follower import GROWN, REPLACED, TRUNCATED
+from more_or_less.one_page_plugin import OnePagePlugin
+from more_or_less.quit_plugin import QuitPlugin
+from unittest.mock import Mock
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+
+class TerminalOutput(io.StringIO):
+
+    def isatty(self):
+        return True
+
+
+class TestFollowPlugin(unittest.TestCase):
+
+    def setUp(self):
+        self.input = Mock(Input)
+        self.output = TerminalOutput()
+        self.follower = Follower(poll_interval=0.01)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'input.log')
+
+    def paginate(self, input, keys, stop_when_displayed, paginate_function=paginate):
+        ''' Follows the input until 'stop_when_displayed' is displayed, then presses a key '''
+        self.input.get_character.side_effect = list(keys)
+        self.input.poll_character.side_effect = \
+            lambda message: 'x' if self.output.getvalue().endswith(stop_when_displayed) else None
+        return paginate_function(
+            input,
+            prompt=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=3),
+            plugins=[FollowPlugin(), OnePagePlugin(), QuitPlugin()],
+            follower=self.follower,
+        )
+
+    def write_file(self, text, mode='w'):
+        with open(self.path, mode) as file:
+            file.write(text)
+
+    def write_later(self, write):
+        def wait_and_write():
+            time.sleep(0.05)
+            write()
+        thread = threading.Thread(target=wait_and_write)
+        thread.start()
+        self.addCleanup(thread.join)
+
+    def create_pipe(self):
+        read_descriptor, write_descriptor = os.pipe()
+        self.addCleanup(os.close, read_descriptor)
+        self.addCleanup(os.close, write_descriptor)
+        return read_descriptor, write_descriptor
+
+    def test_displays_lines_of_a_pipe_as_they_arrive(self):
+        read_descriptor, write_descriptor = self.create_pipe()
+        os.write(write_descriptor, b'first\nsecond\nthird\n')
+        self.write_later(lambda: os.write(write_descriptor, b'fourth\nfifth\n'))
+
+        self.paginate(read_descriptor, keys='Fq', stop_when_displayed='fifth\n')
+
+        self.assertEqual('first\nsecond\nthird\nfourth\nfifth\n', self.output.getvalue())
+
+    def test_prompts_as_soon_as_a_key_is_pressed(self):
+        read_descriptor, write_descriptor = self.create_pipe()
+        os.write(write_descriptor, b'first\nsecond\nthird\n')
+
+        # No more input arrives (and the pipe stays open), so only the key can end the following
+        self.paginate(read_descriptor, keys='Fq', stop_when_displayed='third\n')
+
+        self.assertEqual(2, self.input.get_character.call_count)
+        self.assertFalse(self.follower.following)
+
+    def test_removes_the_message_without_reading_a_key(self):
+        read_descriptor, write_descriptor = self.create_pipe()
+        os.write(write_descriptor, b'first\nsecond\nthird\n')
+        self.write_later(lambda: os.write(write_descriptor, b'fourth\n'))
+
+        self.paginate(read_descriptor, keys='Fq', stop_when_displayed='fourth\n')
+
+        self.input.clear_message.assert_called()
+        self.assertNotIn('', [call.args[0] for call in self.input.poll_character.call_args_list])
+
+    def test_follows_a_growing_file(self):
+        self.write_file('first\nsecond\nthird\n')
+        self.write_later(lambda: self.write_file('fourth\n', mode='a'))
+
+        self.paginate(self.path, keys='F ', stop_when_displayed='fourth\n', paginate_function=paginate_file)
+
+        self.assertEqual('first\nsecond\nthird\nfourth\n', self.output.getvalue())
+
+    def test_follows_a_growing_file_descriptor(self):
+        self.write_file('first\nsecond\nthird\n')
+        self.write_later(lambda: self.write_file('fourth\n', mode='a'))
+        file_descriptor = os.open(self.path, os.O_RDONLY)
+        self.addCleanup(os.close, file_descriptor)
+
+        self.paginate(file_descriptor, keys='F ', stop_when_displayed='fourth\n')
+
+        self.assertEqual('first\nsecond\nthird\nfourth\n', self.output.getvalue())
+
+    def test_reads_a_truncated_file_from_the_start(self):
+        self.write_file('first\nsecond\nthird\n')
+        self.write_later(lambda: self.write_file('new\n'))
+
+        self.paginate(self.path, keys='F ', stop_when_displayed='new\n', paginate_function=paginate_file)
+
+        self.assertEqual('first\nsecond\nthird\nnew\n', self.output.getvalue())
+
+    def test_reads_a_replaced_file_from_the_start(self):
+        self.write_file('first\nsecond\nthird\n')
+
+        def rotate():
+            with open(self.path + '.new', 'w') as file:
+                file.write('rotated first line\n')
+            os.replace(self.path + '.new', self.path)
+        self.write_later(rotate)
+
+        self.paginate(self.path, keys='F ', stop_when_displayed='rotated first line\n', paginate_function=paginate_file)
+
+        self.assertEqual('first\nsecond\nthird\nrotated first line\n', self.output.getvalue())
+
+    def test_inputs_that_can_not_wait_simply_end(self):
+        self.paginate(['first\nsecond\nthird\nfourth\n'], keys='F', stop_when_displayed='never')
+
+        self.assertEqual('first\nsecond\nthird\nfourth\n', self.output.getvalue())
+        self.assertFalse(self.follower.following)
+
+    def test_idle_following_only_wakes_up_once_per_poll_interval(self):
+        read_descriptor, write_descriptor = self.create_pipe()
+        os.write(write_descriptor, b'first\nsecond\nthird\n')
+        self.follower.poll_interval = 0.05
+        stop_time = time.monotonic() + 0.5
+        self.input.get_character.side_effect = ['F', 'q']
+        self.input.poll_character.side_effect = lambda message: 'x' if time.monotonic() > stop_time else None
+
+        paginate(
+            read_descriptor,
+            prompt=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=3),
+            plugins=[FollowPlugin(), QuitPlugin()],
+            follower=self.follower,
+        )
+
+        # About 10 intervals, plus the calls that remove the message
+        self.assertLess(self.input.poll_character.call_count, 20)
+
+
+class TestFollower(unittest.TestCase):
+
+    def setUp(self):
+        self.follower = Follower(poll_interval=0.01)
+        file = tempfile.NamedTemporaryFile(delete=False)
+        file.write(b'first\n')
+        file.close()
+        self.path = file.name
+        self.addCleanup(os.remove, self.path)
+        self.file_descriptor = os.open(self.path, os.O_RDONLY)
+        self.addCleanup(os.close, self.file_descriptor)
+
+    def test_reports_a_file_that_grew(self):
+        self.assertEqual(GROWN, self.follower.wait_for_file(self.file_descriptor, 3, self.path))
+
+    def test_reports_a_truncated_file(self):
+        self.assertEqual(TRUNCATED, self.follower.wait_for_file(self.file_descriptor, 10, self.path))
+
+    def test_reports_a_replaced_file(self):
+        with open(self.path + '.new', 'wb') as file:
+            file.write(b'other\n')
+        os.replace(self.path + '.new', self.path)
+
+        self.assertEqual(REPLACED, self.follower.wait_for_file(self.file_descriptor, 6, self.path))
+
+    def test_reports_nothing_if_the_file_did_not_change(self):
+        self.assertIsNone(self.follower.wait_for_file(self.file_descriptor, 6, self.path))
+
+    def test_waits_for_a_pipe_to_become_readable(self):
+        read_descriptor, write_descriptor = os.pipe()
+        self.addCleanup(os.close, read_descriptor)
+        self.addCleanup(os.close, write_descriptor)
+
+        self.assertFalse(self.follower.wait_for_stream(read_descriptor))
+        os.write(write_descriptor, b'text\n')
+        self.assertTrue(self.follower.wait_for_stream(read_descriptor))
+
+
+if __name__ == '__main__':
+    unittest.main()
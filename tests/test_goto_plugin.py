@@ -0,0 +1,142 @@
+from more_or_less import FixedSizeScreen, Input, LineIndex, paginate, paginate_file
+from more_or_less.count_plugin import CountPlugin
+from more_or_less.goto_plugin import GotoPlugin
+from more_or_less.line_count_plugin import LineCountPlugin
+from more_or_less.one_page_plugin import OnePagePlugin
+from more_or_less.quit_plugin import QuitPlugin
+from unittest.mock import Mock
+import io
+import os
+import tempfile
+import unittest
+
+
+def _lines(start, end):
+    return ''.join(f'line {i:03}\n' for i in range(start, end))
+
+
+class TestLineIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = LineIndex(interval=4)
+        self.data = _lines(0, 10).encode()
+        self.index.set_data(self.data)
+
+    def test_finds_lines_between_the_checkpoints(self):
+        self.assertEqual((0, 0), self.index.find_line(0))
+        self.assertEqual((6, 6 * 9), self.index.find_line(6))
+
+    def test_only_indexes_the_checkpoints_up_to_the_line(self):
+        self.index.find_line(5)
+
+        self.assertEqual(2, self.index.checkpoint_count)
+
+    def test_finds_the_last_line_for_lines_beyond_the_end(self):
+        self.assertEqual((9, 9 * 9), self.index.find_line(1000))
+
+    def test_finds_the_last_line_if_it_has_no_line_terminator(self):
+        self.index.set_data(b'first\nsecond\nno terminator')
+
+        self.assertEqual((2, 13), self.index.find_line(5))
+
+    def test_finds_the_line_that_contains_an_offset(self):
+        self.assertEqual((0, 0), self.index.find_offset(0))
+        self.assertEqual((5, 5 * 9), self.index.find_offset(5 * 9 + 3))
+        self.assertEqual((8, 8 * 9), self.index.find_offset(8 * 9))
+        self.assertEqual((9, 9 * 9), self.index.find_offset(len(self.data)))
+
+    def test_indexes_the_data_in_the_background(self):
+        self.index.set_data(_lines(0, 12).encode())
+
+        self.index.start()
+        self.index.join()
+
+        # There is no checkpoint for line 12, as it would be at the very end
+        self.assertEqual(3, self.index.checkpoint_count)
+
+    def test_keeps_the_checkpoints_of_data_that_grew(self):
+        self.index.find_line(9)
+
+        self.index.set_data(_lines(0, 20).encode(), keep_checkpoints=True)
+
+        self.assertEqual((17, 17 * 9), self.index.find_line(17))
+        self.assertEqual(5, self.index.checkpoint_count)
+
+    def test_supports_empty_data(self):
+        self.index.set_data(None)
+
+        self.assertEqual((0, 0), self.index.find_line(5))
+        self.assertEqual((0, 0), self.index.find_offset(5))
+
+
+class TestGotoPlugin(unittest.TestCase):
+
+    def setUp(self):
+        self.input = Mock(Input)
+        self.output = io.StringIO()
+        self.line_count_plugin = LineCountPlugin()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'input.txt')
+        with open(self.path, 'w') as file:
+            file.write(_lines(0, 100))
+
+    def paginate(self, keys, paginate_function=paginate_file, input=None, line_number='10'):
+        self.input.get_character.side_effect = list(keys) + ['q']
+        self.input.prompt.return_value = line_number
+        paginate_function(
+            input or self.path,
+            prompt=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=4),
+            plugins=[GotoPlugin(), CountPlugin(), OnePagePlugin(), self.line_count_plugin, QuitPlugin()])
+
+    def test_goes_to_line_k(self):
+        self.paginate('50g')
+
+        self.assertEqual(_lines(0, 3) + _lines(49, 52), self.output.getvalue())
+
+    def test_goes_to_the_first_line_by_default(self):
+        self.paginate(' g')
+
+        self.assertEqual(_lines(0, 6) + _lines(0, 3), self.output.getvalue())
+
+    def test_prompts_for_the_line_number_on_colon(self):
+        self.paginate(':')
+
+        self.input.prompt.assert_called_with(':')
+        self.assertEqual(_lines(0, 3) + _lines(9, 12), self.output.getvalue())
+
+    def test_goes_to_k_percent_of_the_file(self):
+        self.paginate('50%')
+
+        self.assertEqual(_lines(0, 3) + _lines(50, 53), self.output.getvalue())
+
+    def test_goes_to_the_last_line_for_lines_beyond_the_end(self):
+        self.paginate('500g')
+
+        self.assertEqual(_lines(0, 3) + _lines(99, 100), self.output.getvalue())
+
+    def test_counts_the_lines_from_the_line_it_went_to(self):
+        self.paginate('50g=')
+
+        self.input.get_character.assert_called_with('--52--')
+
+    def test_can_go_back_to_an_earlier_line(self):
+        self.paginate('50g2g')
+
+        self.assertEqual(_lines(0, 3) + _lines(49, 52) + _lines(1, 4), self.output.getvalue())
+
+    def test_shows_a_message_for_inputs_that_can_not_jump(self):
+        self.paginate('5g', paginate_function=paginate, input=_lines(0, 100).splitlines(True))
+
+        self.input.get_character.assert_any_call('--Can not jump to another line of this input--')
+
+    def test_shows_a_message_for_invalid_line_numbers(self):
+        self.paginate(':', line_number='ten')
+
+        self.input.get_character.assert_called_with('--Not a line number: ten--')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,11 +15,19 @@ class TestHelpPlugin(unittest.TestCase):
         -------------------------------------------------------------------------------
         <space>                Display next k lines of text [current screen size]
         <return>               Display next k lines of text [1]*
+        b                      Skip backwards k screenfuls of text [1]
+        g or :<line number>    Go to line k [1]
+        %                      Go to k percent of the input [0]
         q or Q or <interrupt>  Exit from more
         =                      Display current line number
         l                      Toggle printing line number on every line [currently disabled]
         /<regular expression>  Search for kth occurrence of the regular expression [1]
+        @<file>                Search for kth occurrence of any of the lines in file [1]
         n                      Search for kth occurrence of the last regular expression [1]
+        &<regular expression>  Display only lines matching the regular expression (&! for not matching)
+        F                      Follow the input, displaying new lines as they arrive (until a key is pressed)
+        S                      Toggle chopping long lines to the screen width [currently disabled]
+        < or >                 Scroll chopped lines k columns to the left or right [half the screen width]*
         .                      Repeat previous command
         h or ?                 Display this help text
         -------------------------------------------------------------------------------
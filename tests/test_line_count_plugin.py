@@ -1,4 +1,5 @@
 from more_or_less.input import Input
+from more_or_less.line_segments import Continuation, SegmentedLines
 from more_or_less.output import Output
 from tests.test_more_page_builder import TestUtil
 from unittest.mock import Mock, call
@@ -68,6 +69,70 @@ class TestLineCountPlugin(TestUtil):
             call.write('after disabling line-numbers\n'),
         ])
 
+    def test_counts_lines_skipped_by_a_search(self):
+        self.input.get_character.side_effect = ['/']
+        self.input.prompt.return_value = 'match'
+        page = self.builder.build_next_page()
+        lines = ['skipped\n', 'skipped\n', 'match\n']
+
+        index = page.skip_lines(lines, 0)
+        page.add_line(lines[index])
+
+        self.input.get_character.side_effect = ['=', ' ']
+        self.builder.build_next_page()
+        self.input.get_character.assert_called_with('--3--')
+
+    def test_search_sees_the_lines_without_their_number(self):
+        self.input.get_character.side_effect = ['l', '/']
+        self.input.prompt.return_value = '^baz'
+        page = self.builder.build_next_page()
+
+        # The first line of a page is added on its own, the others are skipped as a block
+        page.add_line('foo baz\n')
+        lines = ['foo\n', 'baz\n', 'bar\n']
+        page.add_lines(lines, page.skip_lines(lines, 0))
+
+        self.output.write.assert_has_calls([call('3: baz\n'), call('4: bar\n')])
+
+    def test_search_finds_the_first_line_of_a_page_without_its_number(self):
+        self.input.get_character.side_effect = ['l', '/']
+        self.input.prompt.return_value = 'bar|^baz'
+        page = self.builder.build_next_page()
+
+        page.add_line('baz\n')
+
+        self.output.write.assert_called_with('1: baz\n')
+
+    def test_counts_lines_added_as_a_block(self):
+        page = self.builder.build_first_page()
+
+        page.add_lines([f'line {i}\n' for i in range(10)], 4)
+
+        self.input.get_character.side_effect = ['=', ' ']
+        self.builder.build_next_page()
+        self.input.get_character.assert_called_with('--6--')
+
+    def test_counts_a_line_split_in_segments_once(self):
+        page = self.builder.build_first_page()
+
+        page.add_lines(SegmentedLines(['first\n', 'long \n', Continuation('line\n'), 'last\n'], 2), 0)
+
+        self.input.get_character.side_effect = ['=', ' ']
+        self.builder.build_next_page()
+        self.input.get_character.assert_called_with('--3--')
+
+    def test_does_not_number_continuations(self):
+        self.input.get_character.side_effect = ['l', ' ']
+        page = self.builder.build_next_page()
+
+        page.add_lines(SegmentedLines(['long \n', Continuation('line\n'), 'next\n'], 2), 0)
+
+        self.output.assert_has_calls([
+            call.write('1: long \n'),
+            call.write('line\n'),
+            call.write('2: next\n'),
+        ])
+
     def test_prints_status_in_prompt_when_enabling_or_disabling_line_numbers(self):
         self.input.get_character.side_effect = ['l', 'l', ' ']
         self.builder.build_next_page()
@@ -0,0 +1,178 @@
+from more_or_less import FixedSizeScreen, Input, LookAhead, paginate
+from more_or_less.search_engine import compile_search
+from unittest.mock import Mock
+import io
+import threading
+import time
+import unittest
+
+
+class TestLookAhead(unittest.TestCase):
+
+    def setUp(self):
+        self.look_ahead = LookAhead(max_bytes=100)
+
+    def tearDown(self):
+        self.look_ahead.stop()
+
+    def test_returns_all_text_in_order(self):
+        text = list(self.look_ahead.start(['first\n', 'second\n', 'third\n']))
+
+        self.assertEqual('first\nsecond\nthird\n', ''.join(text))
+
+    def test_reads_ahead_while_the_text_is_not_used(self):
+        source = RecordingSource(['first\n', 'second\n'])
+        self.look_ahead.start(source)
+
+        wait_until(lambda: source.read_count == 2)
+        self.assertEqual('first\nsecond\n', next(self.look_ahead))
+
+    def test_stops_reading_ahead_when_the_buffer_is_full(self):
+        source = RecordingSource(['x' * 60, 'y' * 60, 'z' * 60])
+        self.look_ahead.start(source)
+
+        wait_until(lambda: self.look_ahead.buffered_bytes == 120)
+        time.sleep(0.05)
+        self.assertEqual(2, source.read_count)
+
+        self.assertEqual('x' * 60 + 'y' * 60, next(self.look_ahead))
+        self.assertEqual('z' * 60, next(self.look_ahead))
+
+    def test_stops_reading_ahead_when_the_next_match_is_read(self):
+        source = RecordingSource(['first\n', 'match\n', 'third\n'])
+        self.look_ahead.look_for(compile_search('match'))
+        self.look_ahead.start(source)
+
+        wait_until(lambda: self.look_ahead.buffered_match_count == 1)
+        time.sleep(0.05)
+        self.assertEqual(2, source.read_count)
+
+    def test_looking_for_a_new_search_counts_the_text_that_is_already_read(self):
+        source = RecordingSource(['first\n', 'match\n', 'third\n'])
+        self.look_ahead.start(source)
+        wait_until(lambda: source.read_count == 3)
+
+        self.look_ahead.look_for(compile_search('match|first'), match_count=5)
+
+        self.assertEqual(2, self.look_ahead.buffered_match_count)
+
+    def test_raises_errors_of_the_input_after_the_text_that_was_read(self):
+        def source():
+            yield 'first\n'
+            raise OSError('input error')
+
+        self.look_ahead.start(source())
+
+        self.assertEqual('first\n', next(self.look_ahead))
+        with self.assertRaises(OSError):
+            next(self.look_ahead)
+
+    def test_stop_stops_reading(self):
+        source = RecordingSource(['x' * 60, 'y' * 60, 'z' * 60])
+        self.look_ahead.start(source)
+        wait_until(lambda: source.read_count == 2)
+
+        self.look_ahead.stop()
+
+        self.assertEqual([], list(self.look_ahead))
+        self.assertEqual(2, source.read_count)
+        self.assertTrue(self.look_ahead.join(timeout=5))
+
+    def test_stop_throws_away_the_text_of_a_read_in_progress(self):
+        read_started = threading.Event()
+        continue_read = threading.Event()
+
+        def source():
+            read_started.set()
+            continue_read.wait()
+            yield 'x' * 60
+
+        self.look_ahead.start(source())
+        read_started.wait()
+
+        self.look_ahead.stop()
+        continue_read.set()
+
+        self.assertTrue(self.look_ahead.join(timeout=5))
+        self.assertEqual(0, self.look_ahead.buffered_bytes)
+        self.assertEqual([], list(self.look_ahead))
+
+
+class TestPaginateWithLookAhead(unittest.TestCase):
+
+    def test_output_is_the_same(self):
+        input = Mock(Input)
+        input.get_character.return_value = ' '
+        output = io.StringIO()
+        text = ''.join('line {}\n'.format(i) for i in range(100))
+
+        paginate(
+            io.StringIO(text),
+            prompt=input,
+            output=output,
+            screen_dimensions=FixedSizeScreen(height=10),
+            look_ahead=True,
+        )
+
+        self.assertEqual(text, output.getvalue())
+
+    def test_search_makes_the_look_ahead_look_for_the_next_match(self):
+        input = Mock(Input)
+        input.get_character.side_effect = ['/', 'q']
+        input.prompt.return_value = 'match'
+        output = io.StringIO()
+        text = ''.join('line {}\n'.format(i) for i in range(20)) + 'match\n'
+
+        paginate(
+            [text],
+            prompt=input,
+            output=output,
+            screen_dimensions=FixedSizeScreen(height=10),
+            look_ahead=True,
+        )
+
+        self.assertIn('...skipping\nmatch\n', output.getvalue())
+
+    def test_reads_at_most_look_ahead_size_bytes_ahead_and_stops_reading_on_quit(self):
+        input = Mock(Input)
+        input.get_character.return_value = 'q'
+        source = RecordingSource(['line\n' * 10] * 1000)
+
+        paginate(
+            source,
+            prompt=input,
+            output=io.StringIO(),
+            screen_dimensions=FixedSizeScreen(height=10),
+            look_ahead=True,
+            look_ahead_size=100,
+        )
+        time.sleep(0.05)
+
+        # The first page, and at most 100 bytes (2 reads) of look ahead
+        self.assertLessEqual(source.read_count, 4)
+
+
+class RecordingSource(object):
+    ''' Iterable that counts how many items were read '''
+
+    def __init__(self, items):
+        self._items = iter(items)
+        self.read_count = 0
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._items)
+        with self._lock:
+            self.read_count = self.read_count + 1
+        return item
+
+
+def wait_until(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            raise AssertionError('Timeout')
+        time.sleep(0.001)
@@ -0,0 +1,212 @@
+from more_or_less.line_index import LineIndex
+from more_or_less.line_segments import Continuation
+from more_or_less.mapped_file import MappedFile
+from tests.test_paginator import FirstPage, NextPage, PageBuilderMock, StopOutputPageBuilder, TestUtil
+from unittest.mock import patch
+import more_or_less
+import os
+import tempfile
+import threading
+import unittest
+
+
+class MappedFileTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def create_file(self, content):
+        path = os.path.join(self._directory.name, 'input.txt')
+        with open(path, 'wb') as file:
+            file.write(content)
+        return path
+
+    def open_mapped_file(self, content, block_size=1024, line_index=None):
+        mapped_file = MappedFile(self.create_file(content), block_size=block_size, line_index=line_index)
+        self.addCleanup(mapped_file.close)
+        return mapped_file
+
+
+class TestMappedFile(MappedFileTestCase):
+
+    def test_iterates_over_the_file_content(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\n')
+
+        self.assertEqual(['first\nsecond\n'], list(mapped_file))
+
+    def test_blocks_only_contain_complete_lines(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\nthird\n', block_size=10)
+
+        self.assertEqual(['first\n', 'second\n', 'third\n'], list(mapped_file))
+
+    def test_returns_lines_longer_than_a_block_in_blocks(self):
+        mapped_file = self.open_mapped_file(b'a long line\nshort\n', block_size=4)
+
+        self.assertEqual(['a lo', 'ng l', 'ine\n', 'shor', 't\n'], list(mapped_file))
+
+    def test_indexes_lines_longer_than_a_block_once_they_end(self):
+        mapped_file = self.open_mapped_file(b'a long line\nshort\n', block_size=4)
+
+        next(mapped_file)
+        self.assertEqual(0, mapped_file.line_count)
+        next(mapped_file)
+        next(mapped_file)
+        self.assertEqual(1, mapped_file.line_count)
+        self.assertEqual('a long line\n', mapped_file.get_line(0))
+
+    def test_does_not_split_characters_over_blocks(self):
+        mapped_file = self.open_mapped_file('a café\n'.encode(), block_size=5)
+
+        self.assertEqual(['a caf', 'é\n'], list(mapped_file))
+
+    def test_returns_final_line_without_line_terminator(self):
+        mapped_file = self.open_mapped_file(b'first\nno terminator', block_size=8)
+
+        self.assertEqual(['first\n', 'no termi', 'nator'], list(mapped_file))
+
+    def test_supports_empty_files(self):
+        mapped_file = self.open_mapped_file(b'')
+
+        self.assertEqual([], list(mapped_file))
+
+    def test_indexes_lines_that_have_been_read(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\nthird\n', block_size=10)
+
+        next(mapped_file)
+
+        self.assertEqual(1, mapped_file.line_count)
+        self.assertEqual(6, mapped_file.get_position())
+
+    def test_get_line_slices_indexed_lines_out_of_the_file(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\nno terminator')
+        next(mapped_file)
+
+        self.assertEqual(3, mapped_file.line_count)
+        self.assertEqual('first\n', mapped_file.get_line(0))
+        self.assertEqual('second\n', mapped_file.get_line(1))
+        self.assertEqual('no terminator', mapped_file.get_line(2))
+
+    def test_get_lines_decodes_indexed_lines_at_once(self):
+        mapped_file = self.open_mapped_file('first\nsecond\ncafé\nno terminator'.encode())
+        next(mapped_file)
+
+        self.assertEqual(['second\n', 'café\n', 'no terminator'], mapped_file.get_lines(1, 4))
+        self.assertEqual([], mapped_file.get_lines(2, 2))
+
+    def test_get_line_raises_IndexError_for_lines_that_are_not_indexed(self):
+        mapped_file = self.open_mapped_file(b'first\n')
+
+        with self.assertRaises(IndexError):
+            mapped_file.get_line(0)
+
+    def test_jumps_to_a_line(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\nthird\nfourth\n', line_index=LineIndex(interval=2))
+        next(mapped_file)
+
+        self.assertEqual(2, mapped_file.jump_to(line=2))
+        self.assertEqual(['third\nfourth\n'], list(mapped_file))
+
+    def test_jumps_to_the_line_at_a_percentage_of_the_file(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\nthird\nfourth\n', line_index=LineIndex(interval=2))
+
+        self.assertEqual(1, mapped_file.jump_to(percentage=25))
+        self.assertEqual(['second\nthird\nfourth\n'], list(mapped_file))
+
+    def test_numbers_the_lines_from_the_line_it_jumped_to(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\nthird\nfourth\n', line_index=LineIndex(interval=2))
+        mapped_file.jump_to(line=2)
+        next(mapped_file)
+
+        self.assertEqual(4, mapped_file.line_count)
+        self.assertEqual('third\n', mapped_file.get_line(2))
+        with self.assertRaises(IndexError):
+            mapped_file.get_line(1)
+
+    def test_decodes_using_the_given_encoding(self):
+        path = self.create_file('café\n'.encode('latin-1'))
+        with MappedFile(path, encoding='latin-1') as mapped_file:
+            self.assertEqual(['café\n'], list(mapped_file))
+
+
+class TestPaginateFile(MappedFileTestCase, TestUtil):
+
+    def setUp(self):
+        MappedFileTestCase.setUp(self)
+        TestUtil.setUp(self)
+
+    def test_paginates_the_file(self):
+        path = self.create_file(b'first \nsecond \nthird \n')
+
+        self.paginate_file(path, page_height=2)
+
+        self.assertEqual(
+            [
+                FirstPage(['first \n', 'second \n']),
+                NextPage(['third \n']),
+            ],
+            self.output
+        )
+
+    def test_replaces_decoding_errors_by_default(self):
+        path = self.create_file(b'invalid \xff utf-8\n')
+
+        self.paginate_file(path)
+
+        self.assertEqual([FirstPage(['invalid � utf-8\n'])], self.output)
+
+    def test_joins_lines_longer_than_a_block(self):
+        mapped_file = self.open_mapped_file(b'a long line\nshort\n', block_size=4)
+
+        self.paginate(mapped_file)
+
+        self.assertEqual([FirstPage(['a long line\n', 'short\n'])], self.output)
+
+    def test_splits_lines_longer_than_max_line_size_in_segments(self):
+        mapped_file = self.open_mapped_file(b'a long line\nshort\n', block_size=4)
+
+        self.paginate(mapped_file, max_line_size=5)
+
+        self.assertEqual([FirstPage(['a lon\n', 'g line\n', 'short\n'])], self.output)
+        self.assertEqual(
+            [False, True, False],
+            [isinstance(line, Continuation) for line in self.current_page.lines])
+
+    def test_closes_the_file_when_the_asynchronous_pagination_stops_early(self):
+        path = self.create_file(b''.join(b'line %d\n' % i for i in range(1000)))
+
+        with patch.object(MappedFile, 'close', autospec=True, side_effect=MappedFile.close) as close:
+            context = more_or_less.paginate_file(path, page_builder=StopOutputPageBuilder(2), asynchronous=True)
+            context.join(timeout=5)
+
+        self.assertEqual(more_or_less.OUTPUT_STOPPED, context.result)
+        close.assert_called_once()
+        mapped_file = close.call_args[0][0]
+        self.assertTrue(mapped_file._file.closed)
+
+    @unittest.skipUnless(hasattr(os, 'mkfifo'), 'requires named pipes')
+    def test_reads_files_that_can_not_be_mapped(self):
+        path = os.path.join(self._directory.name, 'pipe')
+        os.mkfifo(path)
+
+        def write():
+            with open(path, 'w') as pipe:
+                pipe.write('first \nsecond \n')
+        writer = threading.Thread(target=write)
+        writer.start()
+        self.paginate_file(path)
+        writer.join()
+
+        self.assertEqual([FirstPage(['first \n', 'second \n'])], self.output)
+
+    @unittest.skipUnless(os.path.exists('/proc/self/status'), 'requires /proc')
+    def test_reads_files_that_claim_to_be_empty(self):
+        self.paginate_file('/proc/self/status')
+
+        self.assertTrue(self.current_page.lines)
+
+    def paginate_file(self, path, page_height=1000):
+        self._page_builder = PageBuilderMock(page_height)
+        return more_or_less.paginate_file(path, page_builder=self._page_builder)
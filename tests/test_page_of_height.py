@@ -0,0 +1,97 @@
+from more_or_less import PageOfHeight
+from more_or_less.output import Output
+import unittest
+
+
+class TestPageOfHeight(unittest.TestCase):
+
+    def setUp(self):
+        self.output = OutputSpy()
+
+    def test_is_full_after_height_lines(self):
+        page = PageOfHeight(height=2, output=self.output)
+
+        page.add_line('first\n')
+        self.assertFalse(page.is_full())
+        page.add_line('second\n')
+        self.assertTrue(page.is_full())
+
+    def test_writes_all_lines_at_once_when_full(self):
+        page = PageOfHeight(height=3, output=self.output)
+
+        page.add_line('first\n')
+        page.add_line('second\n')
+        self.assertEqual([], self.output.writes)
+
+        page.add_line('third\n')
+        self.assertEqual(['first\nsecond\nthird\n'], self.output.writes)
+
+    def test_flush_writes_pending_lines(self):
+        page = PageOfHeight(height=3, output=self.output)
+        page.add_line('first\n')
+
+        page.flush()
+
+        self.assertEqual(['first\n'], self.output.writes)
+        self.assertEqual(1, self.output.flush_call_count)
+
+    def test_end_batch_writes_pending_lines_without_flushing(self):
+        page = PageOfHeight(height=3, output=self.output)
+        page.add_line('first\n')
+
+        page.end_batch()
+        page.add_line('second\n')
+        page.end_batch()
+
+        self.assertEqual(['first\n', 'second\n'], self.output.writes)
+        self.assertEqual(0, self.output.flush_call_count)
+
+    def test_does_not_write_empty_text(self):
+        page = PageOfHeight(height=3, output=self.output)
+
+        page.end_batch()
+        page.flush()
+
+        self.assertEqual([], self.output.writes)
+
+    def test_writes_every_line_to_line_by_line_outputs(self):
+        self.output.line_by_line = True
+        page = PageOfHeight(height=3, output=self.output)
+
+        page.add_line('first\n')
+        page.add_line('second\n')
+
+        self.assertEqual(['first\n', 'second\n'], self.output.writes)
+
+    def test_add_lines_stops_when_full(self):
+        page = PageOfHeight(height=2, output=self.output)
+
+        index = page.add_lines(['skipped\n', 'first\n', 'second\n', 'third\n'], 1)
+
+        self.assertEqual(3, index)
+        self.assertTrue(page.is_full())
+        self.assertEqual(['first\nsecond\n'], self.output.writes)
+
+    def test_add_lines_after_add_line(self):
+        page = PageOfHeight(height=3, output=self.output)
+        page.add_line('first\n')
+
+        index = page.add_lines(['second\n'], 0)
+        page.flush()
+
+        self.assertEqual(1, index)
+        self.assertFalse(page.is_full())
+        self.assertEqual(['first\nsecond\n'], self.output.writes)
+
+
+class OutputSpy(Output):
+
+    def __init__(self):
+        self.writes = []
+        self.flush_call_count = 0
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        self.flush_call_count = self.flush_call_count + 1
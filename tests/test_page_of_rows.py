@@ -0,0 +1,124 @@
+from more_or_less import FixedSizeScreen, Input, MorePageBuilder, PageOfHeight
+from more_or_less.display_width import _count_rows_cached, count_rows, get_character_width
+from more_or_less.page_of_rows import PageOfRows
+from unittest.mock import Mock
+import io
+import unittest
+
+
+class TestCountRows(unittest.TestCase):
+
+    def test_ascii_lines_wrap_at_the_width(self):
+        self.assertEqual(1, count_rows('x' * 10 + '\n', 10))
+        self.assertEqual(2, count_rows('x' * 11 + '\n', 10))
+        self.assertEqual(3, count_rows('x' * 30, 10))
+
+    def test_empty_lines_take_one_row(self):
+        self.assertEqual(1, count_rows('\n', 10))
+        self.assertEqual(1, count_rows('\r\n', 10))
+
+    def test_wide_characters_take_two_columns(self):
+        self.assertEqual(1, count_rows('日本語\n', 6))
+        self.assertEqual(2, count_rows('日本語\n', 5))
+
+    def test_wide_characters_that_do_not_fit_start_on_the_next_row(self):
+        # 'x' and two wide characters fill 5 columns, the third wide character does not fit in the sixth
+        self.assertEqual(2, count_rows('x日本語\n', 6))
+
+    def test_combining_characters_take_no_room(self):
+        self.assertEqual(1, count_rows('e\u0301' * 10 + '\n', 10))
+
+    def test_escape_sequences_take_no_room(self):
+        self.assertEqual(1, count_rows('\x1b[31m' + 'x' * 10 + '\x1b[0m\n', 10))
+        self.assertEqual(1, count_rows('\x1b]8;;http://example.com\x1b\\link\x1b]8;;\x1b\\\n', 10))
+
+    def test_tabs_move_to_the_next_tab_stop(self):
+        self.assertEqual(1, count_rows('\tx\n', 9))
+        self.assertEqual(2, count_rows('x\tx\tx\n', 16))
+
+    def test_only_caches_short_lines(self):
+        _count_rows_cached.cache_clear()
+
+        self.assertEqual(1, count_rows('日本語\n', 10))
+        self.assertEqual(60, count_rows('日本語' * 100 + '\n', 10))
+
+        self.assertEqual(1, _count_rows_cached.cache_info().currsize)
+
+    def test_character_widths(self):
+        self.assertEqual(1, get_character_width('a'))
+        self.assertEqual(2, get_character_width('語'))
+        self.assertEqual(2, get_character_width('\U0001F600'))
+        self.assertEqual(0, get_character_width('\u0301'))
+        self.assertEqual(0, get_character_width('\u200b'))
+
+
+class TestPageOfRows(unittest.TestCase):
+
+    def setUp(self):
+        self.output = io.StringIO()
+
+    def test_long_lines_count_for_several_rows(self):
+        page = PageOfRows(height=4, output=self.output, width=10)
+
+        page.add_line('x' * 25 + '\n')
+        self.assertFalse(page.is_full())
+        page.add_line('short\n')
+        self.assertTrue(page.is_full())
+
+    def test_add_lines_keeps_lines_that_do_not_fit_for_the_next_page(self):
+        page = PageOfRows(height=4, output=self.output, width=10)
+        lines = ['first\n', 'x' * 35 + '\n', 'last\n']
+
+        index = page.add_lines(lines, 0)
+
+        self.assertEqual(1, index)
+        self.assertTrue(page.is_full())
+        self.assertEqual('first\n', self.output.getvalue())
+
+    def test_add_lines_adds_lines_that_are_higher_than_the_page_to_an_empty_page(self):
+        page = PageOfRows(height=2, output=self.output, width=10)
+
+        index = page.add_lines(['x' * 50 + '\n', 'next\n'], 0)
+
+        self.assertEqual(1, index)
+        self.assertTrue(page.is_full())
+
+    def test_add_lines_fills_all_rows(self):
+        page = PageOfRows(height=4, output=self.output, width=10)
+        lines = ['x' * 15 + '\n', 'first\n', 'second\n', 'third\n']
+
+        index = page.add_lines(lines, 0)
+
+        self.assertEqual(3, index)
+        self.assertEqual(''.join(lines[:3]), self.output.getvalue())
+
+    def test_repeat_returns_an_empty_page_of_the_same_size(self):
+        page = PageOfRows(height=4, output=self.output, width=10)
+        page.add_line('x' * 40 + '\n')
+
+        repeated_page = page.repeat()
+
+        self.assertFalse(repeated_page.is_full())
+        self.assertEqual((4, 10), (repeated_page.height, repeated_page.width))
+
+
+class TestMorePageBuilderPages(unittest.TestCase):
+
+    def create_page(self, screen_dimensions):
+        page_builder = MorePageBuilder(input=Mock(Input), output=io.StringIO(), screen_dimensions=screen_dimensions)
+        return page_builder.create_page(5)
+
+    def test_counts_rows_if_the_screen_width_is_known(self):
+        page = self.create_page(FixedSizeScreen(height=5, width=80))
+
+        self.assertIsInstance(page, PageOfRows)
+        self.assertEqual(80, page.width)
+
+    def test_counts_lines_if_the_screen_is_infinitely_wide(self):
+        page = self.create_page(FixedSizeScreen(height=5))
+
+        self.assertIs(PageOfHeight, type(page))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,242 @@
+from more_or_less import OUTPUT_STOPPED
+from more_or_less.pagination_context import OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_SPILL
+from tests.test_paginator import FirstPage, NextPage, PageBuilderMock, StopOutputPageBuilder
+import more_or_less
+import threading
+import unittest
+
+
+_big_page = 1000
+
+
+class TestPaginationContext(unittest.TestCase):
+
+    def setUp(self):
+        self._page_builder = None
+
+    def paginate(self, page_builder=None, page_height=_big_page, **kwargs):
+        self._page_builder = page_builder or PageBuilderMock(page_height)
+        return more_or_less.paginate(page_builder=self._page_builder, asynchronous=True, **kwargs)
+
+    @property
+    def output(self):
+        return self._page_builder.pages
+
+    def test_paginates_text_sent_through_write(self):
+        context = self.paginate(page_height=2)
+
+        context.write('first \nsecond ')
+        context.write('line \nthird \n')
+        context.close()
+        context.join(timeout=1)
+
+        self.assertEqual(
+            [
+                FirstPage(['first \n', 'second line \n']),
+                NextPage(['third \n']),
+            ],
+            self.output
+        )
+
+    def test_paginates_bytes_sent_through_write(self):
+        context = self.paginate(page_height=2)
+
+        context.write(b'first \nsecond caf\xc3')
+        context.write(b'\xa9 \nthird \n')
+        context.close()
+        context.join(timeout=1)
+
+        self.assertEqual(
+            [
+                FirstPage(['first \n', 'second café \n']),
+                NextPage(['third \n']),
+            ],
+            self.output
+        )
+
+    def test_can_not_write_both_text_and_bytes(self):
+        with self.paginate() as context:
+            context.write(b'first \n')
+
+            with self.assertRaises(TypeError):
+                context.write('second \n')
+
+        self.assertEqual([FirstPage(['first \n'])], self.output)
+
+    def test_can_be_used_as_context_manager(self):
+        with self.paginate() as context:
+            context.write('first \n')
+
+        self.assertFalse(context.is_alive())
+        self.assertEqual([FirstPage(['first \n'])], self.output)
+
+    def test_can_not_write_after_close(self):
+        context = self.paginate()
+        context.close()
+
+        with self.assertRaises(ValueError):
+            context.write('too late \n')
+
+    def test_can_not_write_if_input_was_passed_to_paginate(self):
+        context = self.paginate(input=['first \n'])
+
+        with self.assertRaises(ValueError):
+            context.write('not allowed \n')
+        context.join(timeout=1)
+
+    def test_stop_aborts_the_pagination(self):
+        context = self.paginate()
+        context.write('first \n')
+
+        context.stop()
+        context.join(timeout=1)
+
+        self.assertFalse(context.is_alive())
+        self.assertEqual(OUTPUT_STOPPED, context.result)
+
+    def test_write_returns_OUTPUT_STOPPED_when_pagination_has_stopped(self):
+        context = self.paginate(page_builder=StopOutputPageBuilder(page_height=1))
+
+        context.write('first \nsecond \n')
+        context.join(timeout=1)
+
+        self.assertEqual(OUTPUT_STOPPED, context.write('third \n'))
+
+    def test_counts_queued_bytes_and_lines(self):
+        page_builder = BlockedPageBuilder(page_height=1)
+        context = self.paginate(page_builder=page_builder)
+        context.write('first \nsecond \n')
+        page_builder.is_prompting.wait(timeout=1)
+
+        context.write('third \nfourth \n')
+
+        self.assertEqual(len('third \nfourth \n'), context.queued_bytes)
+        self.assertEqual(2, context.queued_lines)
+        page_builder.release()
+        context.close()
+        context.join(timeout=1)
+
+    def test_counts_queued_bytes_and_lines_of_bytes(self):
+        page_builder = BlockedPageBuilder(page_height=1)
+        context = self.paginate(page_builder=page_builder)
+        context.write(b'first \nsecond \n')
+        page_builder.is_prompting.wait(timeout=1)
+
+        context.write(b'third \nfourth \n')
+
+        self.assertEqual(len(b'third \nfourth \n'), context.queued_bytes)
+        self.assertEqual(2, context.queued_lines)
+        page_builder.release()
+        context.close()
+        context.join(timeout=1)
+        self.assertEqual(0, context.queued_lines)
+
+    def test_queued_bytes_counts_encoded_size(self):
+        page_builder = BlockedPageBuilder(page_height=1)
+        context = self.paginate(page_builder=page_builder)
+        context.write('first \nsecond \n')
+        page_builder.is_prompting.wait(timeout=1)
+
+        context.write('café\n')
+
+        self.assertEqual(len('café\n'.encode('utf-8')), context.queued_bytes)
+        page_builder.release()
+        context.close()
+        context.join(timeout=1)
+
+    def test_block_policy_waits_for_room_in_the_buffer(self):
+        page_builder = BlockedPageBuilder(page_height=1)
+        context = self.paginate(page_builder=page_builder, buffer_size=10, overflow=OVERFLOW_BLOCK)
+        context.write('first \nsecond \n')
+        page_builder.is_prompting.wait(timeout=1)
+        context.write('third \n')
+
+        writer = threading.Thread(target=context.write, args=('fourth \n',))
+        writer.start()
+        writer.join(timeout=0.1)
+        self.assertTrue(writer.is_alive())
+
+        page_builder.release()
+        writer.join(timeout=1)
+        context.close()
+        context.join(timeout=1)
+
+        self.assertGreater(context.blocked_seconds, 0)
+        self.assertEqual(
+            ['first \n', 'second \n', 'third \n', 'fourth \n'],
+            [line for page in self.output for line in page.lines]
+        )
+
+    def test_drop_oldest_policy_drops_the_oldest_text(self):
+        page_builder = BlockedPageBuilder(page_height=1)
+        context = self.paginate(page_builder=page_builder, buffer_size=10, overflow=OVERFLOW_DROP_OLDEST)
+        context.write('first \nsecond \n')
+        page_builder.is_prompting.wait(timeout=1)
+
+        context.write('third \n')
+        context.write('fourth \n')
+
+        self.assertEqual(len('third \n'), context.dropped_bytes)
+        page_builder.release()
+        context.close()
+        context.join(timeout=1)
+        self.assertEqual(
+            ['first \n', 'second \n', 'fourth \n'],
+            [line for page in self.output for line in page.lines]
+        )
+
+    def test_spill_policy_keeps_all_text_in_order(self):
+        page_builder = BlockedPageBuilder(page_height=1)
+        context = self.paginate(page_builder=page_builder, buffer_size=10, overflow=OVERFLOW_SPILL)
+        context.write('first \nsecond \n')
+        page_builder.is_prompting.wait(timeout=1)
+
+        for text in ['third \n', 'fourth \n', 'fifth é\n', 'sixth \n']:
+            context.write(text)
+
+        page_builder.release()
+        context.close()
+        context.join(timeout=1)
+        self.assertEqual(
+            ['first \n', 'second \n', 'third \n', 'fourth \n', 'fifth é\n', 'sixth \n'],
+            [line for page in self.output for line in page.lines]
+        )
+        self.assertEqual(0, context.queued_bytes)
+
+
+    def test_spill_policy_keeps_all_bytes_in_order(self):
+        page_builder = BlockedPageBuilder(page_height=1)
+        context = self.paginate(page_builder=page_builder, buffer_size=10, overflow=OVERFLOW_SPILL)
+        context.write(b'first \nsecond \n')
+        page_builder.is_prompting.wait(timeout=1)
+
+        for data in [b'third \n', b'fourth \n', 'fifth é\n'.encode(), b'sixth \n']:
+            context.write(data)
+
+        page_builder.release()
+        context.close()
+        context.join(timeout=1)
+        self.assertEqual(
+            ['first \n', 'second \n', 'third \n', 'fourth \n', 'fifth é\n', 'sixth \n'],
+            [line for page in self.output for line in page.lines]
+        )
+
+
+class BlockedPageBuilder(PageBuilderMock):
+    '''
+        Page builder that blocks in 'build_next_page' until 'release' is called,
+        as if the user is reading the page.
+    '''
+
+    def __init__(self, page_height):
+        super().__init__(page_height)
+        self.is_prompting = threading.Event()
+        self._released = threading.Event()
+
+    def release(self):
+        self._released.set()
+
+    def build_next_page(self):
+        self.is_prompting.set()
+        self._released.wait(timeout=5)
+        return super().build_next_page()
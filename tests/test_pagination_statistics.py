@@ -0,0 +1,156 @@
+from more_or_less import FixedSizeScreen, Input, LineCountPlugin, OUTPUT_STOPPED, PaginationStatistics, paginate
+from more_or_less.one_page_plugin import OnePagePlugin
+from more_or_less.page import Page
+from more_or_less.pagination_statistics import ON_ADD_LINE, TimedPage
+from more_or_less.quit_plugin import QuitPlugin
+from more_or_less.search_plugin import SearchPage, SearchPlugin
+from unittest.mock import Mock, patch
+import io
+import unittest
+
+
+class TerminalOutput(io.StringIO):
+
+    def isatty(self):
+        return True
+
+
+class TestPaginationStatistics(unittest.TestCase):
+
+    def setUp(self):
+        self.input = Mock(Input)
+        self.output = TerminalOutput()
+        self.statistics = PaginationStatistics()
+
+    def paginate(self, text, keys=' ', screen_height=3, plugins=None, **kwargs):
+        self.input.get_character.side_effect = list(keys)
+        return paginate(
+            [text],
+            prompt=self.input,
+            output=self.output,
+            screen_dimensions=FixedSizeScreen(height=screen_height),
+            plugins=plugins or [OnePagePlugin(), QuitPlugin()],
+            statistics=self.statistics,
+            **kwargs
+        )
+
+    def test_counts_the_input(self):
+        self.paginate('first\nsecond\nthird\n', keys='  ')
+
+        self.assertEqual(len('first\nsecond\nthird\n'), self.statistics.bytes_read)
+        self.assertEqual(3, self.statistics.lines_read)
+        self.assertEqual(3, self.statistics.lines_displayed)
+
+    def test_counts_bytes_of_non_ascii_input(self):
+        self.paginate('café\n')
+
+        self.assertEqual(6, self.statistics.bytes_read)
+
+    def test_counts_the_incomplete_final_line(self):
+        self.paginate('first\nincomplete')
+
+        self.assertEqual(2, self.statistics.lines_read)
+        self.assertEqual(2, self.statistics.lines_displayed)
+
+    def test_counts_the_pages(self):
+        self.paginate(''.join('line {}\n'.format(i) for i in range(5)), keys='  ')
+
+        # Pages are 2 lines high (the prompt takes a line)
+        self.assertEqual(3, self.statistics.pages_built)
+
+    def test_only_counts_lines_that_reached_a_page_when_the_user_quits(self):
+        result = self.paginate(''.join('line {}\n'.format(i) for i in range(5)), keys='q')
+
+        self.assertEqual(OUTPUT_STOPPED, result)
+        self.assertEqual(5, self.statistics.lines_read)
+        self.assertEqual(2, self.statistics.lines_displayed)
+        self.assertEqual(1, self.statistics.pages_built)
+
+    def test_counts_lines_skipped_by_a_search(self):
+        self.input.prompt.return_value = 'needle'
+        text = 'first\nsecond\na\nb\nneedle\nafter\n'
+
+        self.paginate(text, keys='/ ', plugins=[SearchPlugin(), OnePagePlugin()])
+
+        self.assertEqual(2, self.statistics.lines_skipped)
+        self.assertEqual(4, self.statistics.lines_displayed)
+
+    def test_searches_blocks_of_lines(self):
+        self.input.prompt.return_value = 'needle'
+        text = ''.join('line {}\n'.format(i) for i in range(1000)) + 'needle\nafter\n'
+
+        with patch.object(SearchPage, 'add_line', autospec=True, side_effect=SearchPage.add_line) as add_line:
+            self.paginate(text, keys='/ ', plugins=[SearchPlugin(), OnePagePlugin()])
+
+        # Only the first line of the search page is added on its own, the others are skipped as a block
+        self.assertEqual(1, add_line.call_count)
+        self.assertEqual(998, self.statistics.lines_skipped)
+        self.assertEqual('line 0\nline 1\n...skipping\nneedle\nafter\n', self.output.getvalue())
+
+    def test_records_time_spent_at_the_prompt_and_in_the_output(self):
+        self.paginate('first\nsecond\nthird\n')
+
+        self.assertGreater(self.statistics.prompt_seconds, 0)
+        self.assertGreater(self.statistics.output_seconds, 0)
+        self.assertGreater(self.statistics.read_seconds, 0)
+
+    def test_records_time_per_plugin(self):
+        plugins = [LineCountPlugin(), OnePagePlugin()]
+        self.paginate('first\nsecond\nthird\n', plugins=plugins)
+
+        self.assertEqual({'LineCountPlugin', 'OnePagePlugin'}, set(self.statistics.plugin_seconds))
+        self.assertGreater(self.statistics.plugin_seconds['LineCountPlugin']['on_add_line'], 0)
+        self.assertGreater(self.statistics.plugin_seconds['LineCountPlugin']['wrap_page'], 0)
+        # The OnePagePlugin does not wrap pages, so no lines pass through it
+        self.assertEqual(0, self.statistics.plugin_seconds['OnePagePlugin']['on_add_line'])
+
+    def test_statistics_do_not_change_the_output(self):
+        plugins = [LineCountPlugin(), OnePagePlugin()]
+        plugins[0].line_numbers_enabled = True
+
+        self.paginate('first\nsecond\nthird\n', plugins=plugins)
+
+        self.assertEqual('1: first\n2: second\n3: third\n', self.output.getvalue())
+
+    def test_records_statistics_when_the_input_is_copied_to_the_output(self):
+        paginate(['first\n', 'second\n'], output=io.StringIO(), statistics=self.statistics)
+
+        self.assertEqual(len('first\nsecond\n'), self.statistics.bytes_read)
+        self.assertEqual(2, self.statistics.lines_read)
+        self.assertEqual(2, self.statistics.lines_displayed)
+        self.assertEqual(0, self.statistics.pages_built)
+
+    def test_as_dict_contains_all_statistics(self):
+        self.paginate('first\n')
+
+        statistics = self.statistics.as_dict()
+
+        self.assertEqual(1, statistics['lines_displayed'])
+        self.assertIn('plugin_seconds', statistics)
+
+
+class TestTimedPage(unittest.TestCase):
+
+    def setUp(self):
+        self.statistics = PaginationStatistics()
+        self.wrapped_page = Mock(Page)
+        self.page = TimedPage(self.wrapped_page, self.statistics, 'Plugin')
+
+    def test_forwards_blocks_of_lines(self):
+        lines = ['first\n', 'second\n', 'third\n']
+        self.wrapped_page.skip_lines.return_value = 1
+        self.wrapped_page.add_lines.return_value = 3
+
+        self.assertEqual(3, self.page.add_lines(lines, self.page.skip_lines(lines, 0)))
+
+        self.wrapped_page.skip_lines.assert_called_once_with(lines, 0)
+        self.wrapped_page.add_lines.assert_called_once_with(lines, 1)
+        self.wrapped_page.add_line.assert_not_called()
+
+    def test_records_the_time_spent_in_blocks_of_lines(self):
+        self.page.add_lines(['first\n'], 0)
+        add_lines_seconds = self.statistics.plugin_seconds['Plugin'][ON_ADD_LINE]
+        self.page.skip_lines(['first\n'], 0)
+
+        self.assertGreater(add_lines_seconds, 0)
+        self.assertGreater(self.statistics.plugin_seconds['Plugin'][ON_ADD_LINE], add_lines_seconds)
@@ -1,7 +1,17 @@
 #!python
-from more_or_less import OUTPUT_STOPPED, PageBuilder, PageOfHeight, StopOutput, Output, Paginator
-from queue import Queue
+from more_or_less import FixedSizeScreen, Input, LineCountPlugin, OUTPUT_STOPPED, PageBuilder, PageOfHeight, \
+    StopOutput, Output, Paginator, more_plugins
+from more_or_less.paginator import BatchedQueueIterator
+from more_or_less.binary_output import BinaryOutput
+from more_or_less.history import History
+from more_or_less.line_segments import Continuation
+from unittest.mock import Mock, patch
+from queue import LifoQueue, Queue
+import gzip
+import io
 import more_or_less
+import os
+import threading
 import unittest
 
 
@@ -13,13 +23,14 @@ class TestUtil(unittest.TestCase):
     def setUp(self):
         self._page_builder = None
 
-    def paginate(self, input, page_builder=None, page_height=_big_page, asynchronous=False):
+    def paginate(self, input, page_builder=None, page_height=_big_page, asynchronous=False, **kwargs):
         self._page_builder = page_builder or PageBuilderMock(page_height)
 
         return more_or_less.paginate(
             input,
             page_builder=self._page_builder,
             asynchronous=asynchronous,
+            **kwargs
         )
 
     @property
@@ -58,6 +69,56 @@ class TestPaginate(TestUtil):
             self.output
         )
 
+    def test_can_read_input_from_a_file(self):
+        self.paginate(io.StringIO('first \nsecond \n'))
+
+        self.assertEqual(
+            [
+                FirstPage(['first \n', 'second \n', ])
+            ],
+            self.output
+        )
+
+    def test_reads_seekable_files_in_blocks(self):
+        file = FileSpy('first \nsecond \n')
+        self.paginate(file)
+
+        self.assertEqual(0, file.lines_iterated)
+        self.assertNotEqual(0, file.read_call_count)
+
+    def test_iterates_over_lines_of_non_seekable_files(self):
+        file = FileSpy('first \nsecond \n', seekable=False)
+        self.paginate(file)
+
+        self.assertEqual(2, file.lines_iterated)
+        self.assertEqual(0, file.read_call_count)
+
+    def test_can_force_reading_in_blocks(self):
+        file = FileSpy('first \nsecond \n', seekable=False)
+        self.paginate(file, read_in_blocks=True)
+
+        self.assertEqual(0, file.lines_iterated)
+
+    def test_can_disable_reading_in_blocks(self):
+        file = FileSpy('first \nsecond \n')
+        self.paginate(file, read_in_blocks=False)
+
+        self.assertEqual(0, file.read_call_count)
+
+    def test_combines_lines_split_over_blocks(self):
+        self._page_builder = PageBuilderMock(page_height=2)
+        paginator = Paginator(self._page_builder)
+
+        paginator.paginate_from_file(io.StringIO('first \nsecond \nthird \n'), block_size=4)
+
+        self.assertEqual(
+            [
+                FirstPage(['first \n', 'second \n', ]),
+                NextPage(['third \n']),
+            ],
+            self.output
+        )
+
     def test_starts_new_page_if_first_is_full(self):
         self.paginate(
             ['first \n', 'second \n', 'third \n'],
@@ -158,6 +219,42 @@ class TestPaginate(TestUtil):
             self.output
         )
 
+    def test__combines_many_small_fragments(self):
+        self.paginate(
+            input=list('a long line sent one character at a time \n'),
+            page_height=2,
+        )
+        self.assertEqual(
+            [
+                FirstPage(['a long line sent one character at a time \n']),
+            ],
+            self.output
+        )
+
+    def test__carriage_return_and_newline_in_separate_fragments_form_one_line_break(self):
+        self.paginate(
+            input=['first \r', '\nsecond \n'],
+            page_height=2,
+        )
+        self.assertEqual(
+            [
+                FirstPage(['first \r\n', 'second \n']),
+            ],
+            self.output
+        )
+
+    def test__only_newline_ends_a_line(self):
+        self.paginate(
+            input=['first \r', 'second \x0c third \u2028 fourth \n', 'fifth \n'],
+            page_height=2,
+        )
+        self.assertEqual(
+            [
+                FirstPage(['first \rsecond \x0c third \u2028 fourth \n', 'fifth \n']),
+            ],
+            self.output
+        )
+
     def test__survives_empty_string(self):
         self.paginate(
             input=['-->', '', '<-- \n'],
@@ -194,6 +291,64 @@ class TestPaginate(TestUtil):
             self.output
         )
 
+    def test__splits_lines_longer_than_max_line_size_in_segments(self):
+        self.paginate(
+            input=['0123456789', 'abc', 'de\n', 'next\n'],
+            max_line_size=4,
+        )
+        self.assertEqual(
+            [
+                FirstPage(['0123\n', '4567\n', '89ab\n', 'cde\n', 'next\n']),
+            ],
+            self.output
+        )
+
+    def test__marks_the_segments_after_the_first_one_as_continuations(self):
+        self.paginate(
+            input=['0123456789', 'abc', 'de\n', 'next\n'],
+            max_line_size=4,
+        )
+        self.assertEqual(
+            [False, True, True, True, False],
+            [isinstance(line, Continuation) for line in self.current_page.lines]
+        )
+
+    def test__does_not_split_lines_of_max_line_size(self):
+        self.paginate(
+            input=['01', '23', '\n'],
+            max_line_size=4,
+        )
+        self.assertEqual(
+            [
+                FirstPage(['0123\n']),
+            ],
+            self.output
+        )
+
+    def test__flushes_final_segment_of_incomplete_line(self):
+        self.paginate(
+            input=['0123456789'],
+            max_line_size=4,
+        )
+        self.assertEqual(
+            [
+                FirstPage(['0123\n', '4567\n', '89']),
+            ],
+            self.output
+        )
+
+    def test__keeps_lines_of_any_size_if_max_line_size_is_None(self):
+        self.paginate(
+            input=['0123456789' * 1000, '\n'],
+            max_line_size=None,
+        )
+        self.assertEqual(
+            [
+                FirstPage(['0123456789' * 1000 + '\n']),
+            ],
+            self.output
+        )
+
     def test__queue_flushes_final_incomplete_line(self):
         input_queue = Queue()
         context = self.paginate(
@@ -270,6 +425,239 @@ class TestPaginate(TestUtil):
         second_page = self.pages[1]
         self.assertEqual(1, second_page.flush_call_count)
 
+    def test_lines_skipped_by_the_page_are_not_added(self):
+        self.paginate(['skip\n', 'skip\n', 'keep\n', 'skip\n'], page_builder=SkippingPageBuilder(_big_page))
+
+        self.assertEqual(
+            [
+                FirstPage(['keep\n', 'skip\n'])
+            ],
+            self.output
+        )
+
+
+
+class TestPassthrough(unittest.TestCase):
+
+    def setUp(self):
+        self.output = io.StringIO()
+        self.prompt = Mock(Input)
+
+    def test_copies_input_to_output_that_is_not_a_terminal(self):
+        more_or_less.paginate(['first \n', 'second \n'], output=self.output)
+
+        self.assertEqual('first \nsecond \n', self.output.getvalue())
+
+    def test_copies_input_to_infinitely_high_screen(self):
+        output = TerminalOutput()
+
+        more_or_less.paginate(['first \n', 'second \n'], output=output, screen_dimensions=FixedSizeScreen())
+
+        self.assertEqual(['first \n', 'second \n'], output.writes)
+
+    def test_does_not_split_input_in_lines(self):
+        output = TerminalOutput()
+
+        more_or_less.paginate(['first ', 'line \nsecond'], output=output, screen_dimensions=FixedSizeScreen())
+
+        self.assertEqual(['first ', 'line \nsecond'], output.writes)
+
+    def test_paginates_output_that_is_a_terminal(self):
+        self.prompt.get_character.return_value = 'q'
+        output = TerminalOutput()
+
+        more_or_less.paginate(['first \n', 'second \n', 'third \n'], output=output, prompt=self.prompt,
+                              screen_dimensions=FixedSizeScreen(height=2))
+
+        self.assertEqual(['first \n'], output.writes)
+
+    def test_applies_plugins_that_transform_lines(self):
+        plugins = more_plugins.get()
+        line_count_plugin = next(plugin for plugin in plugins if isinstance(plugin, LineCountPlugin))
+        line_count_plugin.line_numbers_enabled = True
+
+        more_or_less.paginate(['first \n', 'second \n'], output=self.output, plugins=plugins)
+
+        self.assertEqual('1: first \n2: second \n', self.output.getvalue())
+
+    def test_does_not_create_a_history_when_plugins_transform_lines(self):
+        plugins = more_plugins.get()
+        line_count_plugin = next(plugin for plugin in plugins if isinstance(plugin, LineCountPlugin))
+        line_count_plugin.line_numbers_enabled = True
+
+        with patch('more_or_less.paginator.History') as history_class:
+            more_or_less.paginate(['first \n', 'second \n'], output=self.output, plugins=plugins)
+
+        history_class.assert_not_called()
+
+    def test_closes_the_history_when_the_pagination_ends(self):
+        self.prompt.get_character.return_value = 'q'
+
+        with patch.object(History, 'close', autospec=True) as close:
+            more_or_less.paginate(['first \n', 'second \n', 'third \n'], output=TerminalOutput(), prompt=self.prompt,
+                                  screen_dimensions=FixedSizeScreen(height=2))
+
+        close.assert_called_once()
+
+    def test_closes_the_history_when_the_asynchronous_pagination_ends(self):
+        self.prompt.get_character.return_value = 'q'
+
+        with patch.object(History, 'close', autospec=True) as close:
+            context = more_or_less.paginate(
+                output=TerminalOutput(), prompt=self.prompt, screen_dimensions=FixedSizeScreen(height=2),
+                asynchronous=True)
+            context.write('first \nsecond \nthird \n')
+            context.close()
+            context.join(timeout=1)
+
+        close.assert_called_once()
+
+    def test_can_run_asynchronously(self):
+        context = more_or_less.paginate(output=self.output, asynchronous=True)
+        context.write('first \n')
+        context.close()
+        context.join(timeout=1)
+
+        self.assertEqual('first \n', self.output.getvalue())
+
+
+class TestBytesInput(TestUtil):
+
+    def test_decodes_bytes(self):
+        self.paginate([b'first \n', b'second \n'])
+
+        self.assertEqual([FirstPage(['first \n', 'second \n'])], self.output)
+
+    def test_decodes_characters_split_over_two_chunks(self):
+        encoded = 'café \nnaïve \n'.encode('utf-8')
+
+        self.paginate([encoded[:4], encoded[4:13], encoded[13:]])
+
+        self.assertEqual([FirstPage(['café \n', 'naïve \n'])], self.output)
+
+    def test_uses_the_given_encoding(self):
+        self.paginate(['café \n'.encode('latin-1')], encoding='latin-1')
+
+        self.assertEqual([FirstPage(['café \n'])], self.output)
+
+    def test_replaces_decoding_errors_by_default(self):
+        self.paginate([b'bad \xff\n', b'incomplete \xc3'])
+
+        self.assertEqual([FirstPage(['bad \ufffd\n', 'incomplete \ufffd'])], self.output)
+
+    def test_uses_the_given_errors_policy(self):
+        with self.assertRaises(UnicodeDecodeError):
+            self.paginate([b'bad \xff\n'], errors='strict')
+
+    def test_can_read_binary_files(self):
+        self.paginate(io.BytesIO('first \nsecond é\n'.encode('utf-8')))
+
+        self.assertEqual([FirstPage(['first \n', 'second é\n'])], self.output)
+
+    def test_can_read_file_descriptors(self):
+        read_descriptor, write_descriptor = os.pipe()
+        os.write(write_descriptor, b'first \nsecond \n')
+        os.close(write_descriptor)
+
+        try:
+            self.paginate(read_descriptor)
+        finally:
+            os.close(read_descriptor)
+
+        self.assertEqual([FirstPage(['first \n', 'second \n'])], self.output)
+
+    def test_can_read_bytes_from_a_queue(self):
+        queue = _make_queue(b'first \n', b'second \n', more_or_less.END_OF_INPUT)
+
+        self.paginate(queue)
+
+        self.assertEqual([FirstPage(['first \n', 'second \n'])], self.output)
+
+    def test_decompresses_compressed_bytes(self):
+        compressed = gzip.compress('first \nsecond é\n'.encode('utf-8'))
+
+        self.paginate([compressed[:1], compressed[1:]])
+
+        self.assertEqual([FirstPage(['first \n', 'second é\n'])], self.output)
+
+    def test_copies_bytes_to_binary_output_without_decoding(self):
+        stream = io.BytesIO()
+
+        more_or_less.paginate([b'first \n', b'invalid \xff\n'], output=BinaryOutput(stream))
+
+        self.assertEqual(b'first \ninvalid \xff\n', stream.getvalue())
+
+    def test_copies_to_the_buffer_of_stdout_by_default(self):
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8')
+
+        with patch('sys.stdout', stdout):
+            more_or_less.paginate([b'first \n', b'invalid \xff\n'])
+
+        self.assertEqual(b'first \ninvalid \xff\n', stdout.buffer.getvalue())
+
+
+class TerminalOutput(Output):
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return True
+
+
+class TestBatchedQueueIterator(unittest.TestCase):
+
+    def test_returns_all_waiting_text_at_once(self):
+        iterator = BatchedQueueIterator(_make_queue('first ', 'second ', 'third '))
+
+        self.assertEqual('first second third ', next(iterator))
+
+    def test_stops_at_END_OF_INPUT(self):
+        iterator = BatchedQueueIterator(_make_queue('first ', more_or_less.END_OF_INPUT))
+
+        self.assertEqual(['first '], list(iterator))
+
+    def test_leaves_items_after_END_OF_INPUT_in_the_queue(self):
+        queue = _make_queue('first ', more_or_less.END_OF_INPUT, 'not for us')
+
+        list(BatchedQueueIterator(queue))
+
+        self.assertEqual('not for us', queue.get_nowait())
+
+    def test_does_not_read_from_queue_after_END_OF_INPUT(self):
+        queue = _make_queue(more_or_less.END_OF_INPUT)
+        iterator = BatchedQueueIterator(queue)
+
+        list(iterator)
+        queue.put('not for us')
+
+        self.assertEqual([], list(iterator))
+
+    def test_preserves_the_order_of_the_queue(self):
+        queue = LifoQueue()
+        for item in [more_or_less.END_OF_INPUT, 'first ', 'second ']:
+            queue.put(item)
+
+        self.assertEqual(['second first '], list(BatchedQueueIterator(queue)))
+
+    def test_unblocks_producers_of_a_bounded_queue(self):
+        queue = Queue(maxsize=2)
+        iterator = BatchedQueueIterator(queue)
+        producer = threading.Thread(target=lambda: [queue.put(c) for c in 'abcdef'] + [queue.put(None)])
+        producer.start()
+
+        text = ''.join(iterator)
+        producer.join(timeout=1)
+
+        self.assertEqual('abcdef', text)
+        self.assertFalse(producer.is_alive())
+
 
 def _make_queue(*args):
     queue = Queue()
@@ -278,6 +666,30 @@ def _make_queue(*args):
     return queue
 
 
+class FileSpy(io.StringIO):
+    '''
+        File that records if it is read in blocks or iterated line per line
+    '''
+
+    def __init__(self, text, seekable=True):
+        super().__init__(text)
+        self._seekable = seekable
+        self.read_call_count = 0
+        self.lines_iterated = 0
+
+    def seekable(self):
+        return self._seekable
+
+    def read(self, size=-1):
+        self.read_call_count = self.read_call_count + 1
+        return super().read(size)
+
+    def __next__(self):
+        line = super().__next__()
+        self.lines_iterated = self.lines_iterated + 1
+        return line
+
+
 class PageTester(object):
 
     def __eq__(self, other_page):
@@ -296,6 +708,9 @@ class PageMock(PageOfHeight, PageTester):
         self.flush_call_count = 0
 
     class _ListOutput(Output):
+        # Record every line separately, so the tests can check the page contents
+        line_by_line = True
+
         def __init__(self, output_list):
             self.lines = output_list
 
@@ -341,6 +756,23 @@ class PageBuilderMock(PageBuilder):
         return page
 
 
+class SkippingPage(PageMock):
+    ''' Skips the lines 'skip\n', until the first other line is added '''
+
+    def skip_lines(self, lines, start):
+        while not self.lines and start < len(lines) and lines[start] == 'skip\n':
+            start = start + 1
+        return start
+
+
+class SkippingPageBuilder(PageBuilderMock):
+
+    def _build_page(self, name):
+        page = SkippingPage(name=name, page_height=self._page_height)
+        self.pages.append(page)
+        return page
+
+
 class StopOutputPageBuilder(PageBuilderMock):
 
     def build_next_page(self):
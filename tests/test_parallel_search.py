@@ -0,0 +1,164 @@
+from more_or_less import FixedSizeScreen, Input, LineCountPlugin, paginate
+from more_or_less.count_plugin import CountPlugin
+from more_or_less.mapped_file import MappedFile
+from more_or_less.parallel_search import ParallelSearch
+from more_or_less.quit_plugin import QuitPlugin
+from more_or_less.search_engine import compile_literals, compile_search
+from more_or_less.search_plugin import SearchPlugin
+from tests.test_mapped_file import MappedFileTestCase
+from unittest.mock import Mock, call, patch
+import io
+import re
+
+
+class TerminalOutput(io.StringIO):
+
+    def isatty(self):
+        return True
+
+
+@patch('more_or_less.parallel_search.MINIMUM_SHARD_SIZE', 16)
+@patch('more_or_less.parallel_search.MINIMUM_SIZE', 0)
+class TestParallelSearch(MappedFileTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lines = [b'line %d\n' % i for i in range(200)]
+
+    def find_match(self, content, pattern, match_count, start=0):
+        search = ParallelSearch(self.create_file(content), processes=2)
+        self.addCleanup(search.close)
+        return search.find_match(content, start, compile_search(pattern), match_count)
+
+    def test_finds_the_line_with_the_kth_match(self):
+        content = b''.join(self.lines)
+
+        offset, skipped_match_count = self.find_match(content, 'line .*7$', 12)
+
+        # Lines 7, 17, ..., 107, 117 match
+        self.assertEqual(content.index(b'line 117\n'), offset)
+        self.assertEqual(11, skipped_match_count)
+
+    def test_starts_searching_at_the_given_offset(self):
+        content = b''.join(self.lines)
+
+        offset, skipped_match_count = self.find_match(content, 'line .*7$', 2, start=content.index(b'line 100\n'))
+
+        self.assertEqual(content.index(b'line 117\n'), offset)
+        self.assertEqual(1, skipped_match_count)
+
+    def test_skips_to_the_end_if_there_are_not_enough_matches(self):
+        content = b''.join(self.lines)
+
+        offset, skipped_match_count = self.find_match(content, 'line 1[0-9]$', 20)
+
+        self.assertEqual(len(content), offset)
+        self.assertEqual(10, skipped_match_count)
+
+    def test_finds_any_of_a_set_of_literals(self):
+        content = b''.join(b'trace=%016x\n' % (i * 7919) for i in range(200))
+        compiled_search = compile_literals(['%016x' % (150 * 7919), '%016x' % (42 * 7919)])
+        search = ParallelSearch(self.create_file(content), processes=2)
+        self.addCleanup(search.close)
+
+        offset, skipped_match_count = search.find_match(content, 0, compiled_search, 2)
+
+        self.assertEqual(content.index(b'trace=%016x\n' % (150 * 7919)), offset)
+        self.assertEqual(1, skipped_match_count)
+
+    def test_a_carriage_return_does_not_end_a_line(self):
+        content = b''.join(self.lines[:100]) + b'needle\rneedle\x0cneedle\n' + b''.join(self.lines[100:])
+
+        offset, skipped_match_count = self.find_match(content, 'needle', 2)
+
+        self.assertEqual(len(content), offset)
+        self.assertEqual(1, skipped_match_count)
+
+
+@patch('more_or_less.parallel_search.MINIMUM_SHARD_SIZE', 64)
+@patch('more_or_less.parallel_search.MINIMUM_SIZE', 0)
+class TestSearchingMappedFiles(MappedFileTestCase):
+
+    def paginate(self, path, keys, pattern, search_processes):
+        input = Mock(Input)
+        input.get_character.side_effect = list(keys)
+        input.prompt.return_value = pattern
+        output = TerminalOutput()
+        with MappedFile(path, block_size=256, search_processes=search_processes) as mapped_file:
+            mapped_file.skip_to_match = Mock(wraps=mapped_file.skip_to_match)
+            paginate(
+                mapped_file,
+                prompt=input,
+                output=output,
+                screen_dimensions=FixedSizeScreen(height=4),
+                plugins=[CountPlugin(), SearchPlugin(), LineCountPlugin(), QuitPlugin()],
+            )
+        self.assertTrue(mapped_file.skip_to_match.called)
+        return output.getvalue(), input.get_character.call_args_list
+
+    def test_displays_the_same_lines_as_a_search_in_the_paginator(self):
+        content = ''.join('line {}\n'.format(i) for i in range(3000)).encode()
+        path = self.create_file(content)
+
+        for keys in ('25/=q', '1/25/=q', '1000/=q'):
+            with self.subTest(keys=keys):
+                expected = self.paginate(path, keys, pattern='line [0-9]*7$', search_processes=1)
+                actual = self.paginate(path, keys, pattern='line [0-9]*7$', search_processes=2)
+
+                self.assertEqual(expected, actual)
+
+    def test_counts_the_same_lines_as_the_paginator_with_other_line_breaks(self):
+        content = ''.join(
+            'line {}{}\n'.format(i, '\r' if i % 3 else '\x0c part \x85 \u2028 end') for i in range(3000)).encode()
+        path = self.create_file(content)
+
+        for keys in ('25/=q', '1/25/=q', '100/=q'):
+            with self.subTest(keys=keys):
+                expected = self.paginate(path, keys, pattern='line [0-9]*7', search_processes=1)
+                actual = self.paginate(path, keys, pattern='line [0-9]*7', search_processes=2)
+
+                self.assertEqual(expected, actual)
+
+        # Only '\n' ends a line, so the last line on the screen ('line 159') is line 160
+        output, prompts = self.paginate(path, '25/=q', pattern='line [0-9]*7', search_processes=2)
+        self.assertTrue(output.endswith('line 157\r\nline 158\r\nline 159\x0c part \x85 \u2028 end\n'))
+        self.assertEqual(call('--160--'), prompts[-1])
+
+    def test_mapped_file_skips_ahead_to_the_match(self):
+        content = ''.join('line {}\n'.format(i) for i in range(3000)).encode()
+        mapped_file = self.open_mapped_file(content)
+
+        skipped_lines = mapped_file.skip_to_match(compile_search('line 2'), 5)
+
+        # 'line 2', 'line 20' ... 'line 23' are skipped
+        self.assertEqual(23, len(skipped_lines))
+        self.assertEqual(4, skipped_lines.skipped_match_count)
+        self.assertEqual('line 22\n', skipped_lines[-1])
+        self.assertTrue(next(mapped_file).startswith('line 23\n'))
+
+    def test_skipped_lines_are_read_in_blocks(self):
+        content = ''.join('line {}\n'.format(i) for i in range(3000)).encode()
+        mapped_file = self.open_mapped_file(content)
+        skipped_lines = mapped_file.skip_to_match(compile_search('line 2999'), 1)
+        mapped_file.get_line = Mock(wraps=mapped_file.get_line)
+
+        self.assertEqual(['line 10\n', 'line 11\n'], skipped_lines[10:12])
+        self.assertEqual(['line {}\n'.format(i) for i in range(2999)], list(skipped_lines))
+        mapped_file.get_line.assert_not_called()
+
+    def test_mapped_file_does_not_skip_ahead_in_small_files(self):
+        mapped_file = self.open_mapped_file(b'first\nsecond\n')
+
+        with patch('more_or_less.parallel_search.MINIMUM_SIZE', 1024):
+            self.assertIsNone(mapped_file.skip_to_match(compile_search('second'), 1))
+        self.assertEqual(['first\nsecond\n'], list(mapped_file))
+
+    def test_matches_lines_like_the_paginator(self):
+        content = ''.join('line {}\n'.format(i) for i in range(300)).encode()
+        mapped_file = self.open_mapped_file(content)
+        matcher = re.compile('line 1.*5')
+
+        skipped_lines = mapped_file.skip_to_match(compile_search(matcher.pattern), 7)
+
+        self.assertEqual(6, sum(1 for line in skipped_lines if matcher.search(line)))
+        self.assertTrue(matcher.search(next(mapped_file).splitlines()[0]))
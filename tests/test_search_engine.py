@@ -0,0 +1,98 @@
+from more_or_less.search_engine import LiteralMatcher, LiteralSetMatcher, compile_literals, compile_search
+import unittest
+
+
+class TestCompileSearch(unittest.TestCase):
+
+    def test_plain_text_is_searched_as_literal(self):
+        search = compile_search('request-1234')
+
+        self.assertIsInstance(search.line_matcher, LiteralMatcher)
+        self.assertTrue(search.line_matcher.search('got request-1234 from host\n'))
+        self.assertFalse(search.line_matcher.search('got request-12 from host\n'))
+
+    def test_alternatives_of_plain_text_are_searched_as_set_of_literals(self):
+        search = compile_search('first|second|third')
+
+        self.assertIsInstance(search.block_matcher, LiteralSetMatcher)
+        self.assertTrue(search.line_matcher.search('the second line\n'))
+        self.assertFalse(search.line_matcher.search('the fourth line\n'))
+
+    def test_regular_expressions_are_searched_as_regular_expression(self):
+        search = compile_search('fir.t|second')
+
+        self.assertTrue(search.line_matcher.search('the firXt line\n'))
+        self.assertTrue(search.line_matcher.search('the second line\n'))
+
+    def test_empty_alternative_is_a_regular_expression(self):
+        search = compile_search('first|')
+
+        self.assertTrue(search.line_matcher.search('anything\n'))
+
+    def test_blocks_are_not_searched_for_patterns_that_depend_on_surrounding_text(self):
+        self.assertIsNone(compile_search('end$').block_matcher)
+        self.assertIsNone(compile_search('(?<=a)b').block_matcher)
+        self.assertIsNotNone(compile_search('^start').block_matcher)
+
+
+class TestLiteralMatcher(unittest.TestCase):
+
+    def test_search_returns_position_of_first_match(self):
+        match = LiteralMatcher('needle').search('hay needle needle', 5)
+
+        self.assertEqual(11, match.start())
+        self.assertEqual(17, match.end())
+
+    def test_search_returns_none_if_not_found(self):
+        self.assertIsNone(LiteralMatcher('needle').search('haystack'))
+
+
+class TestLiteralSetMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.literals = ['4bf92f3577b34da6', '00f067aa0ba902b7', 'a3ce929d0e0e4736']
+        self.matcher = compile_literals(self.literals).block_matcher
+
+    def test_finds_literal_that_is_a_word_on_its_own(self):
+        text = 'trace=0000000000000000\ntrace=00f067aa0ba902b7\n'
+
+        self.assertEqual(text.index('00f067aa0ba902b7'), self.matcher.search(text).start())
+
+    def test_finds_literal_inside_a_longer_word(self):
+        text = 'trace=0000000000000000\ntrace=ffa3ce929d0e0e4736ff\n'
+
+        self.assertEqual(text.index('a3ce929d0e0e4736'), self.matcher.search(text).start())
+
+    def test_finds_first_match_after_position(self):
+        text = '4bf92f3577b34da6\n00f067aa0ba902b7\n'
+
+        self.assertEqual(17, self.matcher.search(text, 1).start())
+
+    def test_returns_none_if_nothing_matches(self):
+        text = 'trace=0000000000000000\n' * 10000
+
+        self.assertIsNone(self.matcher.search(text))
+
+    def test_literals_can_be_prefixes_of_each_other(self):
+        search = compile_literals(['abc', 'abcdef', 'xyz'])
+
+        self.assertTrue(search.line_matcher.search('.abc.\n'))
+        self.assertEqual(1, search.block_matcher.search('.abc.\n').start())
+
+    def test_finds_literal_next_to_other_characters(self):
+        search = compile_literals(['abc', 'xyz'])
+
+        for text, literal in (('éabcé\n', 'abc'), ('abc\x0c\n', 'abc'), ('\u2028abc', 'abc'), ('-xyz-\n', 'xyz')):
+            with self.subTest(text=text):
+                self.assertEqual(text.index(literal), search.block_matcher.search(text).start())
+
+    def test_does_not_match_words_made_of_the_characters_of_the_literals(self):
+        search = compile_literals(['abc', 'xyz'])
+
+        self.assertIsNone(search.block_matcher.search('cba zyx ab bc\n' * 1000))
+
+    def test_literals_with_white_space_are_searched_using_the_prefix_tree(self):
+        search = compile_literals(['request failed', 'timed out'])
+
+        self.assertNotIsInstance(search.block_matcher, LiteralSetMatcher)
+        self.assertEqual(4, search.block_matcher.search('the request failed\n', 0).start())
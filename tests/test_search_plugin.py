@@ -1,9 +1,17 @@
+from more_or_less import FixedSizeScreen, paginate
 from more_or_less.input import Input
+from more_or_less.line_segments import Continuation, SegmentedLines
+from more_or_less.look_ahead import LookAhead
 from more_or_less.output import Output
 from more_or_less.page import Page
-from more_or_less.search_plugin import SearchPage
+from more_or_less.quit_plugin import QuitPlugin
+from more_or_less.search_engine import LiteralSetMatcher
+from more_or_less.search_plugin import SearchPage, SearchPlugin
 from tests.test_more_page_builder import TestUtil
-from unittest.mock import Mock, call
+from unittest.mock import Mock, call, patch
+import io
+import os
+import tempfile
 import unittest
 
 
@@ -125,6 +133,84 @@ class TestSearchPlugin(TestUtil):
 
         self.assertIsSearchPageWithMatchCount(second_page, match_count=7)
 
+    def test_at_searches_for_lines_in_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'patterns.txt')
+            with open(path, 'w') as file:
+                file.write('first.id\n\nsecond-id\n')
+            input = Mock(Input)
+            input.get_character.return_value = '@'
+            input.prompt.side_effect = [path]
+            builder = self.get_more_page_builder(input=input)
+
+            page = builder.build_next_page()
+
+        input.prompt.assert_called_once_with('@')
+        self.assertIsSearchPageWithPattern(page, pattern='first\\.id|second\\-id')
+        page.add_line('firstXid\n')
+        self.assertFalse(page.has_match)
+        page.add_line('the second-id\n')
+        self.assertTrue(page.has_match)
+
+    def test_at_passes_the_set_of_literals_to_the_input(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'patterns.txt')
+            with open(path, 'w') as file:
+                file.write('first.id\nsecond-id\n')
+            input = Mock(Input)
+            input.get_character.return_value = '@'
+            input.prompt.side_effect = [path]
+            builder = self.get_more_page_builder(input=input)
+
+            page = builder.build_next_page()
+
+        compiled_search, match_count = page.get_pending_search()
+        self.assertIsInstance(compiled_search.block_matcher, LiteralSetMatcher)
+        self.assertEqual(1, match_count)
+
+    def test_n_repeats_search_for_lines_in_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'patterns.txt')
+            with open(path, 'w') as file:
+                file.write('first-id\n')
+            input = Mock(Input)
+            input.get_character.return_value = '@'
+            input.prompt.side_effect = [path]
+            builder = self.get_more_page_builder(input=input)
+            builder.build_next_page()
+
+        input.get_character.return_value = 'n'
+        page = builder.build_next_page()
+
+        page.add_line('the first-id\n')
+        self.assertTrue(page.has_match)
+
+    def test_at_prints_error_in_prompt_if_file_can_not_be_read(self):
+        input = Mock(Input)
+        input.get_character.side_effect = ['@', ' ']
+        input.prompt.side_effect = ['/does/not/exist']
+        builder = self.get_more_page_builder(input=input)
+
+        builder.build_next_page()
+
+        input.get_character.assert_has_calls([
+            call('--More--'),
+            call('--Can not read search patterns from /does/not/exist--'),
+        ])
+
+    def test_look_ahead_looks_for_the_searched_pattern(self):
+        input = Mock(Input)
+        input.get_character.return_value = '/'
+        input.prompt.side_effect = ['the-pattern']
+        look_ahead = Mock(LookAhead)
+        builder = self.get_more_page_builder(input=input, look_ahead=look_ahead)
+
+        builder.build_next_page()
+
+        look_ahead.look_for.assert_called_once()
+        compiled_search = look_ahead.look_for.call_args[0][0]
+        self.assertTrue(compiled_search.line_matcher.search('with the-pattern\n'))
+
 
 class TestSearchPage(unittest.TestCase):
 
@@ -194,3 +280,155 @@ class TestSearchPage(unittest.TestCase):
 
         page.flush()
         self.next_page.flush.assert_called_once()
+
+    def test_skip_lines_returns_the_index_of_the_matching_line(self):
+        page = self.create_search_page('the.*pattern')
+        lines = ['first\n', 'second\n', 'the pattern\n', 'after\n']
+
+        self.assertEqual(2, page.skip_lines(lines, 0))
+
+    def test_skip_lines_starts_at_the_given_index(self):
+        page = self.create_search_page('match', match_count=2)
+        lines = ['match\n', 'match\n', 'skipped\n', 'match\n']
+
+        self.assertEqual(3, page.skip_lines(lines, 1))
+
+    def test_skip_lines_skips_all_lines_if_nothing_matches(self):
+        page = self.create_search_page('the-pattern')
+        lines = ['first\n', 'second\n']
+
+        self.assertEqual(2, page.skip_lines(lines, 0))
+        self.assertEqual(2, page.skipped_line_count)
+        self.next_page.add_line.assert_not_called()
+
+    def test_skip_lines_finds_kth_match_over_multiple_batches(self):
+        page = self.create_search_page('match', match_count=3)
+
+        self.assertEqual(2, page.skip_lines(['match\n', 'match\n'], 0))
+        self.assertEqual(1, page.skip_lines(['skipped\n', 'match\n'], 0))
+
+        page.add_line('match\n')
+        self.next_page.add_line.assert_called_once_with('match\n')
+
+    def test_skip_lines_counts_a_line_with_multiple_matches_once(self):
+        page = self.create_search_page('match', match_count=2)
+        lines = ['match match\n', 'skipped\n', 'match\n']
+
+        self.assertEqual(2, page.skip_lines(lines, 0))
+
+    def test_skip_lines_does_not_match_across_lines(self):
+        page = self.create_search_page('first.*second')
+        lines = ['first\n', 'second\n', 'first and second\n']
+
+        self.assertEqual(2, page.skip_lines(lines, 0))
+
+    def test_skip_lines_matches_start_of_line(self):
+        page = self.create_search_page('^match')
+        lines = ['no match\n', 'match\n']
+
+        self.assertEqual(1, page.skip_lines(lines, 0))
+
+    def test_skip_lines_matches_end_of_line(self):
+        page = self.create_search_page('match$')
+        lines = ['match no\n', 'a match\n']
+
+        self.assertEqual(1, page.skip_lines(lines, 0))
+
+    def test_skip_lines_does_not_skip_after_the_pattern_matched(self):
+        page = self.create_search_page('match')
+        page.add_line('match\n')
+        self.next_page.skip_lines.return_value = 0
+
+        self.assertEqual(0, page.skip_lines(['skipped\n'], 0))
+
+    def test_skip_lines_finds_any_of_multiple_literals(self):
+        page = self.create_search_page('first|second', match_count=2)
+        lines = ['first\n', 'third\n', 'second\n']
+
+        self.assertEqual(2, page.skip_lines(lines, 0))
+
+    def test_finds_matches_that_cross_the_split_of_a_segmented_line(self):
+        page = self.create_search_page('needle')
+        lines = SegmentedLines(['first\n', 'a ne\n', Continuation('edle\n')], 2)
+
+        self.assertEqual(2, page.skip_lines(lines, 0))
+        page.add_lines(lines, 2)
+
+        self.next_page.add_lines.assert_called_once_with(lines, 2)
+
+    def test_counts_a_segmented_line_with_multiple_matches_once(self):
+        page = self.create_search_page('match', match_count=2)
+        lines = SegmentedLines(['match\n', Continuation('match\n'), 'skipped\n', 'match\n'], 2)
+
+        self.assertEqual(3, page.skip_lines(lines, 0))
+        page.add_lines(lines, 3)
+
+        self.next_page.add_lines.assert_called_once_with(lines, 3)
+
+
+@patch('more_or_less.search_plugin._PROGRESS_DELAY', 0)
+@patch('more_or_less.search_plugin._PROGRESS_INTERVAL', 0)
+class TestSearchProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.next_page = Mock(Page)
+        self.input = Mock(Input)
+        self.input.poll_character.return_value = None
+
+    def create_search_page(self, pattern='needle', match_count=1):
+        return SearchPage(pattern=pattern, next_page=self.next_page, match_count=match_count, input=self.input)
+
+    def test_reports_progress_while_searching(self):
+        page = self.create_search_page(match_count=5)
+
+        page.skip_lines(['needle\n', 'hay\n'], 0)
+
+        self.input.poll_character.assert_called_once()
+        message = self.input.poll_character.call_args[0][0]
+        self.assertTrue(message.startswith('--Searching: 0.0M characters scanned, 1 matches,'), message)
+
+    def test_does_not_report_progress_for_fast_searches(self):
+        with patch('more_or_less.search_plugin._PROGRESS_DELAY', 1000):
+            page = self.create_search_page()
+
+        page.skip_lines(['hay\n', 'hay\n'], 0)
+
+        self.input.poll_character.assert_not_called()
+
+    def test_removes_progress_when_the_match_is_found(self):
+        page = self.create_search_page()
+        page.skip_lines(['hay\n', 'hay\n'], 0)
+
+        page.skip_lines(['hay\n', 'needle\n'], 0)
+
+        self.input.clear_message.assert_called_once_with()
+        self.input.poll_character.assert_called_once()
+
+    def test_key_press_cancels_the_search(self):
+        page = self.create_search_page()
+        self.input.poll_character.return_value = 'x'
+
+        page.skip_lines(['hay\n', 'hay\n'], 0)
+
+        self.assertTrue(page.is_cancelled)
+        self.assertTrue(page.is_full())
+        self.assertEqual(0, page.skip_lines(['needle\n'], 0))
+        self.assertTrue(page.prompts_when_full())
+        self.input.clear_message.assert_called_once_with()
+
+    def test_cancelled_search_returns_to_the_prompt(self):
+        self.input.get_character.side_effect = ['/', 'q']
+        self.input.prompt.return_value = 'needle'
+        self.input.poll_character.return_value = 'x'
+        output = io.StringIO()
+
+        paginate(
+            ['first\n' * 20, 'hay\n' * 5, 'needle\n'],
+            prompt=self.input,
+            output=output,
+            screen_dimensions=FixedSizeScreen(height=10),
+            plugins=[SearchPlugin(), QuitPlugin()],
+        )
+
+        self.assertEqual(2, self.input.get_character.call_count)
+        self.assertNotIn('needle', output.getvalue())
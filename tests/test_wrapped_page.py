@@ -0,0 +1,41 @@
+from more_or_less.page import Page
+from more_or_less.wrapped_page import WrappedPage
+from unittest.mock import Mock
+import unittest
+
+
+class TestWrappedPage(unittest.TestCase):
+
+    def setUp(self):
+        self.wrapped_page = Mock(Page)
+        self.page = RecordingPage(self.wrapped_page)
+
+    def test_add_line_forwards_the_modified_line(self):
+        self.page.add_line('line\n')
+
+        self.wrapped_page.add_line.assert_called_once_with('modified line\n')
+
+    def test_skip_lines_is_forwarded_to_the_wrapped_page(self):
+        self.wrapped_page.skip_lines.return_value = 2
+
+        self.assertEqual(2, self.page.skip_lines(['first\n', 'second\n', 'third\n'], 1))
+        self.wrapped_page.skip_lines.assert_called_once_with(['first\n', 'second\n', 'third\n'], 1)
+
+    def test_skipped_lines_are_passed_to_on_add_line_by_default(self):
+        self.wrapped_page.skip_lines.return_value = 3
+
+        self.page.skip_lines(['first\n', 'second\n', 'third\n'], 1)
+
+        self.assertEqual(['second\n', 'third\n'], self.page.lines)
+        self.wrapped_page.add_line.assert_not_called()
+
+
+class RecordingPage(WrappedPage):
+
+    def __init__(self, wrapped_page):
+        super().__init__(wrapped_page)
+        self.lines = []
+
+    def on_add_line(self, line):
+        self.lines.append(line)
+        return 'modified ' + line